@@ -2,88 +2,165 @@ import streamlit as st
 import pandas as pd
 import numpy as np
 import plotly.express as px
-from sqlalchemy import create_engine
-from scraper import sync_data
-from database import init_db
-import sys
-from io import StringIO
+import plotly.graph_objects as go
+import importlib.util
+from database import init_db, get_change_stamp, engine, query_stats
 import time
-from utilities.tiering_logic import parse_tier_info, calculate_compliance, get_u11_u13_distribution, get_u15_u18_split, get_u15_u18_tier_distribution
-
-try:
-    import matplotlib
-    HAS_MATPLOTLIB = True
-except ImportError:
-    HAS_MATPLOTLIB = False
+import math
+import os
+import json
+from jobs import start_sync_job, get_latest_job, cancel_job, JOB_LOG_MAX_CHARS
+from utilities.sql_timing import SYNC_SQL_SUMMARY
+from utilities import charts
+from utilities.frame_store import FrameStore
+from utilities.analytics import (
+    load_standings, default_selection, division_communities, filter_standings, completeness_matrix,
+    community_trend, community_ranking, community_heatmap, dilution_frame, infer_thresholds,
+    categorize_thresholds, cliff_frame, aggressiveness_trend, tier_distribution_frame,
+    tier_distribution_curves, THRESHOLD_CATEGORIES, STANDINGS_PAGE_COLUMNS, count_standings, standings_page,
+    frame_page, build_filter_index, index_values, index_options
+)
+
+# Only needed for the completeness heatmap styling; pandas imports it when used
+HAS_MATPLOTLIB = importlib.util.find_spec("matplotlib") is not None
 
 # Page Config
 st.set_page_config(page_title="Hockey Calgary Analytics", layout="wide")
 
 st.warning("Disclaimer: this is a personal interest project and I don't stand behind any of it - this is a subject that I'm personally interested in and it's also a fun development project but I'm not accountable to anyone for it's accuracy")
 
-# Database Connection
-DB_URL = "sqlite:///hockey_calgary.db"
-engine = create_engine(DB_URL)
+# Initialize Database (Ensure tables exist), once per process rather than on every rerun
+@st.cache_resource
+def init_database():
+    init_db()
 
-# Initialize Database (Ensure tables exist)
-init_db()
+init_database()
 
 # --- Helper Functions ---
 
 def load_data():
     """Loads data from the database into a Pandas DataFrame."""
-    query = """
-    SELECT 
-        s.name as Season,
-        l.name as League,
-        l.type as Type,
-        l.stream as Stream,
-        c.name as Community,
-        t.name as Team,
-        st.gp as GP,
-        st.w as W,
-        st.l as L,
-        st.t as T,
-        st.pts as PTS,
-        st.gf as GF,
-        st.ga as GA,
-        st.diff as Diff,
-        st.source_url as Source
-    FROM standings st
-    JOIN seasons s ON st.season_id = s.id
-    JOIN leagues l ON st.league_id = l.id
-    JOIN teams t ON st.team_id = t.id
-    JOIN communities c ON t.community_id = c.id
-    """
     try:
-        df = pd.read_sql(query, engine)
-        
-        # Feature Engineering
-        # Handle division by zero for teams with 0 GP
-        df['Win %'] = df.apply(lambda row: row['W'] / row['GP'] if row['GP'] > 0 else 0.0, axis=1)
-        df['Points %'] = df.apply(lambda row: row['PTS'] / (row['GP'] * 2) if row['GP'] > 0 else 0.0, axis=1)
-        df['Goal Diff/Game'] = df.apply(lambda row: row['Diff'] / row['GP'] if row['GP'] > 0 else 0.0, axis=1)
-        
-        # Extract Age Category (U9, U11, etc.) from League Name
-        def get_age_category(league_name):
-            if 'U9' in league_name: return 'U9'
-            if 'U11' in league_name: return 'U11'
-            if 'U13' in league_name: return 'U13'
-            if 'U15' in league_name: return 'U15'
-            if 'U18' in league_name: return 'U18'
-            if 'U21' in league_name: return 'U21'
-            return 'Other'
-            
-        df['Age Category'] = df['League'].apply(get_age_category)
-        
-        # Exclude Girls Hockey Calgary
-        df = df[df['Community'] != 'Girls Hockey Calgary']
-        
-        return df
+        return load_standings(engine)
     except Exception as e:
         st.error(f"Error loading data: {e}")
         return pd.DataFrame()
 
+@st.cache_resource
+def get_frame_store():
+    """
+    One FrameStore per server process: the analytic frame and the frames
+    derived from it are held once and every session reads views of them.
+    Everything is keyed on the DB change stamp, so a sync or poll that writes
+    new standings triggers a reload on the next rerun.
+    """
+    return FrameStore(load_data)
+
+frame_store = get_frame_store()
+
+# Intermediate frames shared between page sections (and sessions). Keyed on
+# the selections each one depends on, so a rerun caused by an unrelated
+# widget reuses them.
+
+def get_filter_index(change_stamp):
+    """Row positions per Season/Type/Age Category/Community/League/Team value, for filtering and option lists."""
+    return frame_store.get(change_stamp, ('filter_index',), build_filter_index)
+
+def get_defaults(change_stamp):
+    return frame_store.get(change_stamp, ('defaults',), default_selection)
+
+def data_csv(change_stamp):
+    return frame_store.get(change_stamp, ('data_csv',), lambda df: df.to_csv(index=False).encode('utf-8'))
+
+def get_completeness(change_stamp):
+    return frame_store.get(change_stamp, ('completeness',), completeness_matrix)
+
+def get_filtered_data(change_stamp, filters):
+    """filters: (seasons, types, ages, communities, leagues, teams) tuples."""
+    return frame_store.get(change_stamp, ('filtered', filters),
+                           lambda df: filter_standings(df, *filters, index=get_filter_index(change_stamp)))
+
+def filtered_data_csv(change_stamp, filters):
+    return frame_store.get(change_stamp, ('filtered_csv', filters),
+                           lambda df: get_filtered_data(change_stamp, filters).to_csv(index=False).encode('utf-8'))
+
+def get_metric_frames(change_stamp, filters, metric):
+    """Trend, ranking and heatmap frames plus the season order for one metric."""
+    def compute(df):
+        filtered_df = get_filtered_data(change_stamp, filters)
+        return (
+            community_trend(filtered_df, metric),
+            community_ranking(filtered_df, metric),
+            community_heatmap(filtered_df, metric),
+            sorted(filtered_df['Season'].unique())
+        )
+    return frame_store.get(change_stamp, ('metric_frames', filters, metric), compute)
+
+def get_dilution_frame(change_stamp, selections, metric):
+    """selections: (seasons, types, ages, communities) tuples."""
+    return frame_store.get(change_stamp, ('dilution', selections, metric), lambda df: dilution_frame(df, *selections, metric, index=get_filter_index(change_stamp)))
+
+def get_thresholds(change_stamp, types, ages):
+    """
+    (season_age_thresholds, outliers_map, threshold_summary_data) for the
+    Dilution page. Thresholds span all communities and seasons, so season,
+    community and metric changes reuse them.
+    """
+    return frame_store.get(change_stamp, ('thresholds', types, ages), lambda df: infer_thresholds(df, types, ages, index=get_filter_index(change_stamp)))
+
+def get_tier_frame(change_stamp, season, age, season_type):
+    """Tiered teams of every community for the Experiments page."""
+    def compute(df):
+        filter_index = get_filter_index(change_stamp)
+        return tier_distribution_frame(df, season, age, season_type, index_values(filter_index, 'Community'), index=filter_index)
+    return frame_store.get(change_stamp, ('tier_frame', season, age, season_type), compute)
+
+def get_tier_curves(change_stamp, season, age, season_type, communities):
+    """The selected communities' tiered teams and fitted curves (x range spans only their tiers)."""
+    def compute(df):
+        all_exp_df = get_tier_frame(change_stamp, season, age, season_type)
+        exp_df = all_exp_df[all_exp_df['Community'].isin(communities)]
+        if exp_df.empty:
+            return exp_df, None, None, None
+        return (exp_df, *tier_distribution_curves(exp_df))
+    return frame_store.get(change_stamp, ('tier_curves', season, age, season_type, communities), compute)
+
+@st.cache_data(max_entries=32)
+def get_standings_count(change_stamp, filters):
+    return count_standings(engine, filters)
+
+@st.cache_data(max_entries=64)
+def get_standings_page(change_stamp, filters, sort_by, ascending, offset, limit):
+    return standings_page(engine, filters, sort_by, ascending, offset, limit)
+
+# Raw data viewer: only the visible page is sent to the browser
+PAGE_SIZES = [50, 100, 500, 1000]
+
+@st.fragment
+def paginated_dataframe(key, columns, total_rows, fetch_page, default_sort=None, ascending=True, column_config=None):
+    """
+    Sortable, paginated table. fetch_page(sort_by, ascending, offset, limit)
+    returns the visible page; paging and sorting rerun only this table.
+    """
+    if total_rows == 0:
+        st.info("No rows to show.")
+        return
+
+    col_sort, col_order, col_size, col_page = st.columns([3, 2, 2, 2])
+    sort_by = col_sort.selectbox("Sort by", columns, index=columns.index(default_sort) if default_sort in columns else 0, key=f"{key}_sort")
+    order = col_order.radio("Order", ["Ascending", "Descending"], index=0 if ascending else 1, horizontal=True, key=f"{key}_order")
+    page_size = col_size.selectbox("Rows per page", PAGE_SIZES, index=1, key=f"{key}_size")
+
+    pages = max(1, math.ceil(total_rows / page_size))
+    # A filter change can shrink the result below the current page
+    if st.session_state.get(f"{key}_page", 1) > pages:
+        st.session_state[f"{key}_page"] = pages
+    page_number = col_page.number_input(f"Page (of {pages})", min_value=1, max_value=pages, step=1, key=f"{key}_page")
+
+    offset = (page_number - 1) * page_size
+    st.dataframe(fetch_page(sort_by, order == "Ascending", offset, page_size), column_config=column_config, hide_index=True)
+    st.caption(f"Rows {offset + 1}-{min(offset + page_size, total_rows)} of {total_rows}")
+
 # --- Sidebar ---
 
 st.sidebar.title("🏒 Hockey Calgary Analytics")
@@ -92,49 +169,81 @@ st.sidebar.title("🏒 Hockey Calgary Analytics")
 page = st.sidebar.radio("Navigation", ["Analytics", "Tier 1 Dilution Analysis", "Experiments"])
 
 # Scraper Control
-st.sidebar.header("Data Sync")
-if st.sidebar.button("Run Scraper (Sync Data)"):
-    progress_bar = st.sidebar.progress(0)
-    status_text = st.sidebar.empty()
-    
-    def update_progress(pct, msg):
-        progress_bar.progress(pct)
-        status_text.text(msg)
-
-    with st.spinner("Scraping data from Hockey Calgary... This can take up to 10 minutes."):
-        # Capture stdout to show progress
-        old_stdout = sys.stdout
-        sys.stdout = mystdout = StringIO()
-        
-        try:
-            sync_data(reset=True, progress_callback=update_progress)
-            st.success("Sync Complete!")
-        except Exception as e:
-            st.error(f"An error occurred: {e}")
-        finally:
-            sys.stdout = old_stdout
-            
-        # Show logs
+# Syncs run in a separate worker process (jobs.py); the sidebar only reads the job record,
+# so this session and everyone else's stay responsive while a sync runs.
+def render_sync_job():
+    job = get_latest_job()
+    active = job is not None and job['status'] in ('queued', 'running')
+
+    if active:
+        st.progress(min(max(job['progress'], 0), 100))
+        st.caption(job['message'])
+        if st.button("Cancel Sync"):
+            cancel_job(job['id'])
+            st.rerun()
+    else:
+        if st.button("Run Scraper (Sync Data)"):
+            start_sync_job(reset=True)
+            st.rerun()
+        if job:
+            finished = job['status'] == 'succeeded'
+            (st.success if finished else st.error)(f"Last sync ({job['status']}): {job['message']}")
+            # A sync that just finished: reload the page so the new data is picked up
+            if st.session_state.get('watched_sync_job') == job['id']:
+                st.session_state['watched_sync_job'] = None
+                st.rerun()
+
+    if job:
         with st.expander("Scraper Logs"):
-            st.text(mystdout.getvalue())
-            
-    # Clear cache to reload data
-    st.cache_data.clear()
+            st.text(job['log'][-JOB_LOG_MAX_CHARS:])
+    if active:
+        st.session_state['watched_sync_job'] = job['id']
+
+st.sidebar.header("Data Sync")
+with st.sidebar:
+    latest_job = get_latest_job()
+    syncing = latest_job is not None and latest_job['status'] in ('queued', 'running')
+    # Poll the job record every 2 seconds only while a sync is running
+    st.fragment(render_sync_job, run_every=2 if syncing else None)()
+
+# Admin: statement timings for this dashboard process and the last sync
+def sql_timings_frame(rows):
+    frame = pd.DataFrame(rows, columns=['sql', 'count', 'total', 'p50', 'p95', 'max'])
+    for col in ['total', 'p50', 'p95', 'max']:
+        frame[col] = frame[col] * 1000
+    return frame.rename(columns={'sql': 'SQL', 'count': 'Count', 'total': 'Total ms', 'p50': 'p50 ms', 'p95': 'p95 ms', 'max': 'Max ms'})
+
+with st.sidebar.expander("Admin: SQL Timings"):
+    st.caption("This dashboard process")
+    st.dataframe(sql_timings_frame(query_stats.summary()), hide_index=True)
+    if os.path.exists(SYNC_SQL_SUMMARY):
+        with open(SYNC_SQL_SUMMARY, 'r') as f:
+            sync_sql = json.load(f)
+        st.caption(f"Last sync ({time.strftime('%Y-%m-%d %H:%M', time.localtime(sync_sql['finished']))})")
+        st.dataframe(sql_timings_frame(sync_sql['queries']), hide_index=True)
+    store = frame_store.stats()
+    st.caption(f"Shared frame store: {store['total_mb']:.0f} of {store['budget_mb']:.0f} MB "
+               f"(frame {store['frame_mb']:.0f} MB, {store['entries']} aggregates, "
+               f"{store['hits']} hits, {store['misses']} misses, {store['evictions']} evictions)")
 
 # Load Data
-df = load_data()
+change_stamp = get_change_stamp()
+df = frame_store.frame(change_stamp)
+if change_stamp[1]:
+    st.sidebar.caption(f"Data updated {time.strftime('%Y-%m-%d %H:%M', time.localtime(change_stamp[1]))}")
 
 if df.empty:
     st.warning("No data found. Please run the scraper first.")
     st.stop()
 
+filter_index = get_filter_index(change_stamp)
+
 if page == "Analytics":
     # Export
     st.sidebar.header("Export Data")
-    csv = df.to_csv(index=False).encode('utf-8')
     st.sidebar.download_button(
         label="Download All Data (CSV)",
-        data=csv,
+        data=data_csv(change_stamp),
         file_name='hockey_calgary_all_data.csv',
         mime='text/csv',
     )
@@ -142,91 +251,53 @@ if page == "Analytics":
     # Filters
     st.sidebar.header("Filters")
 
+    defaults = get_defaults(change_stamp)
+
     # Season Filter
-    all_seasons = sorted(df['Season'].unique().tolist(), reverse=True)
-    default_seasons = ['2025-2026'] if '2025-2026' in all_seasons else [all_seasons[0]] if all_seasons else []
-    selected_seasons = st.sidebar.multiselect("Select Seasons", all_seasons, default=default_seasons)
+    all_seasons = sorted(index_values(filter_index, 'Season'), reverse=True)
+    selected_seasons = st.sidebar.multiselect("Select Seasons", all_seasons, default=defaults['seasons'])
 
     # Season Type Filter
-    season_types = df['Type'].unique().tolist()
-    default_types = ['Seeding'] if 'Seeding' in season_types else [season_types[0]] if season_types else []
-    selected_types = st.sidebar.multiselect("Season Type", season_types, default=default_types)
+    season_types = index_values(filter_index, 'Type')
+    selected_types = st.sidebar.multiselect("Season Type", season_types, default=defaults['types'])
 
     # Age Category Filter
-    age_categories = sorted(df['Age Category'].unique().tolist())
-    default_ages = [age for age in ['U11', 'U13'] if age in age_categories]
-    selected_ages = st.sidebar.multiselect("Age Category", age_categories, default=default_ages)
+    age_categories = sorted(index_values(filter_index, 'Age Category'))
+    selected_ages = st.sidebar.multiselect("Age Category", age_categories, default=defaults['ages'])
 
     # Community Filter
-    all_communities = sorted(df['Community'].unique().tolist())
+    all_communities = sorted(index_values(filter_index, 'Community'))
 
     # Division Selector
     division = st.sidebar.radio("Hockey Calgary Division", ["All", "North", "South"], index=0)
 
-    north_communities = ['Springbank', 'North West', 'Bow River', 'McKnight', 'Raiders']
-    south_communities = ['Trails West', 'Glenlake', 'Bow Valley', 'Knights', 'Southwest', 'Wolverines']
-
-    if division == "North":
-        community_options = [c for c in all_communities if c in north_communities]
-    elif division == "South":
-        community_options = [c for c in all_communities if c in south_communities]
-    else:
-        community_options = all_communities
+    community_options = division_communities(all_communities, division)
 
     selected_communities = st.sidebar.multiselect("Select Communities", community_options, default=community_options)
 
     # League Filter
-    available_leagues = sorted(df[
-        (df['Season'].isin(selected_seasons)) &
-        (df['Type'].isin(selected_types)) & 
-        (df['Age Category'].isin(selected_ages))
-    ]['League'].unique().tolist())
+    available_leagues = index_options(filter_index, 'League', {
+        'Season': selected_seasons, 'Type': selected_types, 'Age Category': selected_ages
+    })
     selected_leagues = st.sidebar.multiselect("Select Leagues (Optional)", available_leagues, default=[])
 
     # Team Filter (Optional)
     # Filter teams based on selected communities to avoid too many options
-    available_teams = sorted(df[df['Community'].isin(selected_communities)]['Team'].unique().tolist())
+    available_teams = index_options(filter_index, 'Team', {'Community': selected_communities})
     selected_teams = st.sidebar.multiselect("Select Teams (Optional)", available_teams, default=[])
 
-    # Metric Selector
-    metric_map = {
-        'Points': 'PTS',
-        'Wins': 'W',
-        'Losses': 'L',
-        'Goal Diff': 'Diff',
-        'Goals For': 'GF',
-        'Goals Against': 'GA'
-    }
-    selected_metric_label = st.sidebar.selectbox("Select Metric", list(metric_map.keys()))
-    selected_metric = metric_map[selected_metric_label]
-
     # --- Apply Filters ---
-    filtered_df = df.copy()
-
-    if selected_seasons:
-        filtered_df = filtered_df[filtered_df['Season'].isin(selected_seasons)]
-
-    if selected_types:
-        filtered_df = filtered_df[filtered_df['Type'].isin(selected_types)]
-
-    if selected_ages:
-        filtered_df = filtered_df[filtered_df['Age Category'].isin(selected_ages)]
-
-    if selected_communities:
-        filtered_df = filtered_df[filtered_df['Community'].isin(selected_communities)]
-
-    if selected_leagues:
-        filtered_df = filtered_df[filtered_df['League'].isin(selected_leagues)]
-
-    if selected_teams:
-        filtered_df = filtered_df[filtered_df['Team'].isin(selected_teams)]
+    filters = (
+        tuple(selected_seasons), tuple(selected_types), tuple(selected_ages),
+        tuple(selected_communities), tuple(selected_leagues), tuple(selected_teams)
+    )
+    filtered_df = get_filtered_data(change_stamp, filters)
 
     # Export Filtered Data
     st.sidebar.markdown("---")
-    csv_filtered = filtered_df.to_csv(index=False).encode('utf-8')
     st.sidebar.download_button(
         label="Download Filtered Data (CSV)",
-        data=csv_filtered,
+        data=filtered_data_csv(change_stamp, filters),
         file_name='hockey_calgary_filtered_data.csv',
         mime='text/csv',
     )
@@ -235,12 +306,16 @@ if page == "Analytics":
         st.warning("No data matches the selected filters.")
         st.stop()
 
+    # Each section is a fragment that takes its inputs explicitly: a widget
+    # inside a section reruns only that section, and sidebar changes reuse
+    # the cached frames of sections whose inputs did not change.
+
     # --- Data Completeness Check ---
-    st.header("Data Completeness Check")
-    with st.expander("View Data Completeness Matrix"):
-        if not df.empty:
-            # Group by Season, Type, and Age Category to count records
-            completeness = df.groupby(['Season', 'Type', 'Age Category']).size().unstack(fill_value=0)
+    @st.fragment
+    def completeness_section(change_stamp):
+        st.header("Data Completeness Check")
+        with st.expander("View Data Completeness Matrix"):
+            completeness = get_completeness(change_stamp)
             
             # Display as a heatmap-style dataframe
             if HAS_MATPLOTLIB:
@@ -249,85 +324,93 @@ if page == "Analytics":
                 st.dataframe(completeness)
             
             st.caption("Numbers represent the count of team records found for each Season/Type/Age Group combination.")
-        else:
-            st.warning("No data available to check.")
 
     # --- Main Content ---
+    @st.fragment
+    def metric_sections(change_stamp, filters):
+        # Metric Selector (changing it reruns only the charts below)
+        metric_map = {
+            'Points': 'PTS',
+            'Wins': 'W',
+            'Losses': 'L',
+            'Goal Diff': 'Diff',
+            'Goals For': 'GF',
+            'Goals Against': 'GA'
+        }
+        selected_metric_label = st.selectbox("Select Metric", list(metric_map.keys()))
+        selected_metric = metric_map[selected_metric_label]
+        trend_df, ranking_df, heatmap_df, season_order = get_metric_frames(change_stamp, filters, selected_metric)
 
-    st.header(f"{selected_metric_label} Analysis")
-
-    # 1. Trend Over Time
-    st.subheader(f"📈 {selected_metric_label} Trends by Community")
-    st.markdown("How has performance changed over the seasons?")
-
-    # Aggregate by Season and Community
-    trend_df = filtered_df.groupby(['Season', 'Community'])[selected_metric].mean().reset_index()
-
-    fig_trend = px.line(
-        trend_df, 
-        x='Season', 
-        y=selected_metric, 
-        color='Community', 
-        markers=True,
-        title=f"Average {selected_metric_label} over Seasons",
-        category_orders={"Season": sorted(filtered_df['Season'].unique())}
-    )
-    st.plotly_chart(fig_trend, use_container_width=True)
-
-    # 2. Systemic Gap Analysis (Overall Ranking)
-    st.subheader("🏆 Strongest vs. Weakest (Systemic Gap)")
-    st.markdown(f"Ranking communities by average **{selected_metric_label}** over the selected period.")
-
-    ranking_df = filtered_df.groupby('Community')[selected_metric].mean().reset_index()
-    ranking_df = ranking_df.sort_values(by=selected_metric, ascending=False)
+        st.header(f"{selected_metric_label} Analysis")
 
-    col1, col2 = st.columns([2, 1])
+        # 1. Trend Over Time
+        st.subheader(f"📈 {selected_metric_label} Trends by Community")
+        st.markdown("How has performance changed over the seasons?")
 
-    with col1:
-        fig_bar = px.bar(
-            ranking_df, 
-            x='Community', 
+        fig_trend = charts.line(
+            trend_df, 
+            x='Season', 
             y=selected_metric, 
-            color=selected_metric,
-            color_continuous_scale='RdYlGn',
-            title=f"Overall Average {selected_metric_label}"
-        )
-        st.plotly_chart(fig_bar, use_container_width=True)
-
-    with col2:
-        st.dataframe(ranking_df.style.format({selected_metric: "{:.3f}"}), use_container_width=True)
-
-    # 3. Detailed Stats View
-    st.subheader("📋 Detailed Data")
-    with st.expander("View Raw Data"):
-        st.dataframe(
-            filtered_df,
-            column_config={
-                "Source": st.column_config.LinkColumn("Source URL")
-            }
-        )
-
-    # 4. Head-to-Head Matrix (Heatmap)
-    if len(selected_communities) > 1:
-        st.subheader("🔥 Performance Heatmap")
-        st.markdown("Compare performance intensity across seasons.")
-        
-        heatmap_df = filtered_df.pivot_table(
-            index='Community', 
-            columns='Season', 
-            values=selected_metric, 
-            aggfunc='mean'
-        )
-        
-        fig_heat = px.imshow(
-            heatmap_df,
-            text_auto=".2f",
-            color_continuous_scale='RdYlGn',
-            title=f"{selected_metric_label} Heatmap"
+            color='Community', 
+            markers=True,
+            title=f"Average {selected_metric_label} over Seasons",
+            category_orders={"Season": season_order}
         )
-        st.plotly_chart(fig_heat, use_container_width=True)
-
+        st.plotly_chart(fig_trend, use_container_width=True)
 
+        # 2. Systemic Gap Analysis (Overall Ranking)
+        st.subheader("🏆 Strongest vs. Weakest (Systemic Gap)")
+        st.markdown(f"Ranking communities by average **{selected_metric_label}** over the selected period.")
+
+        col1, col2 = st.columns([2, 1])
+
+        with col1:
+            fig_bar = px.bar(
+                ranking_df, 
+                x='Community', 
+                y=selected_metric, 
+                color=selected_metric,
+                color_continuous_scale='RdYlGn',
+                title=f"Overall Average {selected_metric_label}"
+            )
+            st.plotly_chart(fig_bar, use_container_width=True)
+
+        with col2:
+            st.dataframe(ranking_df.style.format({selected_metric: "{:.3f}"}), use_container_width=True)
+
+        # 3. Head-to-Head Matrix (Heatmap)
+        if len(filters[3]) > 1:
+            st.subheader("🔥 Performance Heatmap")
+            st.markdown("Compare performance intensity across seasons.")
+            
+            fig_heat = px.imshow(
+                heatmap_df,
+                text_auto=".2f",
+                color_continuous_scale='RdYlGn',
+                title=f"{selected_metric_label} Heatmap"
+            )
+            st.plotly_chart(fig_heat, use_container_width=True)
+
+    # 4. Detailed Stats View (independent of the metric)
+    @st.fragment
+    def raw_data_section(change_stamp, filters):
+        st.subheader("📋 Detailed Data")
+        with st.expander("View Raw Data"):
+            # Paged in the database: only the visible rows are fetched and sent
+            paginated_dataframe(
+                'raw_data',
+                list(STANDINGS_PAGE_COLUMNS),
+                get_standings_count(change_stamp, filters),
+                lambda sort_by, ascending, offset, limit: get_standings_page(change_stamp, filters, sort_by, ascending, offset, limit),
+                default_sort='Season',
+                column_config={
+                    "Source": st.column_config.LinkColumn("Source URL")
+                }
+            )
+
+    completeness_section(change_stamp)
+    metric_sections(change_stamp, filters)
+    raw_data_section(change_stamp, filters)
 
 elif page == "Tier 1 Dilution Analysis":
     st.header("📉 Systemic Dilution Analysis")
@@ -342,387 +425,195 @@ elif page == "Tier 1 Dilution Analysis":
     # --- Filters ---
     st.sidebar.header("Analysis Filters")
     
+    defaults = get_defaults(change_stamp)
+
     # Season Filter
-    all_seasons = sorted(df['Season'].unique().tolist(), reverse=True)
-    default_seasons = ['2025-2026'] if '2025-2026' in all_seasons else [all_seasons[0]] if all_seasons else []
-    selected_seasons = st.sidebar.multiselect("Select Seasons", all_seasons, default=default_seasons)
+    all_seasons = sorted(index_values(filter_index, 'Season'), reverse=True)
+    selected_seasons = st.sidebar.multiselect("Select Seasons", all_seasons, default=defaults['seasons'])
 
     # Season Type Filter
-    season_types = df['Type'].unique().tolist()
-    default_types = ['Seeding'] if 'Seeding' in season_types else [season_types[0]] if season_types else []
-    selected_types = st.sidebar.multiselect("Season Type", season_types, default=default_types)
+    season_types = index_values(filter_index, 'Type')
+    selected_types = st.sidebar.multiselect("Season Type", season_types, default=defaults['types'])
 
     # Age Category Filter
-    age_categories = sorted(df['Age Category'].unique().tolist())
-    default_ages = [age for age in ['U11', 'U13'] if age in age_categories]
-    selected_ages = st.sidebar.multiselect("Age Category", age_categories, default=default_ages)
+    age_categories = sorted(index_values(filter_index, 'Age Category'))
+    selected_ages = st.sidebar.multiselect("Age Category", age_categories, default=defaults['ages'])
 
     # Community Filter
-    all_communities = sorted(df['Community'].unique().tolist())
+    all_communities = sorted(index_values(filter_index, 'Community'))
     
     # Division Selector
     division = st.sidebar.radio("Hockey Calgary Division", ["All", "North", "South"], index=0)
 
-    north_communities = ['Springbank', 'North West', 'Bow River', 'McKnight', 'Raiders']
-    south_communities = ['Trails West', 'Glenlake', 'Bow Valley', 'Knights', 'Southwest', 'Wolverines']
-
-    if division == "North":
-        community_options = [c for c in all_communities if c in north_communities]
-    elif division == "South":
-        community_options = [c for c in all_communities if c in south_communities]
-    else:
-        community_options = all_communities
+    community_options = division_communities(all_communities, division)
         
     selected_communities = st.sidebar.multiselect("Select Communities", community_options, default=community_options)
 
-    # Metric Selector
-    metric_map = {
-        'Points %': 'Points %',
-        'Win %': 'Win %',
-        'Goal Diff/Game': 'Goal Diff/Game'
-    }
-    selected_metric_label = st.sidebar.selectbox("Select Performance Metric", list(metric_map.keys()))
-    selected_metric = metric_map[selected_metric_label]
+    # The metric-dependent analysis, as a fragment with explicit inputs
+    @st.fragment
+    def dilution_sections(change_stamp, selections):
+        # Metric Selector (changing it reruns only this section)
+        metric_map = {
+            'Points %': 'Points %',
+            'Win %': 'Win %',
+            'Goal Diff/Game': 'Goal Diff/Game'
+        }
+        selected_metric_label = st.selectbox("Select Performance Metric", list(metric_map.keys()))
+        selected_metric = metric_map[selected_metric_label]
 
-    # --- Data Processing ---
-    
-    # 1. Filter Base Data
-    analysis_df = df[
-        (df['Season'].isin(selected_seasons)) &
-        (df['Type'].isin(selected_types)) &
-        (df['Age Category'].isin(selected_ages)) &
-        (df['Community'].isin(selected_communities))
-    ].copy()
-    
-    if analysis_df.empty:
-        st.warning("No data matches the selected filters.")
-        st.stop()
-    
-    # 2. Identify Elite (AA/HADP) to exclude from Community Size Count
-    def is_elite(league_name):
-        name_upper = league_name.upper()
-        if 'AA' in name_upper: return True
-        if 'HADP' in name_upper: return True
-        return False
-        
-    analysis_df['Is_Elite'] = analysis_df['League'].apply(is_elite)
-    
-    # 3. Calculate Community Size (Total Non-Elite Teams) per Season/Community/Age
-    non_elite_df = analysis_df[~analysis_df['Is_Elite']].copy()
-    
-    # Group by Age Category as well
-    community_sizes = non_elite_df.groupby(['Season', 'Community', 'Age Category'])['Team'].nunique().reset_index()
-    community_sizes.rename(columns={'Team': 'Total_Community_Teams'}, inplace=True)
-    
-    # 4. Identify Tier 1 Teams (for Threshold Logic)
-    def is_tier_1(league_name):
-        parsed = parse_tier_info(league_name)
-        if parsed['tier'] == 1:
-            if parsed['stream'] == 'NBC': return False
-            return True
-        return False
-        
-    analysis_df['Is_Tier_1'] = analysis_df['League'].apply(is_tier_1)
+        # --- Data Processing ---
     
-    # Calculate Tier 1 Count per Community/Season/Age
-    tier1_counts = analysis_df[analysis_df['Is_Tier_1']].groupby(['Season', 'Community', 'Age Category'])['Team'].nunique().reset_index()
-    tier1_counts.rename(columns={'Team': 'Tier1_Count'}, inplace=True)
-    
-    # 5. Calculate OVERALL Performance per Community/Season/Age
-    # Only consider teams that have played games for performance stats to avoid skewing the average with 0-game teams
-    performance_df = non_elite_df[non_elite_df['GP'] > 0]
-    overall_stats = performance_df.groupby(['Season', 'Community', 'Age Category'])[selected_metric].mean().reset_index()
-    overall_stats.rename(columns={selected_metric: 'Overall_Performance'}, inplace=True)
-    
-    # 6. Merge Data
-    merged_df = pd.merge(community_sizes, tier1_counts, on=['Season', 'Community', 'Age Category'], how='left')
-    merged_df = pd.merge(merged_df, overall_stats, on=['Season', 'Community', 'Age Category'], how='left')
-    
-    # Fill NaN Tier 1 Count with 0
-    merged_df['Tier1_Count'] = merged_df['Tier1_Count'].fillna(0)
-    merged_df.dropna(subset=['Total_Community_Teams'], inplace=True)
-    
-    # --- NEW LOGIC: Threshold Analysis ---
-    
-    # Identify the Threshold PER SEASON AND AGE
-    # We calculate thresholds from the FULL dataset (filtered by Type/Age only) to ensure accuracy
-    # even if specific communities are filtered out of the view.
-    full_analysis_df = df[
-        (df['Type'].isin(selected_types)) & 
-        (df['Age Category'].isin(selected_ages))
-    ].copy()
-    full_analysis_df['Is_Tier_1'] = full_analysis_df['League'].apply(is_tier_1)
-    full_analysis_df['Is_Elite'] = full_analysis_df['League'].apply(is_elite)
-    full_non_elite = full_analysis_df[~full_analysis_df['Is_Elite']]
-    
-    full_sizes = full_non_elite.groupby(['Season', 'Community', 'Age Category'])['Team'].nunique().reset_index()
-    full_sizes.rename(columns={'Team': 'Total_Community_Teams'}, inplace=True)
-    
-    full_t1 = full_analysis_df[full_analysis_df['Is_Tier_1']].groupby(['Season', 'Community', 'Age Category'])['Team'].nunique().reset_index()
-    full_t1.rename(columns={'Team': 'Tier1_Count'}, inplace=True)
-    
-    full_merged = pd.merge(full_sizes, full_t1, on=['Season', 'Community', 'Age Category'], how='left')
-    full_merged['Tier1_Count'] = full_merged['Tier1_Count'].fillna(0)
-    
-    # Calculate thresholds map: (Season, Age) -> Inferred Threshold
-    # Algorithm: Find T that minimizes (Size < T & T1>=2) + (Size >= T & T1=1)
-    season_age_thresholds = {}
-    outliers_map = {} # (Season, Age) -> List of outlier strings
-    threshold_summary_data = []
-
-    grouped_thresholds = full_merged.groupby(['Season', 'Age Category'])
-
-    for (season, age), group in grouped_thresholds:
-        best_t = 0
-        max_score = -1
-        best_outliers = []
-        
-        # Range of possible team sizes in this group
-        if group.empty: continue
-        min_teams = int(group['Total_Community_Teams'].min())
-        max_teams = int(group['Total_Community_Teams'].max())
-        
-        # Brute force search for best threshold
-        # We look for a transition point. 
-        # If no 2-team communities exist, threshold is effectively infinite (or max+1)
-        if group['Tier1_Count'].max() < 2:
-             season_age_thresholds[(season, age)] = 999
-             continue
-
-        for t in range(min_teams, max_teams + 2):
-            # Rule: If Size >= t, expect T1 >= 2. Else T1 = 1.
-            compliant = group[
-                ((group['Total_Community_Teams'] < t) & (group['Tier1_Count'] <= 1)) |
-                ((group['Total_Community_Teams'] >= t) & (group['Tier1_Count'] >= 2))
-            ]
-            score = len(compliant)
-            
-            if score > max_score:
-                max_score = score
-                best_t = t
-                
-                # Identify outliers for this T
-                non_compliant = group[
-                    ~(((group['Total_Community_Teams'] < t) & (group['Tier1_Count'] <= 1)) |
-                      ((group['Total_Community_Teams'] >= t) & (group['Tier1_Count'] >= 2)))
-                ]
-                
-                outlier_list = []
-                for _, row in non_compliant.iterrows():
-                    # reason = "Playing Up" if row['Tier1_Count'] >= 2 else "Playing Down"
-                    outlier_list.append(f"{row['Community']} ({int(row['Total_Community_Teams'])} teams, {int(row['Tier1_Count'])} T1)")
-                best_outliers = outlier_list
-        
-        season_age_thresholds[(season, age)] = best_t
-        outliers_map[(season, age)] = best_outliers
-        
-        threshold_summary_data.append({
-            "Season": season,
-            "Age Category": age,
-            "Inferred Threshold": best_t,
-            "Outliers": ", ".join(best_outliers) if best_outliers else "None"
-        })
-
-    if not season_age_thresholds:
-        st.warning("Not enough data to identify 2-team thresholds (no communities with 2+ Tier 1 teams found in selected scope).")
-    else:
-        # Define Groups relative to threshold
-        def categorize_threshold(row):
-            key = (row['Season'], row['Age Category'])
-            if key not in season_age_thresholds:
-                return "Other"
-                
-            threshold = int(season_age_thresholds[key])
-            size = row['Total_Community_Teams']
-            t1_count = row['Tier1_Count']
-            
-            if t1_count == 1:
-                if size >= threshold - 3: 
-                    return "Just Below Threshold (1 Team)"
-                return "Small (1 Team)"
-            elif t1_count >= 2:
-                if size == threshold: 
-                    return "Just Above Threshold (Diluted)"
-                return "Large (Established)"
-            return "Other"
-
-        merged_df['Threshold Category'] = merged_df.apply(categorize_threshold, axis=1)
-        
-        # --- Create Labels for Plots ---
-        def get_label(row):
-            name = row['Community']
-            overrides = {
-                "Bow River": "BR",
-                "Bow Valley": "BV",
-                "Glenlake": "GL",
-                "Knights": "K",
-                "McKnight": "MK",
-                "North West": "NW",
-                "Raiders": "R",
-                "Southwest": "SW",
-                "Springbank": "SB",
-                "Trails West": "TW",
-                "Wolverines": "W"
-            }
-            abbrev = overrides.get(name, name[:2].upper())
-            season_short = row['Season'].split('-')[-1][-2:]
-            return f"{abbrev}-{season_short} ({row['Age Category']})"
+        merged_df = get_dilution_frame(change_stamp, selections, selected_metric)
 
-        merged_df['Label'] = merged_df.apply(get_label, axis=1)
+        if merged_df.empty:
+            st.warning("No data matches the selected filters.")
+            return
 
-        # --- Visualizations ---
-        
-        # 1. The "Cliff" Comparison
-        st.subheader("1. The 'Dilution Cliff' (Community-Wide)")
-        
-        # Display Thresholds Table
-        st.markdown("### Dynamic Thresholds")
-        st.markdown("The size threshold for requiring 2 Tier 1 teams varies by Season and Age Category.")
-        
-        if threshold_summary_data:
-            thresh_display = pd.DataFrame(threshold_summary_data)
-            st.table(thresh_display.sort_values(['Season', 'Age Category'], ascending=[False, True]))
+        # --- Threshold Analysis ---
+        # Thresholds come from the full dataset so they hold when communities are filtered out of the view
+        season_age_thresholds, outliers_map, threshold_summary_data = get_thresholds(change_stamp, selections[1], selections[2])
+
+        if not season_age_thresholds:
+            st.warning("Not enough data to identify 2-team thresholds (no communities with 2+ Tier 1 teams found in selected scope).")
         else:
-            st.info("No threshold data available.")
+            merged_df = categorize_thresholds(merged_df, season_age_thresholds)
 
-        st.markdown(f"""
-        Comparing the **Average Performance of ALL Teams** in the community.
-        *   **Just Below Threshold**: 1-3 teams smaller than the threshold (1 Tier 1).
-        *   **Just Above Threshold**: Exactly at the threshold (2 Tier 1s).
-        """)
-        
-        # Filter for relevant categories
-        contrast_df = merged_df[merged_df['Threshold Category'].isin([
-            "Just Below Threshold (1 Team)", 
-            "Just Above Threshold (Diluted)",
-            "Large (Established)"
-        ])].copy()
+            # --- Visualizations ---
         
-        # Imports for manual plotting
-        import plotly.graph_objects as go
-        import numpy as np
+            # 1. The "Cliff" Comparison
+            st.subheader("1. The 'Dilution Cliff' (Community-Wide)")
         
-        # Define Categories and Colors
-        categories = ["Just Below Threshold (1 Team)", "Just Above Threshold (Diluted)", "Large (Established)"]
-        colors = {
-            "Just Below Threshold (1 Team)": "#2ca02c", 
-            "Just Above Threshold (Diluted)": "#d62728", 
-            "Large (Established)": "#1f77b4"
-        }
+            # Display Thresholds Table
+            st.markdown("### Dynamic Thresholds")
+            st.markdown("The size threshold for requiring 2 Tier 1 teams varies by Season and Age Category.")
         
-        # Map Categories to X-values for Jittering
-        cat_map = {cat: i for i, cat in enumerate(categories)}
-        contrast_df['X_Base'] = contrast_df['Threshold Category'].map(cat_map)
+            if threshold_summary_data:
+                thresh_display = pd.DataFrame(threshold_summary_data)
+                st.table(thresh_display.sort_values(['Season', 'Age Category'], ascending=[False, True]))
+            else:
+                st.info("No threshold data available.")
+
+            st.markdown(f"""
+            Comparing the **Average Performance of ALL Teams** in the community.
+            *   **Just Below Threshold**: 1-3 teams smaller than the threshold (1 Tier 1).
+            *   **Just Above Threshold**: Exactly at the threshold (2 Tier 1s).
+            """)
+        
+            # Filter for relevant categories (jittered x positions for the scatter)
+            contrast_df = cliff_frame(merged_df)
+        
+            # Define Categories and Colors
+            categories = THRESHOLD_CATEGORIES
+            colors = {
+                "Just Below Threshold (1 Team)": "#2ca02c", 
+                "Just Above Threshold (Diluted)": "#d62728", 
+                "Large (Established)": "#1f77b4"
+            }
         
-        # Add Jitter (Random offset)
-        np.random.seed(42) # For consistent jitter
-        contrast_df['X_Jitter'] = contrast_df['X_Base'] + np.random.uniform(-0.2, 0.2, size=len(contrast_df))
+            cat_map = {cat: i for i, cat in enumerate(categories)}
         
-        fig_cliff = go.Figure()
+            fig_cliff = go.Figure()
         
-        # Add Box Plots (Background)
-        for cat in categories:
-            cat_data = contrast_df[contrast_df['Threshold Category'] == cat]
-            if cat_data.empty: continue
+            # Add Box Plots (Background)
+            for cat in categories:
+                cat_data = contrast_df[contrast_df['Threshold Category'] == cat]
+                if cat_data.empty: continue
+            
+                fig_cliff.add_trace(charts.box(
+                    cat_data['Overall_Performance'],
+                    cat_map[cat], # Position at integer x
+                    name=cat,
+                    marker_color=colors[cat],
+                    boxpoints=False, # We add points manually
+                    showlegend=True
+                ))
             
-            fig_cliff.add_trace(go.Box(
-                y=cat_data['Overall_Performance'],
-                x=[cat_map[cat]] * len(cat_data), # Position at integer x
-                name=cat,
-                marker_color=colors[cat],
-                boxpoints=False, # We add points manually
+            # Add Scatter Points (Jittered with Labels)
+            for cat in categories:
+                cat_data = contrast_df[contrast_df['Threshold Category'] == cat]
+                if cat_data.empty: continue
+                cat_data = charts.downsample(cat_data)
+
+                fig_cliff.add_trace(charts.scatter(
+                    cat_data['X_Jitter'],
+                    cat_data['Overall_Performance'],
+                    mode='markers+text' if len(cat_data) <= charts.MAX_TEXT_LABELS else 'markers',
+                    text=cat_data['Label'],
+                    textposition='top center',
+                    marker=dict(color=colors[cat], size=6),
+                    name=cat,
+                    showlegend=False, # Legend already shown by Box
+                    hovertext=charts.join_text(
+                        cat_data['Community'], " (", cat_data['Season'], ")<br>Teams: ",
+                        cat_data['Total_Community_Teams'], "<br>Tier 1: ", cat_data['Tier1_Count']
+                    ),
+                    hoverinfo='text+y'
+                ))
+
+            # Update Layout
+            fig_cliff.update_layout(
+                title=f"Community-Wide Performance Drop at Threshold",
+                yaxis_title=f"Avg Community {selected_metric_label}",
+                xaxis=dict(
+                    tickmode='array',
+                    tickvals=list(cat_map.values()),
+                    ticktext=list(cat_map.keys()),
+                    title="Threshold Category"
+                ),
                 showlegend=True
-            ))
+            )
             
-        # Add Scatter Points (Jittered with Labels)
-        for cat in categories:
-            cat_data = contrast_df[contrast_df['Threshold Category'] == cat]
-            if cat_data.empty: continue
-
-            fig_cliff.add_trace(go.Scatter(
-                x=cat_data['X_Jitter'],
-                y=cat_data['Overall_Performance'],
-                mode='markers+text',
-                text=cat_data['Label'],
-                textposition='top center',
-                marker=dict(color=colors[cat], size=6),
-                name=cat,
-                showlegend=False, # Legend already shown by Box
-                hovertext=cat_data.apply(lambda row: f"{row['Community']} ({row['Season']})<br>Teams: {row['Total_Community_Teams']}<br>Tier 1: {row['Tier1_Count']}", axis=1),
-                hoverinfo='text+y'
-            ))
-
-        # Update Layout
-        fig_cliff.update_layout(
-            title=f"Community-Wide Performance Drop at Threshold",
-            yaxis_title=f"Avg Community {selected_metric_label}",
-            xaxis=dict(
-                tickmode='array',
-                tickvals=list(cat_map.values()),
-                ticktext=list(cat_map.keys()),
-                title="Threshold Category"
-            ),
-            showlegend=True
-        )
-            
-        st.plotly_chart(fig_cliff, use_container_width=True)
-
-        # --- NEW VISUALIZATION: Impact of Aggressiveness on Performance ---
-        st.subheader("2. Impact of Tiering Aggressiveness")
-        st.markdown("""
-        This chart visualizes the relationship between **Tiering Aggressiveness** (% of teams in Tier 1) and **Overall Performance**.
-        *   **Trails** connect seasons chronologically.
-        *   **Down & Right**: Community became more aggressive and performance dropped (Dilution).
-        *   **Up & Right**: Community became more aggressive and performance improved/sustained.
-        """)
-        
-        # Calculate Tiering Aggressiveness for the trend chart
-        merged_df['Tiering_Aggressiveness'] = merged_df['Tier1_Count'] / merged_df['Total_Community_Teams']
-
-        # For the trend line, we aggregate by Season/Community (averaging across Age Categories if multiple selected)
-        # This gives a cleaner "Overall Community Health" view
-        trend_agg_df = merged_df.groupby(['Season', 'Community']).agg({
-            'Overall_Performance': 'mean',
-            'Tiering_Aggressiveness': 'mean',
-            'Total_Community_Teams': 'sum',
-            'Tier1_Count': 'sum'
-        }).reset_index()
-        
-        trend_agg_df = trend_agg_df.sort_values('Season')
-        
-        # Create short season label for the chart text
-        trend_agg_df['Season_Label'] = trend_agg_df['Season'].apply(lambda x: "'" + x.split('-')[-1][-2:])
-
-        fig_trend = px.line(
-            trend_agg_df,
-            x='Tiering_Aggressiveness',
-            y='Overall_Performance',
-            color='Community',
-            text='Season_Label',
-            markers=True,
-            hover_data={
-                'Season': True,
-                'Tiering_Aggressiveness': ':.1%',
-                'Overall_Performance': ':.3f',
-                'Total_Community_Teams': True,
-                'Tier1_Count': True,
-                'Season_Label': False
-            },
-            title=f"Performance vs. Tiering Aggressiveness (Trajectory)",
-            labels={
-                'Overall_Performance': f"Avg Community {selected_metric_label}",
-                'Tiering_Aggressiveness': 'Tiering Aggressiveness (% T1)'
-            }
-        )
-        
-        fig_trend.update_traces(textposition="top center")
-        fig_trend.update_layout(xaxis_tickformat='.0%')
-        
-        st.plotly_chart(fig_trend, use_container_width=True)
-
-    # 5. Data Table
-    with st.expander("View Analysis Data"):
-        st.dataframe(merged_df.sort_values(by='Total_Community_Teams'))
+            st.plotly_chart(fig_cliff, use_container_width=True)
+
+            # --- NEW VISUALIZATION: Impact of Aggressiveness on Performance ---
+            st.subheader("2. Impact of Tiering Aggressiveness")
+            st.markdown("""
+            This chart visualizes the relationship between **Tiering Aggressiveness** (% of teams in Tier 1) and **Overall Performance**.
+            *   **Trails** connect seasons chronologically.
+            *   **Down & Right**: Community became more aggressive and performance dropped (Dilution).
+            *   **Up & Right**: Community became more aggressive and performance improved/sustained.
+            """)
+        
+            trend_agg_df = aggressiveness_trend(merged_df)
+
+            fig_trend = charts.line(
+                trend_agg_df,
+                x='Tiering_Aggressiveness',
+                y='Overall_Performance',
+                color='Community',
+                text='Season_Label',
+                markers=True,
+                hover_data={
+                    'Season': True,
+                    'Tiering_Aggressiveness': ':.1%',
+                    'Overall_Performance': ':.3f',
+                    'Total_Community_Teams': True,
+                    'Tier1_Count': True,
+                    'Season_Label': False
+                },
+                title=f"Performance vs. Tiering Aggressiveness (Trajectory)",
+                labels={
+                    'Overall_Performance': f"Avg Community {selected_metric_label}",
+                    'Tiering_Aggressiveness': 'Tiering Aggressiveness (% T1)'
+                }
+            )
+        
+            fig_trend.update_traces(textposition="top center")
+            fig_trend.update_layout(xaxis_tickformat='.0%')
+        
+            st.plotly_chart(fig_trend, use_container_width=True)
+
+        # 5. Data Table
+        with st.expander("View Analysis Data"):
+            paginated_dataframe(
+                'analysis_data',
+                list(merged_df.columns),
+                len(merged_df),
+                lambda sort_by, ascending, offset, limit: frame_page(merged_df, sort_by, ascending, offset, limit),
+                default_sort='Total_Community_Teams'
+            )
+
+    dilution_sections(change_stamp, (tuple(selected_seasons), tuple(selected_types), tuple(selected_ages), tuple(selected_communities)))
 
 if page == "Experiments":
     st.title("🔬 Experiments: Tier Distribution Analysis")
@@ -732,114 +623,79 @@ if page == "Experiments":
     st.sidebar.header("Experiment Settings")
     
     # Season (Single)
-    all_seasons = sorted(df['Season'].unique().tolist(), reverse=True)
+    all_seasons = sorted(index_values(filter_index, 'Season'), reverse=True)
     exp_season = st.sidebar.selectbox("Select Season", all_seasons, index=0)
     
     # Age Category (Single)
-    age_cats = sorted(df['Age Category'].unique().tolist())
+    age_cats = sorted(index_values(filter_index, 'Age Category'))
     default_age = 'U11' if 'U11' in age_cats else age_cats[0]
     exp_age = st.sidebar.selectbox("Select Age Category", age_cats, index=age_cats.index(default_age) if default_age in age_cats else 0)
     
     # Season Type
-    types = df['Type'].unique().tolist()
+    types = index_values(filter_index, 'Type')
     default_type = 'Seeding' if 'Seeding' in types else types[0]
     exp_type = st.sidebar.selectbox("Season Type", types, index=types.index(default_type) if default_type in types else 0)
 
     # Communities (Multi)
     # Filter communities that actually have data for this selection
-    available_communities = df[
-        (df['Season'] == exp_season) & 
-        (df['Age Category'] == exp_age) & 
-        (df['Type'] == exp_type)
-    ]['Community'].unique().tolist()
+    available_communities = index_options(filter_index, 'Community', {
+        'Season': [exp_season], 'Age Category': [exp_age], 'Type': [exp_type]
+    })
     
     # Default to some interesting ones
     default_comms = [c for c in ['Bow Valley', 'Southwest', 'Springbank', 'Trails West'] if c in available_communities]
-    exp_communities = st.sidebar.multiselect("Select Communities", sorted(available_communities), default=default_comms)
+    exp_communities = st.sidebar.multiselect("Select Communities", available_communities, default=default_comms)
     
     if not exp_communities:
         st.warning("Please select at least one community.")
         st.stop()
 
-    # Data Processing
-    exp_df = df[
-        (df['Season'] == exp_season) & 
-        (df['Age Category'] == exp_age) & 
-        (df['Type'] == exp_type) & 
-        (df['Community'].isin(exp_communities))
-    ].copy()
-    
-    # Parse Tiers
-    def get_tier(league_name):
-        parsed = parse_tier_info(league_name)
-        tier = parsed.get('tier', None)
-        if tier == 'AA':
-            return 0 # Treat AA as Tier 0
-        return tier
-        
-    exp_df['Tier'] = exp_df['League'].apply(get_tier)
-    # Ensure numeric
-    exp_df['Tier'] = pd.to_numeric(exp_df['Tier'], errors='coerce')
-    exp_df = exp_df.dropna(subset=['Tier']) # Remove non-tiered leagues if any
+    # Data Processing (tiered teams cached for every community of this season/age/type)
+    exp_df, x_range, stats, pdf = get_tier_curves(change_stamp, exp_season, exp_age, exp_type, tuple(exp_communities))
     
     if exp_df.empty:
         st.warning("No tiered data found for the selected filters.")
         st.stop()
     
-    # Visualization
-    import plotly.graph_objects as go
+    # Visualization (WebGL): one curve per community, one rug trace for all teams
     fig = go.Figure()
     
-    # Determine X range based on data
-    min_tier = int(exp_df['Tier'].min())
-    max_tier = int(exp_df['Tier'].max())
-    x_range = np.linspace(max(0, min_tier - 1), max_tier + 1, 100)
-    
-    for comm in exp_communities:
-        comm_data = exp_df[exp_df['Community'] == comm]
-        tiers = comm_data['Tier'].values
+    selected = [c for c in exp_communities if c in stats.index]
+    for comm, row in zip(selected, stats.index.get_indexer(selected)):
+        teams, mu, std = stats['Teams'].iloc[row], stats['mu'].iloc[row], stats['std'].iloc[row]
         
-        if len(tiers) < 2:
+        if teams < 2:
             # Just plot a line at the tier
-            fig.add_trace(go.Scatter(
-                x=[tiers[0], tiers[0]],
+            fig.add_trace(go.Scattergl(
+                x=[mu, mu],
                 y=[0, 1],
                 mode='lines',
                 name=f"{comm} (1 Team)",
+                legendgroup=comm,
                 line=dict(width=4)
             ))
             continue 
             
-        mu, std = np.mean(tiers), np.std(tiers)
-        
-        # If std is 0 (all teams in same tier), we can't plot a bell curve. 
-        if std == 0:
-            std = 0.1 # Artificial width
-            
-        # Calculate PDF
-        pdf = (1 / (std * np.sqrt(2 * np.pi))) * np.exp(-0.5 * ((x_range - mu) / std) ** 2)
-        
-        # Add Trace
-        fig.add_trace(go.Scatter(
+        fig.add_trace(go.Scattergl(
             x=x_range, 
-            y=pdf, 
+            y=pdf[row], 
             mode='lines', 
             name=f"{comm} (µ={mu:.1f}, σ={std:.1f})",
-            fill='tozeroy',
-            # opacity=0.1 # Opacity is handled in color usually, but fill works
+            legendgroup=comm,
+            fill='tozeroy'
         ))
         
-        # Add Rug Plot (Actual Teams)
-        fig.add_trace(go.Scatter(
-            x=tiers,
-            y=[-0.02] * len(tiers), # Slightly below x-axis
-            mode='markers',
-            marker=dict(symbol='line-ns-open', size=10, color='black'),
-            name=f"{comm} Teams",
-            showlegend=False,
-            hoverinfo='x+text',
-            text=[f"{comm} Team" for _ in tiers]
-        ))
+    # Rug Plot (Actual Teams)
+    fig.add_trace(go.Scattergl(
+        x=exp_df['Tier'],
+        y=np.full(len(exp_df), -0.02), # Slightly below x-axis
+        mode='markers',
+        marker=dict(symbol='line-ns-open', size=10, color='black'),
+        name="Teams",
+        showlegend=False,
+        hoverinfo='x+text',
+        text=exp_df['Community'] + " Team"
+    ))
 
     fig.update_layout(
         title=f"Tier Distribution: {exp_season} {exp_age} ({exp_type})",
@@ -1,14 +1,31 @@
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
-from models import Base
+import os
+import time
+from contextlib import contextmanager
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.schema import CreateIndex
+from models import Base, SyncState, SyncJob
+from utilities.sql_timing import QueryStats
 
-DB_URL = "sqlite:///hockey_calgary.db"
+DB_URL = os.environ.get("HC_DB_URL", "sqlite:///hockey_calgary.db")
 
 engine = create_engine(DB_URL)
+
+# Per-process statement timings, aggregated by normalized SQL (see utilities.sql_timing)
+query_stats = QueryStats()
+query_stats.attach(engine)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 def init_db():
     Base.metadata.create_all(bind=engine)
+    # create_all skips indexes of tables that already exist
+    for index in SyncJob.__table__.indexes:
+        try:
+            with engine.begin() as conn:
+                conn.execute(CreateIndex(index, if_not_exists=True))
+        except IntegrityError:
+            print(f"Could not create {index.name}: more than one sync job is marked active.")
 
 def get_db():
     db = SessionLocal()
@@ -16,3 +33,65 @@ def get_db():
         yield db
     finally:
         db.close()
+
+def _db_file_mtime():
+    """Modification time of the SQLite database file (0.0 for other databases)."""
+    if engine.url.get_backend_name() != 'sqlite' or not engine.url.database or engine.url.database == ':memory:':
+        return 0.0
+    try:
+        return os.path.getmtime(engine.url.database)
+    except OSError:
+        return 0.0
+
+def get_change_stamp():
+    """
+    Returns (change_counter, updated_at, file_mtime) for the database.
+    Dashboards key their caches on it so they reload only after data
+    changed: the counter is bumped by syncs/polls and write_session(), the
+    SQLite file's mtime also catches writes that bypass both (manual edits).
+    """
+    mtime = _db_file_mtime()
+    db = SessionLocal()
+    try:
+        state = db.get(SyncState, 1)
+        if not state:
+            return (0, 0.0, mtime)
+        return (state.change_counter, state.updated_at, mtime)
+    except Exception:
+        # Table missing (e.g. mid-reset)
+        return (0, 0.0, mtime)
+    finally:
+        db.close()
+
+def bump_change_stamp():
+    db = SessionLocal()
+    try:
+        state = db.get(SyncState, 1)
+        if not state:
+            state = SyncState(id=1, change_counter=0)
+            db.add(state)
+        state.change_counter = (state.change_counter or 0) + 1
+        state.updated_at = time.time()
+        db.commit()
+        return (state.change_counter, state.updated_at)
+    finally:
+        db.close()
+
+@contextmanager
+def write_session():
+    """
+    A session for code that changes standings data outside a sync (e.g. the
+    maintenance scripts): commits on exit, then bumps the change stamp so
+    dashboards drop their cached frames. The stamp is bumped even if the
+    block fails, since commits made inside it have already landed.
+    """
+    db = SessionLocal()
+    try:
+        yield db
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+        bump_change_stamp()
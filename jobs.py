@@ -0,0 +1,239 @@
+import os
+import sys
+import signal
+import subprocess
+import threading
+import time
+from sqlalchemy import update, func
+from sqlalchemy.exc import IntegrityError
+from database import init_db, SessionLocal
+from models import SyncJob
+
+ACTIVE_STATUSES = ('queued', 'running')
+LOG_FLUSH_INTERVAL = 1.0 # seconds
+JOB_LOG_MAX_CHARS = 20000 # tail of the output kept on the job row (and shown by the dashboard)
+
+# Worker processes started by this process (pid -> Popen), polled so they get reaped
+_worker_procs = {}
+
+def _job_to_dict(job):
+    return {
+        'id': job.id,
+        'status': job.status,
+        'reset': bool(job.reset),
+        'progress': job.progress,
+        'message': job.message,
+        'log': job.log,
+        'pid': job.pid,
+        'created_at': job.created_at,
+        'started_at': job.started_at,
+        'finished_at': job.finished_at
+    }
+
+def _pid_alive(pid):
+    if not pid:
+        return False
+    proc = _worker_procs.get(pid)
+    if proc is not None:
+        return proc.poll() is None
+    if os.name != 'posix':
+        # os.kill(pid, 0) terminates the process on Windows
+        return _windows_pid_alive(pid)
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+def _windows_pid_alive(pid):
+    import ctypes
+    PROCESS_QUERY_LIMITED_INFORMATION = 0x1000
+    STILL_ACTIVE = 259
+    ERROR_ACCESS_DENIED = 5
+    kernel32 = ctypes.WinDLL('kernel32', use_last_error=True)
+    handle = kernel32.OpenProcess(PROCESS_QUERY_LIMITED_INFORMATION, False, pid)
+    if not handle:
+        # Exists but belongs to another user; any other error means it is gone
+        return ctypes.get_last_error() == ERROR_ACCESS_DENIED
+    try:
+        exit_code = ctypes.c_ulong()
+        if not kernel32.GetExitCodeProcess(handle, ctypes.byref(exit_code)):
+            return True
+        return exit_code.value == STILL_ACTIVE
+    finally:
+        kernel32.CloseHandle(handle)
+
+def _update_job(job_id, **values):
+    db = SessionLocal()
+    try:
+        db.execute(update(SyncJob).where(SyncJob.id == job_id).values(**values))
+        db.commit()
+    finally:
+        db.close()
+
+def get_job(job_id):
+    db = SessionLocal()
+    try:
+        job = db.get(SyncJob, job_id)
+        return _job_to_dict(job) if job else None
+    finally:
+        db.close()
+
+def get_latest_job():
+    """
+    Returns the most recent job (dict) or None. A running job whose worker
+    process has died is marked as failed.
+    """
+    db = SessionLocal()
+    try:
+        job = db.query(SyncJob).order_by(SyncJob.id.desc()).first()
+        if not job:
+            return None
+        if job.status in ACTIVE_STATUSES and job.pid and not _pid_alive(job.pid):
+            job.status = 'failed'
+            job.message = 'Worker process exited unexpectedly.'
+            job.finished_at = time.time()
+            db.commit()
+        return _job_to_dict(job)
+    finally:
+        db.close()
+
+def start_sync_job(reset=True):
+    """
+    Queues a sync job and launches a detached worker process for it.
+    Only one job runs at a time: if one is already active its id is returned.
+    The uq_sync_jobs_active index makes the INSERT fail when another session
+    queued a job since the check, so two concurrent clicks start one sync.
+    """
+    init_db()
+    latest = get_latest_job()
+    if latest and latest['status'] in ACTIVE_STATUSES:
+        return latest['id']
+
+    db = SessionLocal()
+    try:
+        job = SyncJob(status='queued', reset=1 if reset else 0, created_at=time.time(), message='Queued', log='')
+        db.add(job)
+        db.commit()
+        job_id = job.id
+    except IntegrityError:
+        db.rollback()
+        latest = get_latest_job()
+        return latest['id'] if latest else None
+    finally:
+        db.close()
+
+    popen_kwargs = {}
+    if os.name == 'posix':
+        popen_kwargs['start_new_session'] = True # Own process group, so cancel can stop parse workers too
+    else:
+        popen_kwargs['creationflags'] = subprocess.CREATE_NEW_PROCESS_GROUP
+    proc = subprocess.Popen(
+        [sys.executable, os.path.abspath(__file__), 'run', str(job_id)],
+        cwd=os.getcwd(),
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        **popen_kwargs
+    )
+    _worker_procs[proc.pid] = proc
+    _update_job(job_id, pid=proc.pid)
+    return job_id
+
+def cancel_job(job_id):
+    job = get_job(job_id)
+    if not job or job['status'] not in ACTIVE_STATUSES:
+        return False
+    if job['pid'] and _pid_alive(job['pid']):
+        try:
+            if os.name == 'posix':
+                os.killpg(job['pid'], signal.SIGTERM)
+            else:
+                subprocess.call(['taskkill', '/T', '/F', '/PID', str(job['pid'])],
+                                stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        except (ProcessLookupError, PermissionError):
+            pass
+    _update_job(job_id, status='cancelled', message='Cancelled', finished_at=time.time())
+    return True
+
+class JobLogWriter:
+    """
+    stdout replacement for the worker: appends printed output to the job's
+    log column, keeping only its last JOB_LOG_MAX_CHARS characters.
+    """
+
+    def __init__(self, job_id):
+        self.job_id = job_id
+        self._buffer = []
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def write(self, text):
+        with self._lock:
+            self._buffer.append(text)
+        return len(text)
+
+    def flush(self):
+        with self._lock:
+            chunk = "".join(self._buffer)
+            self._buffer = []
+        if chunk:
+            _update_job(self.job_id, log=func.substr(SyncJob.log + chunk[-JOB_LOG_MAX_CHARS:], -JOB_LOG_MAX_CHARS))
+
+    def _run(self):
+        while not self._stop.wait(LOG_FLUSH_INTERVAL):
+            self.flush()
+
+    def close(self):
+        self._stop.set()
+        self._thread.join()
+        self.flush()
+
+def run_job(job_id):
+    """Worker process entry point: runs sync_data and records progress, logs and outcome."""
+    from scraper import sync_data
+
+    job = get_job(job_id)
+    if not job or job['status'] != 'queued':
+        return
+    _update_job(job_id, status='running', pid=os.getpid(), started_at=time.time(), message='Starting sync...')
+
+    def on_progress(pct, msg):
+        _update_job(job_id, progress=int(pct), message=msg)
+
+    writer = JobLogWriter(job_id)
+
+    def on_terminate(signum, frame):
+        # Cancelled: keep what was logged so far and stop immediately (fetch threads included)
+        writer.flush()
+        os._exit(1)
+    signal.signal(signal.SIGTERM, on_terminate)
+
+    old_stdout = sys.stdout
+    sys.stdout = writer
+    try:
+        stats = sync_data(reset=job['reset'], progress_callback=on_progress)
+        status = 'succeeded'
+        message = f"Sync complete: {stats['changed']} standings tables updated, {stats['unchanged']} unchanged."
+    except BaseException as e:
+        status = 'failed'
+        message = f"An error occurred: {e!r}"
+    finally:
+        sys.stdout = old_stdout
+        writer.close()
+
+    if get_job(job_id)['status'] != 'cancelled':
+        values = {'status': status, 'message': message, 'finished_at': time.time()}
+        if status == 'succeeded':
+            values['progress'] = 100
+        _update_job(job_id, **values)
+
+if __name__ == "__main__":
+    if len(sys.argv) == 3 and sys.argv[1] == 'run':
+        run_job(int(sys.argv[2]))
+    else:
+        print("Usage: python jobs.py run <job_id>")
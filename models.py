@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, UniqueConstraint
+from sqlalchemy import Column, Integer, Float, String, Text, ForeignKey, UniqueConstraint, Index
 from sqlalchemy.orm import relationship, declarative_base
 
 Base = declarative_base()
@@ -60,3 +60,41 @@ class Standing(Base):
     team = relationship("Team")
 
     __table_args__ = (UniqueConstraint('season_id', 'league_id', 'team_id', name='_standing_uc'),)
+
+class StandingsSnapshot(Base):
+    # Hash of the last saved standings table per (season, league, source URL),
+    # used to skip re-saving tables that have not changed
+    __tablename__ = 'standings_snapshots'
+    id = Column(Integer, primary_key=True)
+    season_id = Column(Integer, ForeignKey('seasons.id'), nullable=False)
+    league_id = Column(Integer, ForeignKey('leagues.id'), nullable=False)
+    source_url = Column(String, nullable=False, default='')
+    content_hash = Column(String, nullable=False)
+
+    __table_args__ = (UniqueConstraint('season_id', 'league_id', 'source_url', name='_snapshot_uc'),)
+
+class SyncState(Base):
+    # Single-row change stamp, bumped whenever a sync or poll writes new standings
+    __tablename__ = 'sync_state'
+    id = Column(Integer, primary_key=True)
+    change_counter = Column(Integer, nullable=False, default=0)
+    updated_at = Column(Float, nullable=False, default=0.0)
+
+class SyncJob(Base):
+    # Background scraper runs started from the dashboard (see jobs.py)
+    __tablename__ = 'sync_jobs'
+    id = Column(Integer, primary_key=True)
+    status = Column(String, nullable=False, default='queued') # 'queued', 'running', 'succeeded', 'failed', 'cancelled'
+    reset = Column(Integer, nullable=False, default=0)
+    progress = Column(Integer, nullable=False, default=0)
+    message = Column(String, default='')
+    log = Column(Text, nullable=False, default='')
+    pid = Column(Integer)
+    created_at = Column(Float)
+    started_at = Column(Float)
+    finished_at = Column(Float)
+
+# At most one queued/running job: of two sessions starting a sync at the
+# same moment, the second INSERT fails (see jobs.start_sync_job)
+_active_job = SyncJob.status.in_(['queued', 'running'])
+Index('uq_sync_jobs_active', _active_job, unique=True, sqlite_where=_active_job, postgresql_where=_active_job)
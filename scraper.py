@@ -2,38 +2,235 @@ import requests
 from bs4 import BeautifulSoup
 import time
 from sqlalchemy.orm import Session
-from database import init_db, SessionLocal, engine
-from models import Season, League, Team, Community, Standing, Base
-from utilities.utils import normalize_community_name, load_community_map, save_community_map
+from database import init_db, SessionLocal, engine, bump_change_stamp, query_stats
+from models import Season, League, Team, Community, Standing, StandingsSnapshot, Base
+from utilities.utils import normalize_community_name, get_community_normalizer, load_community_map, save_community_map
+from utilities.metadata_cache import MetadataCache
+from utilities.parsing import index_division_links, is_standings_link, division_slug, make_soup
+from utilities.page_archive import PageArchive
+from utilities.profiling import StageProfiler
+from utilities.events import EventBus, JsonLinesSink, PrometheusSink, ProgressSink, METRICS_DIR
 import urllib3
+from urllib.parse import urlsplit
 from collections import defaultdict
 import re
 import json
+import hashlib
 
 import concurrent.futures
 import threading
+import os
+import sys
+import random
+from collections import OrderedDict
 
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
-BASE_URL = "https://www.hockeycalgary.ca"
+# Source sites. Override with environment variables to point a sync at another
+# host, e.g. the local stand-in server in scripts/benchmarks/fake_server.py.
+BASE_URL = os.environ.get("HC_BASE_URL", "https://www.hockeycalgary.ca")
+CURRENT_SEASON = "2025-2026"
+
+# Tables that survive sync_data(reset=True)
+PRESERVED_TABLES = {'sync_jobs', 'sync_state'}
+RAMP_BASE_URL = os.environ.get("HC_RAMP_URL", "http://hockeycalgary.msa4.rampinteractive.com")
+TEAMLINKT_BASE_URL = os.environ.get("HC_TEAMLINKT_URL", "https://leagues.teamlinkt.com")
+ALBERTA_ONE_BASE_URL = os.environ.get("HC_ALBERTA_ONE_URL", "https://albertaonehockey.ca")
 db_lock = threading.Lock()
 
-def get_soup(url):
+# Assoc ids, season options and game-type options per association/division
+metadata_cache = MetadataCache()
+
+# Process pool for the CPU-bound parse stage (set up by sync_data).
+# When None, pages are parsed inline in the calling thread.
+parse_executor = None
+
+# Per-run counts of standings tables that changed vs. were skipped as unchanged
+sync_stats = {'changed': 0, 'unchanged': 0}
+stats_lock = threading.Lock()
+
+# Raw page archive (set up by sync_data). With fetch_source 'archive', every
+# request is answered from the archive and the network is never touched.
+page_archive = None
+fetch_source = 'network'
+
+# Conditional GETs (ETag / Last-Modified) for the polling daemon.
+# request key -> {'etag', 'last_modified', 'content'}
+use_conditional_requests = False
+conditional_cache = {}
+conditional_lock = threading.Lock()
+
+# Parse results memoized on the raw body hash, so unchanged pages are not re-parsed
+PARSE_MEMO_SIZE = 4096
+parse_memo = OrderedDict()
+parse_memo_lock = threading.Lock()
+
+# Structured progress/metrics events (see utilities.events); sinks are attached per sync run
+events = EventBus()
+
+# Opt-in per-stage profiling (sync_data(profile=True)). These module functions are
+# wrapped with timing spans for the run. parse_page is left alone because it is
+# pickled into the parse pool; the parse_* spans are only recorded for pages
+# parsed in this process (parse_workers=0), run_parse covers the rest.
+PROFILED_STAGES = (
+    'http_request', 'fetch_content', 'get_soup', 'run_parse',
+    'parse_standings', 'parse_brackets', 'parse_ramp_json', 'parse_teamlinkt_json',
+    'get_ramp_metadata', 'get_teamlinkt_metadata', 'fetch_ramp_data', 'fetch_teamlinkt_data',
+    'normalize_community_name', 'save_standings', 'process_league', 'process_tournament'
+)
+profiler = None
+
+# Fixed-season RAMP sources that are not reachable from the main RAMP site.
+# Every standings link under /division/{category_id}/ becomes one league per game type.
+RAMP_SOURCES = [
+    {
+        'name': 'U11 Seeding 2024-2025 (RAMP)',
+        'base_url': RAMP_BASE_URL,
+        'category_id': '3300',
+        'stream': 'RAMP',
+        'slug_prefix': '',
+        'season': {'name': '2024-2025', 'id': '10604'},
+        'game_types': [
+            {'id': '8361', 'name': 'Seeding', 'type': 'Seeding'}
+        ]
+    },
+    {
+        'name': 'U11 2023-2024 (Alberta One)',
+        'base_url': ALBERTA_ONE_BASE_URL,
+        'category_id': '3300',
+        'stream': 'AlbertaOne',
+        'slug_prefix': 'abone-',
+        'season': {'name': '2023-2024', 'id': '10603'},
+        'game_types': [
+            {'id': '8361', 'name': 'Seeding', 'type': 'Seeding'},
+            {'id': '8814', 'name': 'Regular', 'type': 'Regular'}
+        ]
+    }
+]
+
+def http_request(method, url, data=None, headers=None, verify=False):
+    """
+    Single network entry point for the scraper. Returns the response body
+    and raises on HTTP errors. Bodies are recorded in the page archive when
+    one is active; in archive mode they are replayed from it instead.
+    """
+    start = time.perf_counter()
+    if fetch_source == 'archive':
+        content = page_archive.latest(method, url, data)
+        if content is None:
+            raise LookupError(f"{method} {url} is not in the page archive")
+        _emit_http(method, url, content, start, 'archive')
+        return content
+
+    key = PageArchive.request_key(method, url, data)
+    cached = None
+    if use_conditional_requests:
+        with conditional_lock:
+            cached = conditional_cache.get(key)
+        if cached:
+            headers = dict(headers or {})
+            if cached['etag']:
+                headers['If-None-Match'] = cached['etag']
+            if cached['last_modified']:
+                headers['If-Modified-Since'] = cached['last_modified']
+
+    if method == 'POST':
+        response = requests.post(url, data=data, headers=headers, verify=verify)
+    else:
+        response = requests.get(url, headers=headers, verify=verify)
+
+    if cached and response.status_code == 304:
+        _emit_http(method, url, b'', start, 'not_modified')
+        return cached['content']
+    response.raise_for_status()
+    _emit_http(method, url, response.content, start, 'miss')
+
+    if use_conditional_requests:
+        etag = response.headers.get('ETag')
+        last_modified = response.headers.get('Last-Modified')
+        if etag or last_modified:
+            with conditional_lock:
+                conditional_cache[key] = {'etag': etag, 'last_modified': last_modified, 'content': response.content}
+
+    if page_archive is not None:
+        page_archive.store(method, url, response.content, data)
+    return response.content
+
+def _emit_http(method, url, content, start, cache):
+    events.emit('http', host=urlsplit(url).netloc, method=method, url=url, bytes=len(content),
+                seconds=time.perf_counter() - start, cache=cache)
+
+def fetch_content(url):
+    """Fetches a page and returns the raw response bytes (None on error)."""
     try:
-        response = requests.get(url, verify=False)
-        response.raise_for_status()
-        return BeautifulSoup(response.content, 'html.parser')
+        return http_request('GET', url)
     except Exception as e:
         print(f"Error fetching {url}: {e}")
         return None
 
+def get_soup(url, page_type=None):
+    """
+    Fetches and parses a page. `page_type` (see utilities.parsing.PAGE_STRAINERS)
+    limits parsing to the tags that page type needs.
+    """
+    content = fetch_content(url)
+    if content is None:
+        return None
+    return make_soup(content, page_type)
+
+def parse_page(kind, content):
+    """
+    Parse stage entry point: turns raw page bytes into plain picklable
+    results so it can run in a worker process.
+
+    kind:
+      'standings'  -> parse_standings rows
+      'tournament' -> parse_standings rows, falling back to parse_brackets
+      'divisions'  -> [(href, link_text, division_name)] for every standings link
+    """
+    if kind == 'standings':
+        return parse_standings(make_soup(content, 'standings'))
+    if kind == 'tournament':
+        soup = make_soup(content)
+        return parse_standings(soup) or parse_brackets(soup)
+    if kind == 'divisions':
+        links = index_division_links(make_soup(content, 'divisions'), is_standings_link)
+        return [(a['href'], a.get_text(), name) for a, name in links]
+    raise ValueError(f"Unknown page kind: {kind}")
+
+def run_parse(kind, content):
+    """
+    Runs parse_page in the parse process pool if one is active. Results are
+    memoized on the body hash, so an unchanged page is parsed only once.
+    """
+    start = time.perf_counter()
+    memo_key = (kind, hashlib.sha256(content).digest())
+    with parse_memo_lock:
+        if memo_key in parse_memo:
+            parse_memo.move_to_end(memo_key)
+            result = parse_memo[memo_key]
+            events.emit('parse', kind=kind, bytes=len(content), seconds=time.perf_counter() - start, cache='hit')
+            return result
+
+    if parse_executor is None:
+        result = parse_page(kind, content)
+    else:
+        result = parse_executor.submit(parse_page, kind, content).result()
+    events.emit('parse', kind=kind, bytes=len(content), seconds=time.perf_counter() - start, cache='miss')
+
+    with parse_memo_lock:
+        parse_memo[memo_key] = result
+        if len(parse_memo) > PARSE_MEMO_SIZE:
+            parse_memo.popitem(last=False)
+    return result
+
 def get_leagues(year=None):
     if year:
         url = f"{BASE_URL}/standings/index/season/{year}"
     else:
         url = f"{BASE_URL}/standings"
         
-    soup = get_soup(url)
+    soup = get_soup(url, 'links')
     if not soup:
         return []
     
@@ -75,65 +272,72 @@ def get_ramp_leagues():
     """
     Scrapes U11 leagues from the RAMP Interactive site.
     """
-    url = "http://hockeycalgary.msa4.rampinteractive.com/"
-    soup = get_soup(url)
-    if not soup:
+    url = f"{RAMP_BASE_URL}/"
+    content = fetch_content(url)
+    if content is None:
         return []
         
     leagues = []
-    standings_links = soup.find_all('a', string=lambda t: t and 'Standings' in t)
+    # Pair each "Standings" link with the division header preceding it
+    division_links = run_parse('divisions', content)
     
-    for a in standings_links:
-        href = a['href']
-        # Traverse up to find a header for the league name
-        parent = a.parent
-        found_name = None
-        
-        # Go up 5 levels max
-        curr = parent
-        for _ in range(5):
-            if not curr: break
-            
-            # Check previous siblings for headers
-            prev = curr.find_previous_sibling(['h1', 'h2', 'h3', 'h4', 'h5', 'div'])
-            if prev:
-                text = prev.get_text(strip=True)
-                if text and len(text) < 50 and 'Games' not in text:
-                    found_name = text
-                    break
-            
-            header = curr.find(['h1', 'h2', 'h3', 'h4', 'h5'])
-            if header:
-                 text = header.get_text(strip=True)
-                 if text:
-                     found_name = text
-                     break
-                     
-            curr = curr.parent
-            
-        if found_name:
+    for href, text, found_name in division_links:
+        if found_name and 'Standings' in text:
             # href is like /division/3300/30084/standings
             # slug can be 3300/30084
-            try:
-                slug = href.replace('/division/', '').replace('/standings', '')
-                leagues.append({
-                    'name': found_name,
-                    'slug': slug,
-                    'stream': 'RAMP',
-                    'url': f"http://hockeycalgary.msa4.rampinteractive.com{href}",
-                    'type': 'Regular' # Assume regular for now
-                })
-            except Exception:
-                continue
+            leagues.append({
+                'name': found_name,
+                'slug': division_slug(href),
+                'stream': 'RAMP',
+                'url': f"{RAMP_BASE_URL}{href}",
+                'type': 'Regular' # Assume regular for now
+            })
                 
     return leagues
 
+def get_ramp_source_leagues(source):
+    """
+    Expands a declarative RAMP_SOURCES entry into league_info dicts for
+    process_league, one per division with a standings link.
+    """
+    url = f"{source['base_url']}/division/{source['category_id']}/"
+    content = fetch_content(url)
+    if content is None:
+        print(f"  Could not fetch division list for {source['name']}.")
+        return []
+
+    leagues = []
+    processed_slugs = set()
+    division_prefix = f"/division/{source['category_id']}/"
+
+    for href, _, found_name in run_parse('divisions', content):
+        if division_prefix not in href or 'standings' not in href:
+            continue
+        if not found_name:
+            continue
+
+        slug = division_slug(href)
+        if slug in processed_slugs:
+            continue
+        processed_slugs.add(slug)
+
+        leagues.append({
+            'name': found_name,
+            'slug': f"{source['slug_prefix']}{slug}",
+            'stream': source['stream'],
+            'url': f"{source['base_url']}{href}",
+            'type': 'Regular',
+            'seasons': [source['season']],
+            'game_types': source['game_types']
+        })
+    return leagues
+
 def get_teamlinkt_leagues():
     """
     Scrapes U13+ leagues from TeamLinkt.
     """
-    url = "https://leagues.teamlinkt.com/hockeycalgary/Standings"
-    soup = get_soup(url)
+    url = f"{TEAMLINKT_BASE_URL}/hockeycalgary/Standings"
+    soup = get_soup(url, 'selects')
     if not soup:
         return []
         
@@ -169,7 +373,7 @@ def get_tournaments(season_slug):
     results = []
     for t in tournaments:
         url = f"{BASE_URL}/tournament/content/season/{season_slug}/tournament/{t['slug']}/page/home"
-        soup = get_soup(url)
+        soup = get_soup(url, 'links')
         if not soup:
             continue
             
@@ -193,10 +397,13 @@ def get_tournaments(season_slug):
     return results
 
 def get_seasons_for_league(league_url):
-    soup = get_soup(league_url)
+    soup = get_soup(league_url, 'selects')
     if not soup:
         return []
-    
+    return parse_season_options(soup)
+
+def parse_season_options(soup):
+    """Season options of a legacy league page: [{'name', 'slug', 'url'}]."""
     seasons = []
     options = soup.find_all('option')
     for option in options:
@@ -213,66 +420,67 @@ def get_seasons_for_league(league_url):
             })
     return seasons
 
+STANDINGS_HEADER_MAP = {
+    'Team': 'team',
+    'GP': 'gp', 'Games played': 'gp',
+    'W': 'w', 'Wins': 'w',
+    'L': 'l', 'losses': 'l', 'Losses': 'l',
+    'T': 't', 'ties': 't', 'Ties': 't',
+    'PTS': 'pts', 'points': 'pts', 'Points': 'pts',
+    'GF': 'gf', 'goals for': 'gf', 'Goals For': 'gf',
+    'GA': 'ga', 'goals against': 'ga', 'Goals Against': 'ga',
+    'Diff': 'diff', 'DIFF': 'diff', 'Goal Differential': 'diff'
+}
+
 def parse_standings(soup):
     standings_data = []
-    table = soup.find('table', class_='table')
     
-    tables = soup.find_all('table')
-    target_table = None
-    for t in tables:
-        headers = [th.get_text(strip=True) for th in t.find_all('th')]
+    # Pick the first table whose header row has games played and points columns
+    target_rows = None
+    headers = None
+    for t in soup.find_all('table'):
+        rows = t.find_all('tr')
+        if not rows:
+            continue
+        headers = [th.get_text(strip=True) for th in rows[0].find_all('th')]
         if ('GP' in headers or 'Games played' in headers) and ('PTS' in headers or 'points' in headers):
-            target_table = t
+            target_rows = rows
             break
             
-    if not target_table:
+    if not target_rows:
         return []
-        
-    rows = target_table.find_all('tr')
-    headers = [th.get_text(strip=True) for th in rows[0].find_all('th')]
-    
-    header_map = {
-        'Team': 'team',
-        'GP': 'gp', 'Games played': 'gp',
-        'W': 'w', 'Wins': 'w',
-        'L': 'l', 'losses': 'l', 'Losses': 'l',
-        'T': 't', 'ties': 't', 'Ties': 't',
-        'PTS': 'pts', 'points': 'pts', 'Points': 'pts',
-        'GF': 'gf', 'goals for': 'gf', 'Goals For': 'gf',
-        'GA': 'ga', 'goals against': 'ga', 'Goals Against': 'ga',
-        'Diff': 'diff', 'DIFF': 'diff', 'Goal Differential': 'diff'
-    }
     
     col_indices = {}
     for idx, h in enumerate(headers):
         h_clean = h.strip()
-        if h_clean in header_map:
-            col_indices[header_map[h_clean]] = idx
-        elif h_clean.lower() in header_map:
-             col_indices[header_map[h_clean.lower()]] = idx
+        if h_clean in STANDINGS_HEADER_MAP:
+            col_indices[STANDINGS_HEADER_MAP[h_clean]] = idx
+        elif h_clean.lower() in STANDINGS_HEADER_MAP:
+             col_indices[STANDINGS_HEADER_MAP[h_clean.lower()]] = idx
             
     if 'team' not in col_indices:
         return []
         
-    for row in rows[1:]:
+    for row in target_rows[1:]:
         cols = row.find_all('td')
         if not cols: continue
         if len(cols) == 1 and "no standings available" in cols[0].get_text(): continue
         if len(cols) < 3: continue
-            
+        
+        values = [c.get_text(strip=True) for c in cols]
         entry = {}
         try:
-            entry['team'] = cols[col_indices['team']].get_text(strip=True)
-            entry['gp'] = int(cols[col_indices['gp']].get_text(strip=True) or 0)
-            entry['w'] = int(cols[col_indices['w']].get_text(strip=True) or 0)
-            entry['l'] = int(cols[col_indices['l']].get_text(strip=True) or 0)
-            entry['t'] = int(cols[col_indices.get('t', -1)].get_text(strip=True) or 0) if 't' in col_indices else 0
-            entry['pts'] = int(cols[col_indices['pts']].get_text(strip=True) or 0)
-            entry['gf'] = int(cols[col_indices.get('gf', -1)].get_text(strip=True) or 0) if 'gf' in col_indices else 0
-            entry['ga'] = int(cols[col_indices.get('ga', -1)].get_text(strip=True) or 0) if 'ga' in col_indices else 0
+            entry['team'] = values[col_indices['team']]
+            entry['gp'] = int(values[col_indices['gp']] or 0)
+            entry['w'] = int(values[col_indices['w']] or 0)
+            entry['l'] = int(values[col_indices['l']] or 0)
+            entry['t'] = int(values[col_indices['t']] or 0) if 't' in col_indices else 0
+            entry['pts'] = int(values[col_indices['pts']] or 0)
+            entry['gf'] = int(values[col_indices['gf']] or 0) if 'gf' in col_indices else 0
+            entry['ga'] = int(values[col_indices['ga']] or 0) if 'ga' in col_indices else 0
             
             if 'diff' in col_indices:
-                entry['diff'] = int(cols[col_indices['diff']].get_text(strip=True) or 0)
+                entry['diff'] = int(values[col_indices['diff']] or 0)
             else:
                 entry['diff'] = entry['gf'] - entry['ga']
             
@@ -365,25 +573,93 @@ def parse_brackets(soup):
         
     return results
 
+def get_select_options(soup, select_id, skip_values=()):
+    """
+    Returns [{'name': text, 'id': value}] for the options of a <select>,
+    plus the selected value (or the first option if none is selected).
+    """
+    select = soup.find('select', id=select_id)
+    if not select:
+        return [], None
+
+    options = []
+    selected = None
+    first = None
+    for opt in select.find_all('option'):
+        val = opt.get('value')
+        if first is None and val is not None:
+            first = val
+        if selected is None and opt.has_attr('selected'):
+            selected = val
+        if val and val not in skip_values:
+            options.append({'name': opt.get_text(strip=True), 'id': val})
+    return options, selected if selected is not None else first
+
+def find_script_id(soup, marker, pattern):
+    for s in soup.find_all('script'):
+        if s.string and marker in s.string:
+            match = re.search(pattern, s.string)
+            if match:
+                return match.group(1)
+            return None
+    return None
+
+def cached_metadata(key, fetcher):
+    """metadata_cache.get_or_fetch that reports the cache hit/miss as an event."""
+    fetched = []
+    def fetch():
+        fetched.append(True)
+        return fetcher()
+    value = metadata_cache.get_or_fetch(key, fetch)
+    events.emit('metadata', key=key, cache='miss' if fetched else 'hit')
+    return value
+
+def get_ramp_metadata(league_url):
+    """
+    Discovers the assoc id, season options and game-type options for a RAMP
+    division page. The page is fetched at most once per run (and reused from
+    the persisted cache until it expires).
+    """
+    def fetch():
+        soup = get_soup(league_url, 'metadata')
+        if not soup:
+            return None
+        seasons, default_season_id = get_select_options(soup, 'ddlSeason', skip_values=('0',))
+        game_types, _ = get_select_options(soup, 'ddlGameType', skip_values=('0',)) # Skip "All Game Types"
+        return {
+            'assoc_id': find_script_id(soup, 'getstandings3cached', r"getstandings3cached/(\d+)/"),
+            'seasons': seasons,
+            'default_season_id': default_season_id,
+            'game_types': game_types
+        }
+
+    return cached_metadata(f"ramp:{league_url}", fetch)
+
+def get_teamlinkt_metadata(league_url):
+    """
+    Discovers the association id and season options for a TeamLinkt
+    standings page, cached like get_ramp_metadata.
+    """
+    def fetch():
+        soup = get_soup(league_url, 'metadata')
+        if not soup:
+            return None
+        seasons, default_season_id = get_select_options(soup, 'season_id')
+        return {
+            'assoc_id': find_script_id(soup, 'getStandings', r"/leagues/getStandings/(\d+)/"),
+            'seasons': seasons,
+            'default_season_id': default_season_id
+        }
+
+    return cached_metadata(f"teamlinkt:{league_url}", fetch)
+
 def fetch_ramp_data(league_url, game_type_id=0, season_id=None):
-    soup = get_soup(league_url)
-    if not soup: return [], None
+    meta = get_ramp_metadata(league_url)
+    if not meta: return [], None
     
     # Extract SID
-    if season_id:
-        sid = season_id
-    else:
-        sid_select = soup.find('select', id='ddlSeason')
-        if not sid_select: return [], None
-        try:
-            sid = sid_select.find('option', selected=True)['value']
-        except TypeError:
-            # Fallback if no option is explicitly selected (use first)
-            options = sid_select.find_all('option')
-            if options:
-                sid = options[0]['value']
-            else:
-                return [], None
+    sid = season_id or meta['default_season_id']
+    if not sid: return [], None
     
     # Extract DID from URL
     # URL: .../division/3300/30078/standings
@@ -398,24 +674,12 @@ def fetch_ramp_data(league_url, game_type_id=0, season_id=None):
     except:
         return [], None
         
-    # Search for "getstandings3cached" in scripts to find the base URL pattern
-    script_content = ""
-    for s in soup.find_all('script'):
-        if s.string and 'getstandings3cached' in s.string:
-            script_content = s.string
-            break
-            
-    assoc_id = "3741" # Default
-    if script_content:
-        match = re.search(r"getstandings3cached/(\d+)/", script_content)
-        if match:
-            assoc_id = match.group(1)
+    assoc_id = meta['assoc_id'] or "3741" # Default
             
-    api_url = f"http://hockeycalgary.msa4.rampinteractive.com/api/leaguegame/getstandings3cached/{assoc_id}/{sid}/{game_type_id}/{cat_id}/{did}/0/0"
+    api_url = f"{RAMP_BASE_URL}/api/leaguegame/getstandings3cached/{assoc_id}/{sid}/{game_type_id}/{cat_id}/{did}/0/0"
     
     try:
-        resp = requests.get(api_url)
-        data = resp.json()
+        data = json.loads(http_request('GET', api_url, verify=True))
         return parse_ramp_json(data), api_url
     except Exception as e:
         print(f"Error fetching RAMP API: {e}")
@@ -445,40 +709,16 @@ def parse_ramp_json(data):
 
 def fetch_teamlinkt_data(league_url, hierarchy_value, season_id=None):
     # league_url is the main standings page
-    if not season_id:
-        soup = get_soup(league_url) # Use verify=False
-        if not soup: return [], None
-        
-        # Extract Season ID
-        sid_select = soup.find('select', id='season_id')
-        if not sid_select: return [], None
-        try:
-            season_id = sid_select.find('option', selected=True)['value']
-        except TypeError:
-            options = sid_select.find_all('option')
-            if options:
-                season_id = options[0]['value']
-            else:
-                return [], None
-    else:
-        # We still need soup to get assoc_id
-        soup = get_soup(league_url)
-        if not soup: return [], None
+    meta = get_teamlinkt_metadata(league_url)
+    if not meta: return [], None
     
-    # Extract Association ID from URL or script
-    script_content = ""
-    for s in soup.find_all('script'):
-        if s.string and 'getStandings' in s.string:
-            script_content = s.string
-            break
-            
-    assoc_id = "23957" # Default
-    if script_content:
-        match = re.search(r"/leagues/getStandings/(\d+)/", script_content)
-        if match:
-            assoc_id = match.group(1)
+    # Extract Season ID
+    season_id = season_id or meta['default_season_id']
+    if not season_id: return [], None
+    
+    assoc_id = meta['assoc_id'] or "23957" # Default
             
-    api_url = f"https://leagues.teamlinkt.com/leagues/getStandings/{assoc_id}/{season_id}"
+    api_url = f"{TEAMLINKT_BASE_URL}/leagues/getStandings/{assoc_id}/{season_id}"
     
     # Prepare payload
     parts = hierarchy_value.split('-')
@@ -496,14 +736,13 @@ def fetch_teamlinkt_data(league_url, hierarchy_value, season_id=None):
     
     try:
         # print(f"DEBUG: Fetching TeamLinkt API: {api_url} with payload {payload}")
-        resp = requests.post(api_url, data=payload, headers=headers, verify=False)
-        # print(f"DEBUG: Status: {resp.status_code}")
+        content = http_request('POST', api_url, data=payload, headers=headers)
         
         try:
-            data = resp.json()
+            data = json.loads(content)
         except Exception as json_err:
-            print(f"Error decoding JSON from TeamLinkt. Status: {resp.status_code}")
-            print(f"Response text preview: {resp.text[:500]}")
+            print("Error decoding JSON from TeamLinkt.")
+            print(f"Response text preview: {content[:500].decode('utf-8', errors='replace')}")
             raise json_err
             
         # Handle case where data is a string
@@ -546,15 +785,48 @@ def parse_teamlinkt_json(data):
             continue
     return standings
 
+STANDINGS_FIELDS = ('team', 'gp', 'w', 'l', 't', 'pts', 'gf', 'ga', 'diff')
+
+def hash_standings(data, community_map):
+    """
+    Order-independent hash of a parsed standings table. The community map is
+    included so mapping edits still re-save the affected tables.
+    """
+    rows = sorted([entry[f] for f in STANDINGS_FIELDS] for entry in data)
+    payload = json.dumps([rows, community_map], sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+def record_table_status(status):
+    with stats_lock:
+        sync_stats[status] += 1
+
 def save_standings(db, data, season, league, community_map, source_url=None):
+    """
+    Saves a parsed standings table. Returns 'changed', 'unchanged' (the table
+    hashes the same as the last save, so nothing is written) or None if
+    there was no data.
+    """
     if not data:
-        return
+        return None
+    
+    content_hash = hash_standings(data, community_map)
+    snapshot = db.query(StandingsSnapshot).filter_by(
+        season_id=season.id,
+        league_id=league.id,
+        source_url=source_url or ''
+    ).first()
+    if snapshot and snapshot.content_hash == content_hash:
+        record_table_status('unchanged')
+        events.emit('standings_saved', league=league.name, season=season.name, rows=0, status='unchanged')
+        return 'unchanged'
         
     print(f"  Saving {len(data)} teams for {season.name} - {league.name}")
     
+    rows_written = 0
+    normalizer = get_community_normalizer() # Once per table, not per team
     for entry in data:
         team_name = entry['team']
-        comm_name = normalize_community_name(team_name, community_map)
+        comm_name = normalize_community_name(team_name, community_map, normalizer)
         
         if not comm_name:
             # Skip teams that don't belong to allowed communities
@@ -603,8 +875,111 @@ def save_standings(db, data, season, league, community_map, source_url=None):
             standing.source_url = source_url
         
         db.commit()
+        rows_written += 1
+
+    if not snapshot:
+        snapshot = StandingsSnapshot(season_id=season.id, league_id=league.id, source_url=source_url or '')
+        db.add(snapshot)
+    snapshot.content_hash = content_hash
+    db.commit()
+    record_table_status('changed')
+    events.emit('standings_saved', league=league.name, season=season.name, rows=rows_written, status='changed')
+    return 'changed'
+
+def legacy_standings_targets(league_info, only_seasons=None):
+    """
+    Resolves the standings pages of a legacy league: the base page, its
+    type variants (Regular, Seeding, Playoff) and each variant's season
+    list. Returns [(type, [(season_name, target_url, fallback_url)])] in
+    processing order. The polling daemon resolves these once per league
+    discovery so a pass only fetches the standings pages themselves.
+    """
+    # 1. Discover all variations (Regular, Seeding, Playoff)
+    urls_to_process = {league_info['url']}
+    base_soup = get_soup(league_info['url'], 'links')
+    if base_soup:
+        for a in base_soup.find_all('a', href=True):
+            href = a['href']
+            # Look for sibling links (same league, different type)
+            if '/league/' in href and league_info['slug'] in href:
+                if '/type/' in href:
+                     urls_to_process.add(f"{BASE_URL}{href}")
+
+    # 2. Resolve each variation's season pages
+    targets = []
+    for url in urls_to_process:
+        # Determine type from URL
+        current_type = 'Regular'
+        if '/type/seeding' in url:
+            current_type = 'Seeding'
+        elif '/type/playoff' in url:
+            current_type = 'Playoff'
+        elif '/type/tournament' in url:
+            current_type = 'Tournament'
+        
+        # Check if "Regular" URL is actually showing Seeding data
+        skip_current_season_as_regular = False
+        if current_type == 'Regular':
+            # Use base_soup if available and matching URL, otherwise fetch
+            if url == league_info['url'] and base_soup:
+                check_soup = base_soup
+            else:
+                check_soup = get_soup(url, 'links')
+                
+            if check_soup:
+                # Check if there is an ACTIVE link to seeding
+                # This implies the page is defaulting to Seeding view
+                active_seeding = check_soup.find('a', href=lambda h: h and '/type/seeding' in h, class_='active')
+                if active_seeding:
+                    print(f"  Note: {url} defaults to 'Seeding' view. Will skip current season data for Regular.")
+                    skip_current_season_as_regular = True
+
+        season_targets = []
+        seasons = get_seasons_for_league(url)
+        for season_info in seasons:
+            if only_seasons is not None and season_info['name'] not in only_seasons:
+                continue
+
+            # Skip 2025-2026 for legacy sources IF it is U13 (sourced from TeamLinkt) or U11 (sourced from RAMP)
+            # U15 should be processed here for 2025-2026
+            if season_info['name'] == '2025-2026':
+                # If we flagged to skip current season as regular, skip it
+                if skip_current_season_as_regular:
+                    continue
 
-def process_league(league_info, community_map, processed_leagues, processed_lock):
+                # Check if this league is U13 or U11
+                # league_info['name'] or l_name might contain the category
+                # Or check the slug
+                is_u13 = 'u13' in league_info['slug'].lower() or 'u13' in league_info['name'].lower()
+                is_u11 = 'u11' in league_info['slug'].lower() or 'u11' in league_info['name'].lower()
+                
+                if is_u13 or is_u11:
+                    continue
+
+            # Construct target URL based on type
+            target_url = season_info['url']
+            
+            # Remove existing type if present to avoid duplication or conflict
+            target_url = re.sub(r'/type/[^/]+', '', target_url)
+            
+            if current_type == 'Regular':
+                target_url = f"{target_url}/type/league"
+            elif current_type == 'Seeding':
+                target_url = f"{target_url}/type/seeding"
+            elif current_type == 'Playoff':
+                target_url = f"{target_url}/type/playoff"
+            elif current_type == 'Tournament':
+                target_url = f"{target_url}/type/tournament"
+
+            season_targets.append((season_info['name'], target_url, season_info['url']))
+        targets.append((current_type, season_targets))
+    return targets
+
+def process_league(league_info, community_map, processed_leagues, processed_lock, only_seasons=None):
+    """
+    Scrapes every season of a league. `only_seasons` (a set of season names,
+    e.g. {"2025-2026"}) restricts the scrape to those seasons.
+    """
     # Create a new session for this thread
     db = SessionLocal()
     
@@ -619,61 +994,57 @@ def process_league(league_info, community_map, processed_leagues, processed_lock
         print(f"Processing {league_info['name']} ({league_info['stream']})...")
         
         # Get or create League
-        with db_lock:
-            league = db.query(League).filter_by(
-                slug=league_info['slug'], 
-                stream=league_info['stream'],
-                type=league_info['type']
-            ).first()
-            
-            if not league:
-                league = League(
-                    name=league_info['name'], 
+        # (RAMP_SOURCES divisions only get one league per declared game type)
+        league = None
+        if 'game_types' not in league_info:
+            with db_lock:
+                league = db.query(League).filter_by(
                     slug=league_info['slug'], 
                     stream=league_info['stream'],
                     type=league_info['type']
-                )
-                db.add(league)
-                db.commit()
-                db.refresh(league)
+                ).first()
+                
+                if not league:
+                    league = League(
+                        name=league_info['name'], 
+                        slug=league_info['slug'], 
+                        stream=league_info['stream'],
+                        type=league_info['type']
+                    )
+                    db.add(league)
+                    db.commit()
+                    db.refresh(league)
             
         # Determine seasons and fetch data
-        if league_info['stream'] == 'RAMP':
-            # Fetch the page to find available seasons and game types
-            soup = get_soup(league_info['url'])
-            if not soup: return
-
-            # 1. Find Seasons
-            ramp_seasons = []
-            season_select = soup.find('select', id='ddlSeason')
-            if season_select:
-                for opt in season_select.find_all('option'):
-                    val = opt.get('value')
-                    text = opt.get_text(strip=True)
-                    if val and val != '0':
-                        ramp_seasons.append({'name': text, 'id': val})
-            
-            # If no seasons found, default to current (hardcoded fallback)
-            if not ramp_seasons:
-                ramp_seasons.append({'name': "2025-2026", 'id': None})
-
-            # 2. Find Game Types
-            game_types = []
-            gt_select = soup.find('select', id='ddlGameType')
-            if gt_select:
-                for opt in gt_select.find_all('option'):
-                    val = opt.get('value')
-                    text = opt.get_text(strip=True)
-                    if val and val != '0': # Skip "All Game Types"
-                        game_types.append({'name': text, 'id': val})
-            
-            # If no game types, use default 0
-            if not game_types:
-                game_types.append({'name': 'Regular', 'id': 0})
+        if league_info['stream'] in ('RAMP', 'AlbertaOne'):
+            if 'game_types' in league_info:
+                # Declarative RAMP_SOURCES entry: fixed season and game types
+                ramp_seasons = list(league_info['seasons'])
+                game_types = list(league_info['game_types'])
+            else:
+                # Seasons and game types come from the cached division metadata
+                meta = get_ramp_metadata(league_info['url'])
+                if not meta: return
+
+                # 1. Find Seasons
+                ramp_seasons = list(meta['seasons'])
+                
+                # If no seasons found, default to current (hardcoded fallback)
+                if not ramp_seasons:
+                    ramp_seasons.append({'name': "2025-2026", 'id': None})
+
+                # 2. Find Game Types
+                game_types = list(meta['game_types'])
+                
+                # If no game types, use default 0
+                if not game_types:
+                    game_types.append({'name': 'Regular', 'id': 0})
 
             # Iterate Seasons
             for r_season in ramp_seasons:
                 season_name = r_season['name']
+                if only_seasons is not None and season_name not in only_seasons:
+                    continue
                 season_id = r_season['id']
                 
                 # Ensure season exists in DB
@@ -687,20 +1058,27 @@ def process_league(league_info, community_map, processed_leagues, processed_lock
                 
                 # Iterate Game Types
                 for gt in game_types:
-                    print(f"  Fetching RAMP {season_name} - {gt['name']} (SID: {season_id}, GTID: {gt['id']})...")
+                    print(f"  Fetching {league_info['stream']} {season_name} - {gt['name']} (SID: {season_id}, GTID: {gt['id']})...")
                     
                     # Determine League (Create specific if needed)
                     if gt['id'] == 0:
                         target_league = league
                     else:
-                        specific_league_name = f"{league_info['name']} - {gt['name']}"
                         specific_league_slug = f"{league_info['slug']}-{gt['name'].lower()}"
-                        specific_league_type = 'Seeding' if 'Seeding' in gt['name'] else 'Regular'
+                        if 'type' in gt:
+                            # Declared game type: only suffix non-regular types not already in the name
+                            specific_league_type = gt['type']
+                            specific_league_name = league_info['name']
+                            if specific_league_type != 'Regular' and specific_league_type not in specific_league_name:
+                                specific_league_name = f"{specific_league_name} - {specific_league_type}"
+                        else:
+                            specific_league_name = f"{league_info['name']} - {gt['name']}"
+                            specific_league_type = 'Seeding' if 'Seeding' in gt['name'] else 'Regular'
                         
                         with db_lock:
                             target_league = db.query(League).filter_by(
                                 slug=specific_league_slug,
-                                stream='RAMP',
+                                stream=league_info['stream'],
                                 type=specific_league_type
                             ).first()
                             
@@ -708,7 +1086,7 @@ def process_league(league_info, community_map, processed_leagues, processed_lock
                                 target_league = League(
                                     name=specific_league_name,
                                     slug=specific_league_slug,
-                                    stream='RAMP',
+                                    stream=league_info['stream'],
                                     type=specific_league_type
                                 )
                                 db.add(target_league)
@@ -720,18 +1098,11 @@ def process_league(league_info, community_map, processed_leagues, processed_lock
                         save_standings(db, data, season, target_league, community_map, source_url)
 
         elif league_info['stream'] == 'TeamLinkt':
-            # Fetch the page to find available seasons (e.g. Seeding vs Regular)
-            soup = get_soup(league_info['url'])
-            if not soup: return []
+            # Seasons (e.g. Seeding vs Regular) come from the cached page metadata
+            meta = get_teamlinkt_metadata(league_info['url'])
+            if not meta: return []
             
-            tl_seasons = []
-            sid_select = soup.find('select', id='season_id')
-            if sid_select:
-                for opt in sid_select.find_all('option'):
-                    val = opt.get('value')
-                    text = opt.get_text(strip=True)
-                    if val:
-                        tl_seasons.append({'name': text, 'id': val})
+            tl_seasons = list(meta['seasons'])
             
             # If no seasons found, try default logic (though unlikely if page loaded)
             if not tl_seasons:
@@ -749,6 +1120,8 @@ def process_league(league_info, community_map, processed_leagues, processed_lock
                 year_match = re.search(r"(\d{4})[-/](\d{4})", s_text)
                 if year_match:
                     season_name = f"{year_match.group(1)}-{year_match.group(2)}"
+                if only_seasons is not None and season_name not in only_seasons:
+                    continue
                 
                 # Determine Type
                 l_type = 'Regular'
@@ -807,47 +1180,12 @@ def process_league(league_info, community_map, processed_leagues, processed_lock
                     save_standings(db, data, season, league, community_map, source_url)
                 
         else:
-            # Legacy/Standard
-            
-            # 1. Discover all variations (Regular, Seeding, Playoff)
-            urls_to_process = {league_info['url']}
-            base_soup = get_soup(league_info['url'])
-            if base_soup:
-                for a in base_soup.find_all('a', href=True):
-                    href = a['href']
-                    # Look for sibling links (same league, different type)
-                    if '/league/' in href and league_info['slug'] in href:
-                        if '/type/' in href:
-                             urls_to_process.add(f"{BASE_URL}{href}")
-
-            # 2. Process each variation
-            for url in urls_to_process:
-                # Determine type from URL
-                current_type = 'Regular'
-                if '/type/seeding' in url:
-                    current_type = 'Seeding'
-                elif '/type/playoff' in url:
-                    current_type = 'Playoff'
-                elif '/type/tournament' in url:
-                    current_type = 'Tournament'
-                
-                # Check if "Regular" URL is actually showing Seeding data
-                skip_current_season_as_regular = False
-                if current_type == 'Regular':
-                    # Use base_soup if available and matching URL, otherwise fetch
-                    if url == league_info['url'] and base_soup:
-                        check_soup = base_soup
-                    else:
-                        check_soup = get_soup(url)
-                        
-                    if check_soup:
-                        # Check if there is an ACTIVE link to seeding
-                        # This implies the page is defaulting to Seeding view
-                        active_seeding = check_soup.find('a', href=lambda h: h and '/type/seeding' in h, class_='active')
-                        if active_seeding:
-                            print(f"  Note: {url} defaults to 'Seeding' view. Will skip current season data for Regular.")
-                            skip_current_season_as_regular = True
-                
+            # Legacy/Standard: pages resolved at discovery (daemon) or now
+            targets = league_info.get('legacy_targets')
+            if targets is None:
+                targets = legacy_standings_targets(league_info, only_seasons)
+
+            for current_type, season_targets in targets:
                 # Create/Get League for this specific type
                 # Note: The original league_info might be for Regular, but here we might be processing Seeding
                 
@@ -889,69 +1227,38 @@ def process_league(league_info, community_map, processed_leagues, processed_lock
                         db.commit()
                         db.refresh(league)
 
-                seasons = get_seasons_for_league(url)
-                for season_info in seasons:
-                    # Skip 2025-2026 for legacy sources IF it is U13 (sourced from TeamLinkt) or U11 (sourced from RAMP)
-                    # U15 should be processed here for 2025-2026
-                    if season_info['name'] == '2025-2026':
-                        # If we flagged to skip current season as regular, skip it
-                        if skip_current_season_as_regular:
-                            continue
-
-                        # Check if this league is U13 or U11
-                        # league_info['name'] or l_name might contain the category
-                        # Or check the slug
-                        is_u13 = 'u13' in league_info['slug'].lower() or 'u13' in league_info['name'].lower()
-                        is_u11 = 'u11' in league_info['slug'].lower() or 'u11' in league_info['name'].lower()
-                        
-                        if is_u13 or is_u11:
-                            continue
-
+                for season_name, target_url, fallback_url in season_targets:
                     # Note: known_seasons tracking is tricky in parallel. 
                     # We might need to return known seasons from this function or use a shared set.
                     # For now, let's just process.
                     
                     with db_lock:
-                        season = db.query(Season).filter_by(name=season_info['name']).first()
+                        season = db.query(Season).filter_by(name=season_name).first()
                         if not season:
-                            season = Season(name=season_info['name'])
+                            season = Season(name=season_name)
                             db.add(season)
                             db.commit()
                             db.refresh(season)
-                    
-                    # Construct target URL based on type
-                    target_url = season_info['url']
-                    
-                    # Remove existing type if present to avoid duplication or conflict
-                    target_url = re.sub(r'/type/[^/]+', '', target_url)
-                    
-                    if current_type == 'Regular':
-                        target_url = f"{target_url}/type/league"
-                    elif current_type == 'Seeding':
-                        target_url = f"{target_url}/type/seeding"
-                    elif current_type == 'Playoff':
-                        target_url = f"{target_url}/type/playoff"
-                    elif current_type == 'Tournament':
-                        target_url = f"{target_url}/type/tournament"
                         
-                    soup = get_soup(target_url)
-                    if soup:
-                        data = parse_standings(soup)
+                    content = fetch_content(target_url)
+                    if content is not None:
+                        data = run_parse('standings', content)
                         # Fallback to original URL if no data found and type is Regular
                         # (Some older seasons might not use /type/league)
                         if not data and current_type == 'Regular':
-                             # print(f"  No data at {target_url}, trying fallback to {season_info['url']}")
-                             soup_fallback = get_soup(season_info['url'])
-                             if soup_fallback:
-                                 data = parse_standings(soup_fallback)
-                                 target_url = season_info['url'] # Update target_url if fallback used
+                             # print(f"  No data at {target_url}, trying fallback to {fallback_url}")
+                             content_fallback = fetch_content(fallback_url)
+                             if content_fallback is not None:
+                                 data = run_parse('standings', content_fallback)
+                                 target_url = fallback_url # Update target_url if fallback used
                         
                         with db_lock:
                             save_standings(db, data, season, league, community_map, target_url)
                         
             # Return known seasons for tournament processing (from the main url)
             # This is a bit loose but tournaments are usually linked to the main season slug
-            return [s['slug'] for s in get_seasons_for_league(league_info['url'])]
+            if only_seasons is None:
+                return [s['slug'] for s in get_seasons_for_league(league_info['url'])]
             
     except Exception as e:
         print(f"Error processing league {league_info['name']}: {e}")
@@ -991,14 +1298,12 @@ def process_tournament(t_info, season_slug, community_map):
         if not season:
             return
 
-        soup = get_soup(t_info['url'])
-        if not soup:
+        content = fetch_content(t_info['url'])
+        if content is None:
             return
         
-        data = parse_standings(soup)
-        if not data:
-            # print(f"    No standings table found, trying brackets parser...")
-            data = parse_brackets(soup)
+        # Standings table, falling back to the brackets parser
+        data = run_parse('tournament', content)
             
         with db_lock:
             save_standings(db, data, season, league, community_map, t_info['url'])
@@ -1008,258 +1313,133 @@ def process_tournament(t_info, season_slug, community_map):
     finally:
         db.close()
 
-def fetch_u11_seeding_2024_2025(community_map):
-    print("Fetching U11 Seeding data for 2024-2025 (RAMP)...")
-    url = "http://hockeycalgary.msa4.rampinteractive.com/division/3300/"
-    soup = get_soup(url)
-    if not soup:
-        print("  Could not fetch U11 division list.")
-        return
-
-    # Find all division links
-    # They look like /division/3300/XXXXX/standings
-    links = soup.find_all('a', href=True)
-    
-    season_id = "10604" # 2024-2025
-    game_type_id = "8361" # Seeding
-    season_name = "2024-2025"
-    
-    db = SessionLocal()
+def run_task(group, name, func, *args):
+    """Runs one unit of sync work, wrapped in task_started/task_finished events."""
+    events.emit('task_started', group=group, name=name)
+    start = time.perf_counter()
+    ok = False
     try:
-        # Ensure Season exists
-        with db_lock:
-            season = db.query(Season).filter_by(name=season_name).first()
-            if not season:
-                season = Season(name=season_name)
-                db.add(season)
-                db.commit()
-                db.refresh(season)
-        
-        processed_slugs = set()
-
-        for link in links:
-            href = link['href']
-            if '/division/3300/' in href and 'standings' in href:
-                # Extract Division Name
-                # The link text is usually "Standings", we need to find the header
-                # Similar logic to get_ramp_leagues
-                
-                # Traverse up to find a header for the league name
-                parent = link.parent
-                found_name = None
-                
-                # Go up 5 levels max
-                curr = parent
-                for _ in range(5):
-                    if not curr: break
-                    
-                    # Check previous siblings for headers
-                    prev = curr.find_previous_sibling(['h1', 'h2', 'h3', 'h4', 'h5', 'div'])
-                    if prev:
-                        text = prev.get_text(strip=True)
-                        if text and len(text) < 50 and 'Games' not in text:
-                            found_name = text
-                            break
-                    
-                    header = curr.find(['h1', 'h2', 'h3', 'h4', 'h5'])
-                    if header:
-                         text = header.get_text(strip=True)
-                         if text:
-                             found_name = text
-                             break
-                             
-                    curr = curr.parent
-                
-                if not found_name:
-                    continue
-                    
-                full_url = f"http://hockeycalgary.msa4.rampinteractive.com{href}"
-                slug = href.replace('/division/', '').replace('/standings', '')
-                
-                if slug in processed_slugs:
-                    continue
-                processed_slugs.add(slug)
-
-                # Construct League Name and Slug
-                # Ensure we don't duplicate "Seeding" in the name if it's already there
-                if "Seeding" in found_name:
-                    league_name = found_name
-                else:
-                    league_name = f"{found_name} - Seeding"
-                    
-                league_slug = f"{slug}-seeding"
-                league_stream = "RAMP"
-                league_type = "Seeding"
-                
-                print(f"  Processing {league_name}...")
-                
-                with db_lock:
-                    league = db.query(League).filter_by(
-                        slug=league_slug,
-                        stream=league_stream,
-                        type=league_type
-                    ).first()
-                    
-                    if not league:
-                        league = League(
-                            name=league_name,
-                            slug=league_slug,
-                            stream=league_stream,
-                            type=league_type
-                        )
-                        db.add(league)
-                        db.commit()
-                        db.refresh(league)
-                
-                # Fetch Data
-                data, source_url = fetch_ramp_data(full_url, game_type_id, season_id)
-                with db_lock:
-                    save_standings(db, data, season, league, community_map, source_url)
-                    
-    except Exception as e:
-        print(f"Error fetching U11 Seeding 2024-2025: {e}")
+        if profiler is not None:
+            with profiler.profile_thread():
+                result = func(*args)
+        else:
+            result = func(*args)
+        ok = True
+        return result
     finally:
-        db.close()
+        events.emit('task_finished', group=group, name=name, seconds=time.perf_counter() - start, ok=ok)
 
-def fetch_alberta_one_u11_2023(community_map):
-    print("Fetching U11 data for 2023-2024 (Alberta One)...")
-    base_url = "https://albertaonehockey.ca"
-    url = f"{base_url}/division/3300/"
-    soup = get_soup(url)
-    if not soup:
-        print("  Could not fetch Alberta One U11 division list.")
-        return
+def sync_data(reset=False, progress_callback=None, parse_workers=None, source='network', archive=True, event_sinks=None,
+              profile=False, cprofile=False):
+    """
+    Scrapes all sources into the database. Returns the run's counts of
+    changed and unchanged standings tables.
 
-    # Find all division links
-    links = soup.find_all('a', href=True)
-    
-    season_id = "10603" # 2023-2024
-    season_name = "2023-2024"
-    
-    # Game Types: Seeding (8361), League (8814)
-    game_types = [
-        {'id': '8361', 'name': 'Seeding', 'type': 'Seeding'},
-        {'id': '8814', 'name': 'Regular', 'type': 'Regular'}
-    ]
-    
-    db = SessionLocal()
+    parse_workers: size of the process pool used to parse pages
+    (default: one per CPU core, 0 parses inline in the fetching threads).
+    source: 'network' fetches live pages; 'archive' replays the whole
+    pipeline from the raw page archive with no network access.
+    archive: record every fetched body in the page archive (network mode).
+    event_sinks: sinks attached to the event stream for this run (default:
+    JSON-lines events and a Prometheus text file under data/metrics/).
+    progress_callback(pct, message) is driven by a ProgressSink.
+    profile: time every stage in PROFILED_STAGES and write a summary table and
+    a Chrome trace to data/profiles/<timestamp>/; cprofile also dumps merged
+    cProfile stats (sync.pstats) for all threads.
+    """
+    global profiler
+    if source not in ('network', 'archive'):
+        raise ValueError(f"Unknown sync source: {source}")
+    if profile or cprofile:
+        profiler = StageProfiler(cprofile=cprofile)
+    sinks = [JsonLinesSink(), PrometheusSink()] if event_sinks is None else list(event_sinks)
+    if progress_callback:
+        sinks.append(ProgressSink(progress_callback))
+    for sink in sinks:
+        events.add_sink(sink)
     try:
-        # Ensure Season exists
-        with db_lock:
-            season = db.query(Season).filter_by(name=season_name).first()
-            if not season:
-                season = Season(name=season_name)
-                db.add(season)
-                db.commit()
-                db.refresh(season)
-        
-        processed_slugs = set()
-
-        for link in links:
-            href = link['href']
-            if '/division/3300/' in href and 'standings' in href:
-                # Extract Division Name
-                parent = link.parent
-                found_name = None
-                
-                # Go up 5 levels max
-                curr = parent
-                for _ in range(5):
-                    if not curr: break
-                    
-                    prev = curr.find_previous_sibling(['h1', 'h2', 'h3', 'h4', 'h5', 'div'])
-                    if prev:
-                        text = prev.get_text(strip=True)
-                        if text and len(text) < 50 and 'Games' not in text:
-                            found_name = text
-                            break
-                    
-                    header = curr.find(['h1', 'h2', 'h3', 'h4', 'h5'])
-                    if header:
-                         text = header.get_text(strip=True)
-                         if text:
-                             found_name = text
-                             break
-                             
-                    curr = curr.parent
-                
-                if not found_name:
-                    continue
-                    
-                full_url = f"{base_url}{href}"
-                slug = href.replace('/division/', '').replace('/standings', '')
-                
-                if slug in processed_slugs:
-                    continue
-                processed_slugs.add(slug)
-
-                for gt in game_types:
-                    # Construct League Name and Slug
-                    league_name = found_name
-                    if gt['type'] != 'Regular' and gt['type'] not in league_name:
-                        league_name = f"{league_name} - {gt['type']}"
-                        
-                    league_slug = f"abone-{slug}-{gt['name'].lower()}"
-                    league_stream = "AlbertaOne"
-                    league_type = gt['type']
-                    
-                    # print(f"  Processing {league_name} ({gt['name']})...")
-                    
-                    with db_lock:
-                        league = db.query(League).filter_by(
-                            slug=league_slug,
-                            stream=league_stream,
-                            type=league_type
-                        ).first()
-                        
-                        if not league:
-                            league = League(
-                                name=league_name,
-                                slug=league_slug,
-                                stream=league_stream,
-                                type=league_type
-                            )
-                            db.add(league)
-                            db.commit()
-                            db.refresh(league)
-                    
-                    # Fetch Data
-                    # Note: fetch_ramp_data handles the API call. 
-                    # We need to ensure it finds the correct assoc_id for Alberta One.
-                    data, source_url = fetch_ramp_data(full_url, gt['id'], season_id)
-                    
-                    if data:
-                        print(f"    Found {len(data)} teams for {league_name}")
-                        with db_lock:
-                            save_standings(db, data, season, league, community_map, source_url)
-                    
-    except Exception as e:
-        print(f"Error fetching Alberta One U11 2023-2024: {e}")
+        if profiler is None:
+            return _run_sync(reset, parse_workers, source, archive)
+        with profiler.instrument(sys.modules[__name__], PROFILED_STAGES), profiler.profile_thread():
+            return _run_sync(reset, parse_workers, source, archive)
     finally:
-        db.close()
+        for sink in sinks:
+            events.remove_sink(sink)
+            sink.close()
+        if profiler is not None:
+            print(profiler.format_summary())
+            print(f"Profile written to {profiler.write()}")
+            profiler = None
 
-def sync_data(reset=False, progress_callback=None):
-    if progress_callback:
-        progress_callback(0, "Starting sync...")
+def _run_sync(reset, parse_workers, source, archive):
+    global parse_executor, page_archive, fetch_source
+    with stats_lock:
+        sync_stats.update(changed=0, unchanged=0)
+    query_stats.reset()
+    events.emit('phase', pct=0, message="Starting sync...")
 
     if reset:
         print("Resetting database... Deleting all existing data.")
-        if progress_callback:
-            progress_callback(0, "Resetting database...")
+        events.emit('phase', pct=0, message="Resetting database...")
         try:
-            Base.metadata.drop_all(bind=engine)
+            # Keep the job table and change stamp so running jobs and dashboards survive a reset
+            tables = [t for t in Base.metadata.sorted_tables if t.name not in PRESERVED_TABLES]
+            Base.metadata.drop_all(bind=engine, tables=tables)
             print("Database reset complete.")
         except Exception as e:
             print(f"Error resetting database: {e}")
+        # Re-discover seasons and game types on a full reset
+        metadata_cache.clear()
 
     init_db()
+
+    fetch_source = source
+    page_archive = PageArchive() if (archive or source == 'archive') else None
+    if source == 'archive':
+        print(f"Replaying from page archive ({len(page_archive)} archived requests)...")
+        # Re-derive metadata from the archived pages rather than the persisted cache
+        metadata_cache.clear(remove_file=False)
     
     community_map = load_community_map()
     
+    # HTTP and DB writes stay in this process's threads; parsing goes to worker processes
+    if parse_workers is None:
+        parse_workers = os.cpu_count() or 1
+    if parse_workers > 0:
+        parse_executor = concurrent.futures.ProcessPoolExecutor(max_workers=parse_workers)
+    try:
+        _sync_sources(community_map)
+    finally:
+        if parse_executor is not None:
+            parse_executor.shutdown()
+            parse_executor = None
+        fetch_source = 'network'
+        page_archive = None
+
+    if source == 'network':
+        try:
+            metadata_cache.save()
+        except OSError as e:
+            print(f"Error saving metadata cache: {e}")
+
+    with stats_lock:
+        stats = dict(sync_stats)
+    print(f"Standings tables: {stats['changed']} changed, {stats['unchanged']} unchanged.")
+    if stats['changed'] or reset:
+        bump_change_stamp()
+    print(query_stats.format_summary())
+    try:
+        query_stats.write_summary()
+    except OSError as e:
+        print(f"Error writing SQL summary: {e}")
+    print("Sync complete.")
+    events.emit('phase', pct=100, message="Sync complete.")
+    return stats
+
+def _sync_sources(community_map):
     # 1. Fetch Legacy/Historical Leagues (from hockeycalgary.ca)
     print("Fetching legacy/historical leagues...")
-    if progress_callback:
-        progress_callback(5, "Fetching legacy/historical leagues...")
+    events.emit('phase', pct=5, message="Fetching legacy/historical leagues...")
     legacy_leagues = get_leagues() # Current season
     
     # Add historical seasons
@@ -1272,15 +1452,18 @@ def sync_data(reset=False, progress_callback=None):
     
     # 2. Fetch RAMP Leagues (U11)
     print("Fetching RAMP leagues (U11)...")
-    if progress_callback:
-        progress_callback(10, "Fetching RAMP leagues...")
+    events.emit('phase', pct=10, message="Fetching RAMP leagues...")
     ramp_leagues = get_ramp_leagues()
+    
+    # Fixed-season U11 sources (2024-2025 Seeding, Alberta One 2023-2024) share the same runner
+    for source in RAMP_SOURCES:
+        print(f"Fetching RAMP divisions for {source['name']}...")
+        ramp_leagues.extend(get_ramp_source_leagues(source))
     print(f"Found {len(ramp_leagues)} RAMP leagues.")
     
     # 3. Fetch TeamLinkt Leagues (U13+)
     print("Fetching TeamLinkt leagues (U13+)...")
-    if progress_callback:
-        progress_callback(15, "Fetching TeamLinkt leagues...")
+    events.emit('phase', pct=15, message="Fetching TeamLinkt leagues...")
     teamlinkt_leagues = get_teamlinkt_leagues()
     print(f"Found {len(teamlinkt_leagues)} TeamLinkt leagues.")
     
@@ -1321,59 +1504,155 @@ def sync_data(reset=False, progress_callback=None):
     
     # Use ThreadPoolExecutor for parallel processing
     # Adjust max_workers based on your system capabilities and network limits
-    if progress_callback:
-        progress_callback(20, f"Processing {total_leagues} leagues...")
+    events.emit('phase', pct=20, message=f"Processing {total_leagues} leagues...")
+    events.emit('tasks_planned', group='leagues', count=total_leagues)
 
-    completed_leagues = 0
     with concurrent.futures.ThreadPoolExecutor(max_workers=10) as executor:
         futures = []
         for league_info in all_leagues:
             futures.append(
-                executor.submit(process_league, league_info, community_map, processed_leagues, processed_lock)
+                executor.submit(run_task, 'leagues', league_info['name'],
+                                process_league, league_info, community_map, processed_leagues, processed_lock)
             )
             
         for future in concurrent.futures.as_completed(futures):
             result = future.result()
             if result:
                 known_seasons.update(result)
-            
-            completed_leagues += 1
-            if progress_callback:
-                # Map 20% -> 90%
-                pct = 20 + int((completed_leagues / total_leagues) * 70)
-                progress_callback(pct, f"Processed {completed_leagues}/{total_leagues} leagues...")
 
     # Process tournaments (Legacy only for now)
     print("Fetching tournaments...")
-    if progress_callback:
-        progress_callback(90, "Fetching tournaments...")
+    events.emit('phase', pct=85, message="Fetching tournaments...")
     
+    tournaments = []
+    for season_slug in known_seasons:
+        print(f"Checking tournaments for {season_slug}...")
+        tournaments.extend((t_info, season_slug) for t_info in get_tournaments(season_slug))
+    events.emit('tasks_planned', group='tournaments', count=len(tournaments))
+
     # Parallelize tournaments too
     with concurrent.futures.ThreadPoolExecutor(max_workers=10) as executor:
-        futures = []
-        for season_slug in known_seasons:
-            print(f"Checking tournaments for {season_slug}...")
-            tournaments = get_tournaments(season_slug)
-            for t_info in tournaments:
-                futures.append(
-                    executor.submit(process_tournament, t_info, season_slug, community_map)
-                )
-        
+        futures = [
+            executor.submit(run_task, 'tournaments', t_info['name'], process_tournament, t_info, season_slug, community_map)
+            for t_info, season_slug in tournaments
+        ]
         concurrent.futures.wait(futures)
-    
-    # Fetch specific U11 Seeding data for 2024-2025
-    if progress_callback:
-        progress_callback(95, "Fetching U11 Seeding data...")
-    fetch_u11_seeding_2024_2025(community_map)
 
-    # Fetch U11 data for 2023-2024 from Alberta One
-    if progress_callback:
-        progress_callback(98, "Fetching U11 2023-2024 data (Alberta One)...")
-    fetch_alberta_one_u11_2023(community_map)
+def resolve_legacy_targets(league_info, season_name):
+    try:
+        return legacy_standings_targets(league_info, {season_name})
+    except Exception as e:
+        print(f"Error resolving {league_info['name']}: {e}")
+        return None # process_league resolves it on each pass instead
 
-    print("Sync complete.")
-    if progress_callback:
-        progress_callback(100, "Sync complete.")
+def discover_current_leagues(season_name=CURRENT_SEASON):
+    """
+    League list for polling: current-season legacy, RAMP and TeamLinkt
+    leagues. Legacy leagues carry their resolved `season_name` standings
+    pages ('legacy_targets'), so polls skip the league and season pages.
+    """
+    legacy_leagues = get_leagues()
+    with concurrent.futures.ThreadPoolExecutor(max_workers=10) as executor:
+        targets = executor.map(lambda league_info: resolve_legacy_targets(league_info, season_name), legacy_leagues)
+        for league_info, league_targets in zip(legacy_leagues, targets):
+            league_info['legacy_targets'] = league_targets
+    leagues = legacy_leagues + get_ramp_leagues() + get_teamlinkt_leagues()
+    print(f"Discovered {len(leagues)} leagues to poll.")
+    return leagues
+
+def poll_current_season(leagues, community_map, season_name=CURRENT_SEASON):
+    """
+    One polling pass: re-fetches only `season_name` standings for `leagues`.
+    Bumps the DB change stamp if any table changed. Returns the pass's stats.
+    """
+    with stats_lock:
+        sync_stats.update(changed=0, unchanged=0)
+
+    processed_leagues = set()
+    processed_lock = threading.Lock()
+    with concurrent.futures.ThreadPoolExecutor(max_workers=10) as executor:
+        futures = [
+            executor.submit(run_task, 'poll', league_info['name'],
+                            process_league, league_info, community_map, processed_leagues, processed_lock, {season_name})
+            for league_info in leagues
+        ]
+        concurrent.futures.wait(futures)
+
+    with stats_lock:
+        stats = dict(sync_stats)
+    if stats['changed']:
+        bump_change_stamp()
+    return stats
+
+def run_daemon(interval=300, jitter=0.2, discovery_interval=6 * 60 * 60, season_name=CURRENT_SEASON, archive=False):
+    """
+    Polls current-season standings forever, sleeping `interval` seconds
+    (+/- `jitter` fraction, randomized) between passes. League discovery
+    (including each legacy league's standings pages) is refreshed every
+    `discovery_interval` seconds; between discoveries each pass only hits
+    the standings endpoints, using conditional requests and body/table
+    hashes to skip unchanged data. Fetched pages are archived only with
+    `archive`.
+    """
+    global page_archive, use_conditional_requests
+    init_db()
+    page_archive = PageArchive() if archive else None
+    use_conditional_requests = True
+
+    leagues = []
+    discovered_at = 0
+    print(f"Polling {season_name} standings every ~{interval}s (Ctrl+C to stop)...")
+    try:
+        while True:
+            if not leagues or time.time() - discovered_at > discovery_interval:
+                leagues = discover_current_leagues(season_name)
+                discovered_at = time.time()
+                try:
+                    metadata_cache.save()
+                except OSError as e:
+                    print(f"Error saving metadata cache: {e}")
+
+            started = time.time()
+            metrics = PrometheusSink(os.path.join(METRICS_DIR, "poll_metrics.prom"))
+            events.add_sink(metrics)
+            try:
+                stats = poll_current_season(leagues, load_community_map(), season_name)
+            finally:
+                events.remove_sink(metrics)
+                metrics.close()
+            print(f"Poll finished in {time.time() - started:.1f}s: {stats['changed']} changed, {stats['unchanged']} unchanged.")
+
+            time.sleep(max(0, interval * random.uniform(1 - jitter, 1 + jitter)))
+    except KeyboardInterrupt:
+        print("Polling stopped.")
+    finally:
+        use_conditional_requests = False
+        page_archive = None
 
 if __name__ == "__main__":
-    sync_data()
\ No newline at end of file
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Scrape Hockey Calgary standings into the database.")
+    parser.add_argument('--reset', action='store_true', help="Drop all existing data before syncing")
+    parser.add_argument('--from-archive', action='store_true', help="Replay from the raw page archive (no network)")
+    parser.add_argument('--no-archive', action='store_true', help="Do not record fetched pages in the archive")
+    parser.add_argument('--archive', action='store_true', help="Daemon: record fetched pages in the archive (off by default)")
+    parser.add_argument('--parse-workers', type=int, default=None, help="Parse processes (default: CPU count, 0 = inline)")
+    parser.add_argument('--profile', action='store_true', help="Write per-stage timings and a Chrome trace to data/profiles/")
+    parser.add_argument('--cprofile', action='store_true', help="Like --profile, plus a merged cProfile dump (sync.pstats)")
+    parser.add_argument('--daemon', action='store_true', help="Poll current-season standings instead of a full sync")
+    parser.add_argument('--interval', type=float, default=300, help="Daemon: seconds between polls (default: 300)")
+    parser.add_argument('--jitter', type=float, default=0.2, help="Daemon: random +/- fraction of the interval (default: 0.2)")
+    args = parser.parse_args()
+
+    if args.daemon:
+        run_daemon(interval=args.interval, jitter=args.jitter, archive=args.archive)
+    else:
+        sync_data(
+            reset=args.reset,
+            parse_workers=args.parse_workers,
+            source='archive' if args.from_archive else 'network',
+            archive=not args.no_archive,
+            profile=args.profile,
+            cprofile=args.cprofile
+        )
\ No newline at end of file
@@ -0,0 +1,170 @@
+import sys
+import os
+import time
+import types
+import shutil
+import argparse
+import tempfile
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../')))
+
+# Usage: python scripts/benchmarks/bench_dashboard.py [--rows 20000] [--db sqlite:///synthetic.db] [--budget-factor 1.0]
+# Headless render benchmark: drives app.py with Streamlit's AppTest against a
+# synthetic fixture database (generate_synthetic_data.py, or --db), scripts
+# filter changes on each page and reports the wall time of every rerun and
+# of each page section (the time between consecutive st.title/st.header/
+# st.subheader calls). Exits 1 when a page's slowest warm rerun exceeds its
+# budget. The first render includes the cached data load and is reported
+# separately. The sync job launcher and scraper are replaced with stubs that
+# raise, so the sidebar sync button can never start a real sync.
+
+APP_FILE = os.path.abspath(os.path.join(os.path.dirname(__file__), '../../app.py'))
+DEFAULT_ROWS = 20000
+# Slowest warm rerun per page, in seconds, for the default fixture size
+PAGE_BUDGETS = {
+    'Analytics': 1.5,
+    'Tier 1 Dilution Analysis': 2.0,
+    'Experiments': 0.75,
+}
+
+def widget(elements, label):
+    for element in elements:
+        if element.label == label:
+            return element
+    raise LookupError(f"No widget labelled {label!r}")
+
+def pick(options, count, skip=0):
+    return list(options)[skip:skip + count]
+
+# Scripted filter changes per page: (step name, action on the AppTest)
+PAGE_STEPS = {
+    'Analytics': [
+        ('season', lambda at: widget(at.sidebar.multiselect, "Select Seasons").set_value(pick(widget(at.sidebar.multiselect, "Select Seasons").options, 3))),
+        ('age', lambda at: widget(at.sidebar.multiselect, "Age Category").set_value(['U13', 'U15'])),
+        ('community', lambda at: widget(at.sidebar.radio, "Hockey Calgary Division").set_value("North")),
+        ('metric', lambda at: widget(at.selectbox, "Select Metric").set_value("Goal Diff")),
+    ],
+    'Tier 1 Dilution Analysis': [
+        ('season', lambda at: widget(at.sidebar.multiselect, "Select Seasons").set_value(pick(widget(at.sidebar.multiselect, "Select Seasons").options, 5))),
+        ('age', lambda at: widget(at.sidebar.multiselect, "Age Category").set_value(['U11', 'U13', 'U15'])),
+        ('community', lambda at: widget(at.sidebar.radio, "Hockey Calgary Division").set_value("South")),
+        ('metric', lambda at: widget(at.selectbox, "Select Performance Metric").set_value("Win %")),
+    ],
+    'Experiments': [
+        ('season', lambda at: widget(at.sidebar.selectbox, "Select Season").set_value(pick(widget(at.sidebar.selectbox, "Select Season").options, 1, skip=1)[0])),
+        ('age', lambda at: widget(at.sidebar.selectbox, "Select Age Category").set_value("U13")),
+        ('community', lambda at: widget(at.sidebar.multiselect, "Select Communities").set_value(widget(at.sidebar.multiselect, "Select Communities").options)),
+        ('type', lambda at: widget(at.sidebar.selectbox, "Season Type").set_value("Regular")),
+    ],
+}
+
+class SectionTimer:
+    """Marks every st.title/st.header/st.subheader call of a script run; sections span consecutive marks."""
+
+    def __init__(self, st):
+        self.marks = []
+        self.originals = {}
+        for name in ('title', 'header', 'subheader'):
+            original = getattr(st, name)
+            self.originals[name] = original
+            setattr(st, name, self._wrap(original))
+        self.st = st
+
+    def _wrap(self, func):
+        def marked(body, *args, **kwargs):
+            self.marks.append((str(body).encode('ascii', 'ignore').decode().strip(), time.perf_counter()))
+            return func(body, *args, **kwargs)
+        return marked
+
+    def start(self):
+        self.marks = [('(setup and sidebar)', time.perf_counter())]
+
+    def sections(self, end):
+        bounds = self.marks + [(None, end)]
+        return [(name, bounds[i + 1][1] - start) for i, (name, start) in enumerate(self.marks)]
+
+    def restore(self):
+        for name, original in self.originals.items():
+            setattr(self.st, name, original)
+
+def stub_sync():
+    """Replaces the sync entry points the dashboard can reach with stubs that raise."""
+    def refuse(*args, **kwargs):
+        raise RuntimeError("The render benchmark must not start a sync")
+
+    import jobs
+    jobs.start_sync_job = refuse
+    jobs.cancel_job = refuse
+    scraper = types.ModuleType('scraper')
+    scraper.sync_data = refuse
+    sys.modules['scraper'] = scraper
+
+def timed_run(at, timer):
+    timer.start()
+    start = time.perf_counter()
+    at.run()
+    end = time.perf_counter()
+    if at.exception:
+        raise RuntimeError(f"app.py raised: {at.exception[0].message}")
+    return end - start, timer.sections(end)
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless AppTest render benchmark for the dashboard pages.")
+    parser.add_argument('--rows', type=int, default=DEFAULT_ROWS, help="Synthetic fixture size (default: 20000)")
+    parser.add_argument('--db', default=None, help="Use an existing database instead of generating one")
+    parser.add_argument('--budget-factor', type=float, default=1.0, help="Multiply the page budgets (e.g. for larger fixtures)")
+    parser.add_argument('--sections', action='store_true', help="Print per-section times of every rerun")
+    args = parser.parse_args()
+
+    work_dir = tempfile.mkdtemp(prefix='hc-dashboard-bench-')
+    db_url = args.db or f"sqlite:///{os.path.join(work_dir, 'fixture.db')}"
+    os.environ['HC_DB_URL'] = db_url
+    os.chdir(work_dir) # Slow-query log and metrics land here
+
+    try:
+        if not args.db:
+            from sqlalchemy import create_engine
+            from generate_synthetic_data import generate
+            fixture_engine = create_engine(db_url)
+            counts = generate(fixture_engine, args.rows)
+            fixture_engine.dispose()
+            print(f"Fixture: {counts['standings']} standings, {counts['communities']} communities, {counts['seasons']} seasons")
+
+        import streamlit as st
+        from streamlit.testing.v1 import AppTest
+        stub_sync()
+        timer = SectionTimer(st)
+
+        at = AppTest.from_file(APP_FILE, default_timeout=600)
+        cold, _ = timed_run(at, timer)
+        print(f"Cold start (imports, init_db, data load): {cold:.2f}s\n")
+
+        failures = []
+        print(f"{'page':<28}{'step':<12}{'seconds':>9}")
+        for page, steps in PAGE_STEPS.items():
+            widget(at.sidebar.radio, "Navigation").set_value(page)
+            reruns = [('open', *timed_run(at, timer))]
+            for step, action in steps:
+                action(at)
+                reruns.append((step, *timed_run(at, timer)))
+            for step, seconds, sections in reruns:
+                print(f"{page:<28}{step:<12}{seconds:>9.3f}")
+                if args.sections:
+                    for name, section_seconds in sections:
+                        print(f"{'':<32}{section_seconds:>9.3f}  {name}")
+            slowest = max(seconds for _, seconds, _ in reruns)
+            budget = PAGE_BUDGETS[page] * args.budget_factor
+            verdict = 'ok' if slowest <= budget else 'OVER BUDGET'
+            print(f"{page:<28}{'slowest':<12}{slowest:>9.3f}  budget {budget:.2f}s {verdict}\n")
+            if slowest > budget:
+                failures.append(page)
+        timer.restore()
+    finally:
+        os.chdir(os.path.dirname(work_dir))
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    if failures:
+        print(f"{len(failures)} page(s) over budget: {', '.join(failures)}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+import sys
+import os
+import time
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../')))
+
+from bs4 import BeautifulSoup
+from utilities.parsing import index_division_links
+
+# Usage: python scripts/benchmarks/bench_division_index.py [saved_division_page.html]
+# Without an argument the fixtures/ramp_division_list.html page (division
+# names in short header divs, headings, skipped "Games" and long divs) and a
+# synthetic RAMP-style division page are used. Exits 1 if any link gets a
+# different division name than the previous per-link ancestor search.
+
+FIXTURE_PAGE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', 'ramp_division_list.html')
+
+def synthetic_division_page(divisions=400, games_per_division=20):
+    parts = ["<html><body><div id='content'>"]
+    for i in range(divisions):
+        games = "".join(
+            f"<tr><td>Game {g}</td><td>Team {g}</td><td>Team {g + 1}</td></tr>"
+            for g in range(games_per_division)
+        )
+        parts.append(
+            f"<div class='division'><div class='division-header'><h3>U11 Tier {i % 6 + 1} Division {i}</h3></div>"
+            f"<div class='division-body'><div class='links'><ul>"
+            f"<li><a href='/division/3300/{30000 + i}/schedule'>Schedule</a></li>"
+            f"<li><a href='/division/3300/{30000 + i}/standings'>Standings</a></li>"
+            f"</ul></div><table>{games}</table></div></div>"
+        )
+    parts.append("</div></body></html>")
+    return "".join(parts)
+
+def ancestor_search(soup):
+    """The previous per-link approach: climb up to 5 ancestors per link."""
+    results = []
+    for a in soup.find_all('a', string=lambda t: t and 'Standings' in t):
+        found_name = None
+        curr = a.parent
+        for _ in range(5):
+            if not curr: break
+            prev = curr.find_previous_sibling(['h1', 'h2', 'h3', 'h4', 'h5', 'div'])
+            if prev:
+                text = prev.get_text(strip=True)
+                if text and len(text) < 50 and 'Games' not in text:
+                    found_name = text
+                    break
+            header = curr.find(['h1', 'h2', 'h3', 'h4', 'h5'])
+            if header:
+                text = header.get_text(strip=True)
+                if text:
+                    found_name = text
+                    break
+            curr = curr.parent
+        results.append((a['href'], found_name))
+    return results
+
+def single_pass(soup):
+    return [(a['href'], name) for a, name in index_division_links(soup, lambda a: 'Standings' in a.get_text())]
+
+def bench(label, func, soup, repeat=5):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(soup)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    print(f"{label:<20} {best * 1000:10.2f} ms  ({len(result)} links)")
+    return result
+
+def compare(label, html):
+    print(f"Page: {label} ({len(html)} bytes)")
+    soup = BeautifulSoup(html, 'html.parser')
+    old = bench("ancestor search", ancestor_search, soup)
+    new = bench("index_division_links", single_pass, soup)
+
+    mismatches = [(o, n) for o, n in zip(old, new) if o != n]
+    if len(old) != len(new):
+        mismatches.append((('(link count)', len(old)), ('(link count)', len(new))))
+    print(f"Mismatched names: {len(mismatches)}\n")
+    for o, n in mismatches[:10]:
+        print(f"  {o[0]}: {o[1]!r} -> {n[1]!r}")
+    return len(mismatches)
+
+def main():
+    if len(sys.argv) > 1:
+        with open(sys.argv[1], 'rb') as f:
+            pages = [(sys.argv[1], f.read())]
+    else:
+        with open(FIXTURE_PAGE, 'rb') as f:
+            pages = [(os.path.basename(FIXTURE_PAGE), f.read()), ('synthetic', synthetic_division_page())]
+
+    mismatches = sum(compare(label, html) for label, html in pages)
+    if mismatches:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
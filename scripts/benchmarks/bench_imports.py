@@ -0,0 +1,69 @@
+import sys
+import os
+import re
+import shutil
+import argparse
+import tempfile
+import subprocess
+
+# Usage: python scripts/benchmarks/bench_imports.py [--top 20] [--budget-ms 2000]
+# Import-time profile of the dashboard's cold start: runs app.py once in
+# Streamlit's bare mode under `python -X importtime` (against an empty
+# throwaway database), prints the slowest top-level imports and total import
+# time, and exits 1 if a module that should load lazily (scraping stack,
+# matplotlib) was imported at startup or the total exceeds --budget-ms.
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '../../'))
+APP_FILE = os.path.join(ROOT_DIR, 'app.py')
+# Only the sync worker (scraper.py) and the completeness heatmap styling need these
+LAZY_MODULES = ['scraper', 'requests', 'bs4', 'urllib3', 'lxml', 'matplotlib']
+IMPORT_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+
+def profile_startup(work_dir):
+    """Returns [(module, self_us, cumulative_us, depth)] for one bare-mode run of app.py."""
+    env = dict(os.environ, HC_DB_URL=f"sqlite:///{os.path.join(work_dir, 'empty.db')}", PYTHONPATH=ROOT_DIR)
+    runner = f"import runpy; runpy.run_path({APP_FILE!r}, run_name='__main__')"
+    proc = subprocess.run([sys.executable, '-X', 'importtime', '-c', runner],
+                          cwd=work_dir, env=env, capture_output=True, text=True)
+    if proc.returncode != 0:
+        raise RuntimeError(f"app.py failed in bare mode:\n{proc.stderr[-2000:]}")
+    imports = []
+    for line in proc.stderr.splitlines():
+        match = IMPORT_LINE.match(line)
+        if match:
+            imports.append((match.group(4), int(match.group(1)), int(match.group(2)), len(match.group(3)) // 2))
+    return imports
+
+def main():
+    parser = argparse.ArgumentParser(description="Import-time profile of the dashboard's cold start.")
+    parser.add_argument('--top', type=int, default=20, help="Slowest top-level imports to list (default: 20)")
+    parser.add_argument('--budget-ms', type=float, default=None, help="Fail if total import time exceeds this")
+    args = parser.parse_args()
+
+    work_dir = tempfile.mkdtemp(prefix='hc-import-bench-')
+    try:
+        imports = profile_startup(work_dir)
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    top_level = sorted((i for i in imports if i[3] == 0), key=lambda i: i[2], reverse=True)
+    total_ms = sum(i[2] for i in top_level) / 1000
+    print(f"{'module':<50}{'cumulative ms':>15}")
+    for module, _, cumulative, _ in top_level[:args.top]:
+        print(f"{module:<50}{cumulative / 1000:>15.1f}")
+    print(f"{'total':<50}{total_ms:>15.1f}")
+
+    loaded = {i[0] for i in imports}
+    eager = [name for name in LAZY_MODULES if name in loaded]
+    failed = False
+    if eager:
+        print(f"\nImported at startup but expected to load lazily: {', '.join(eager)}")
+        failed = True
+    if args.budget_ms is not None and total_ms > args.budget_ms:
+        print(f"\nTotal import time {total_ms:.0f} ms exceeds the {args.budget_ms:.0f} ms budget")
+        failed = True
+    if failed:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
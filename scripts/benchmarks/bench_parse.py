@@ -0,0 +1,84 @@
+import sys
+import os
+import glob
+import time
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../')))
+
+from utilities.parsing import make_soup
+from scraper import parse_standings
+
+# Usage: python scripts/benchmarks/bench_parse.py [page.html ...]
+# Measures parse throughput of each available BeautifulSoup backend, with and
+# without partial parsing, over saved standings pages. Pages default to
+# data/dumps/*.html and scripts/benchmarks/fixtures/*.html; a synthetic
+# standings page is used when none are found.
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '../../'))
+PAGE_GLOBS = [
+    os.path.join(ROOT, 'data', 'dumps', '*.html'),
+    os.path.join(ROOT, 'scripts', 'benchmarks', 'fixtures', '*.html'),
+]
+BACKENDS = ['html.parser', 'lxml', 'html5lib']
+
+def synthetic_standings_page(teams=16, nav_links=300):
+    nav = "".join(f"<li><a href='/standings/index/stream/community-council/league/u13-tier-{i}'>U13 Tier {i}</a></li>" for i in range(nav_links))
+    options = "".join(f"<option value='/standings/index/season/{y}-{y + 1}'>{y}/{y + 1}</option>" for y in range(2015, 2026))
+    rows = "".join(
+        f"<tr><td>{i + 1}</td><td>Bow Valley {i + 1}</td><td>20</td><td>{i}</td><td>{20 - i}</td><td>0</td><td>{2 * i}</td><td>{40 + i}</td><td>{60 - i}</td><td>{2 * i - 20}</td></tr>"
+        for i in range(teams)
+    )
+    return (
+        "<html><head><script>var x = 1;</script><link rel='stylesheet' href='/a.css'></head><body>"
+        f"<nav><ul>{nav}</ul></nav><select name='season'>{options}</select>"
+        "<table class='table'><tr><th>#</th><th>Team</th><th>GP</th><th>W</th><th>L</th><th>T</th><th>PTS</th><th>GF</th><th>GA</th><th>Diff</th></tr>"
+        f"{rows}</table><footer>{'<p>footer text</p>' * 200}</footer></body></html>"
+    ).encode('utf-8')
+
+def available_backends():
+    backends = []
+    for backend in BACKENDS:
+        try:
+            make_soup(b"<html></html>", parser=backend)
+            backends.append(backend)
+        except Exception:
+            print(f"Skipping {backend} (not installed)")
+    return backends
+
+def load_pages(paths):
+    if not paths:
+        paths = [p for pattern in PAGE_GLOBS for p in sorted(glob.glob(pattern))]
+    pages = []
+    for path in paths:
+        with open(path, 'rb') as f:
+            pages.append((os.path.basename(path), f.read()))
+    if not pages:
+        pages.append(('synthetic', synthetic_standings_page()))
+    return pages
+
+def bench(pages, backend, page_type, repeat=5):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        results = [parse_standings(make_soup(content, page_type, parser=backend)) for _, content in pages]
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, results
+
+def main():
+    pages = load_pages(sys.argv[1:])
+    total_bytes = sum(len(content) for _, content in pages)
+    print(f"{len(pages)} page(s), {total_bytes / 1024:.0f} KiB")
+
+    reference = None
+    print(f"{'backend':<14}{'mode':<12}{'pages/s':>10}{'MiB/s':>10}")
+    for backend in available_backends():
+        for page_type in (None, 'standings'):
+            elapsed, results = bench(pages, backend, page_type)
+            if reference is None:
+                reference = results
+            mode = 'partial' if page_type else 'full'
+            note = '' if results == reference else '  (results differ from html.parser/full)'
+            print(f"{backend:<14}{mode:<12}{len(pages) / elapsed:>10.1f}{total_bytes / elapsed / 2**20:>10.2f}{note}")
+
+if __name__ == "__main__":
+    main()
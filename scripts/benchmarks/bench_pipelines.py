@@ -0,0 +1,113 @@
+import sys
+import os
+import time
+import shutil
+import argparse
+import tempfile
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../')))
+
+from sqlalchemy import create_engine
+from generate_synthetic_data import generate
+from utilities.analytics import (
+    load_standings, default_selection, filter_standings, completeness_matrix, community_trend,
+    community_ranking, community_heatmap, dilution_frame, infer_thresholds, categorize_thresholds,
+    cliff_frame, aggressiveness_trend, tier_distribution_frame, tier_distribution_curves, build_filter_index,
+    index_values, index_options
+)
+
+# Usage: python scripts/benchmarks/bench_pipelines.py [--scales 10000 100000 1000000] [--repeat 1]
+# Times the data pipeline behind each dashboard page (utilities/analytics.py,
+# no Streamlit) over synthetic databases from generate_synthetic_data.py, one
+# throwaway SQLite database per scale. Selections are the pages' defaults,
+# with every community selected, i.e. what a first page load computes,
+# filtering through the filter index as the dashboard does.
+
+DEFAULT_SCALES = [10000, 100000, 1000000]
+
+def analytics_page(df, index):
+    sel = default_selection(df)
+    communities = sorted(index_values(index, 'Community'))
+    index_options(index, 'League', {'Season': sel['seasons'], 'Type': sel['types'], 'Age Category': sel['ages']})
+    index_options(index, 'Team', {'Community': communities})
+    filtered = filter_standings(df, sel['seasons'], sel['types'], sel['ages'], communities, index=index)
+    completeness_matrix(df)
+    community_trend(filtered, 'PTS')
+    community_ranking(filtered, 'PTS')
+    community_heatmap(filtered, 'PTS')
+
+def dilution_page(df, index):
+    sel = default_selection(df)
+    communities = sorted(index_values(index, 'Community'))
+    merged = dilution_frame(df, sel['seasons'], sel['types'], sel['ages'], communities, 'Points %', index=index)
+    thresholds, _, _ = infer_thresholds(df, sel['types'], sel['ages'], index=index)
+    if thresholds and not merged.empty:
+        merged = categorize_thresholds(merged, thresholds)
+        cliff_frame(merged)
+        aggressiveness_trend(merged)
+
+def experiments_page(df, index):
+    season = sorted(index_values(index, 'Season'), reverse=True)[0]
+    communities = index_options(index, 'Community', {'Season': [season], 'Age Category': ['U11'], 'Type': ['Seeding']})
+    exp_df = tier_distribution_frame(df, season, 'U11', 'Seeding', communities, index=index)
+    if not exp_df.empty:
+        tier_distribution_curves(exp_df)
+
+PAGES = [
+    ('Analytics', analytics_page),
+    ('Tier 1 Dilution Analysis', dilution_page),
+    ('Experiments', experiments_page),
+]
+
+def best_of(func, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+def bench_scale(rows, seasons, repeat, work_dir):
+    path = os.path.join(work_dir, f"synthetic_{rows}.db")
+    engine = create_engine(f"sqlite:///{path}")
+    try:
+        start = time.perf_counter()
+        counts = generate(engine, rows, seasons)
+        timings = {'generate': time.perf_counter() - start}
+        timings['load_standings'], df = best_of(lambda: load_standings(engine), repeat)
+        timings['build_filter_index'], index = best_of(lambda: build_filter_index(df), repeat)
+        for name, page in PAGES:
+            timings[name], _ = best_of(lambda: page(df, index), repeat)
+        return counts, timings
+    finally:
+        engine.dispose()
+
+def main():
+    parser = argparse.ArgumentParser(description="Time the dashboard page pipelines over synthetic data.")
+    parser.add_argument('--scales', type=int, nargs='+', default=DEFAULT_SCALES, help="Standings row counts (default: 10000 100000 1000000)")
+    parser.add_argument('--seasons', type=int, default=24)
+    parser.add_argument('--repeat', type=int, default=1, help="Best of N runs per stage (default: 1)")
+    parser.add_argument('--keep', action='store_true', help="Keep the generated databases")
+    args = parser.parse_args()
+
+    work_dir = tempfile.mkdtemp(prefix='hc-pipeline-bench-')
+    stages = ['generate', 'load_standings', 'build_filter_index'] + [name for name, _ in PAGES]
+    results = {}
+    try:
+        for rows in args.scales:
+            counts, timings = bench_scale(rows, args.seasons, args.repeat, work_dir)
+            results[rows] = timings
+            print(f"{rows} rows: {counts['standings']} standings, {counts['communities']} communities, "
+                  f"{counts['teams']} teams, {counts['seasons']} seasons")
+    finally:
+        if args.keep:
+            print(f"Databases kept in {work_dir}")
+        else:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+    print(f"\n{'stage (seconds)':<28}" + "".join(f"{rows:>12}" for rows in results))
+    for stage in stages:
+        print(f"{stage:<28}" + "".join(f"{results[rows][stage]:>12.3f}" for rows in results))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+import sys
+import os
+import time
+import shutil
+import argparse
+import tempfile
+import io
+import contextlib
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../')))
+
+from fake_server import add_site_arguments, site_from_args, start_servers, stop_servers
+
+# Usage: python scripts/benchmarks/bench_sync.py [--leagues 20] [--seasons 5] [--latency 50] [--runs 2]
+# End-to-end sync throughput against the local fake sites (fake_server.py),
+# with no network access. Each run is a full sync_data into a throwaway
+# SQLite database in a temporary working directory; later runs show the
+# unchanged-page fast path.
+
+class CountingSink:
+    """Event sink tallying requests, bytes, finished tasks and rows written."""
+
+    def __init__(self):
+        self.requests = 0
+        self.bytes = 0
+        self.rows = 0
+        self.tasks = 0
+
+    def handle(self, event):
+        if event['type'] == 'http':
+            self.requests += 1
+            self.bytes += event['bytes']
+        elif event['type'] == 'standings_saved':
+            self.rows += event['rows']
+        elif event['type'] == 'task_finished':
+            self.tasks += 1
+
+    def close(self):
+        pass
+
+def main():
+    parser = argparse.ArgumentParser(description="End-to-end sync benchmark against the local fake sites.")
+    add_site_arguments(parser)
+    parser.add_argument('--runs', type=int, default=2, help="Consecutive syncs (default: 2)")
+    parser.add_argument('--parse-workers', type=int, default=None, help="Passed to sync_data (default: CPU count)")
+    parser.add_argument('--keep', action='store_true', help="Keep the temporary working directory")
+    args = parser.parse_args()
+
+    fake = site_from_args(args)
+    servers, env = start_servers(fake, port=0)
+    work_dir = tempfile.mkdtemp(prefix='hc-sync-bench-')
+    os.environ.update(env)
+    os.environ['HC_DB_URL'] = f"sqlite:///{os.path.join(work_dir, 'bench.db')}"
+    os.chdir(work_dir) # Cache, archive and metrics files land here
+
+    import scraper # After the environment points it at the fake sites
+
+    print(f"{args.leagues} leagues x {args.seasons} seasons per source, {args.latency:.0f} ms latency, "
+          f"{args.error_rate * 100:.1f}% errors; working in {work_dir}")
+    print(f"{'run':<5}{'seconds':>9}{'tasks/min':>11}{'requests':>10}{'req/s':>8}{'MiB':>7}{'rows':>7}{'changed':>9}{'unchanged':>11}")
+    try:
+        for run in range(1, args.runs + 1):
+            sink = CountingSink()
+            start = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):
+                stats = scraper.sync_data(reset=(run == 1), parse_workers=args.parse_workers, archive=False, event_sinks=[sink])
+            elapsed = time.perf_counter() - start
+            print(f"{run:<5}{elapsed:>9.2f}{sink.tasks / elapsed * 60:>11.0f}{sink.requests:>10}{sink.requests / elapsed:>8.0f}"
+                  f"{sink.bytes / 2**20:>7.1f}{sink.rows:>7}{stats['changed']:>9}{stats['unchanged']:>11}")
+        print(f"Server: {fake.requests} requests, {fake.errors} injected errors")
+    finally:
+        stop_servers(servers)
+        if not args.keep:
+            os.chdir(os.path.dirname(work_dir))
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,304 @@
+import sys
+import re
+import json
+import time
+import zlib
+import random
+import argparse
+import threading
+from urllib.parse import urlsplit, parse_qs
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+# Usage: python scripts/benchmarks/fake_server.py [--leagues 20] [--seasons 5] [--latency 50] [--error-rate 0.01]
+# Local stand-in for hockeycalgary.ca, RAMP (and Alberta One) and TeamLinkt,
+# serving synthetic league directories, season selects, /type/* standings
+# pages, getstandings3cached JSON and getStandings POST responses. Each site
+# gets its own port; point the scraper at them with the printed environment
+# variables (HC_BASE_URL, HC_RAMP_URL, HC_TEAMLINKT_URL, HC_ALBERTA_ONE_URL).
+# Content is deterministic for a given scale, so repeated syncs see
+# unchanged pages.
+
+SITES = ['legacy', 'ramp', 'teamlinkt', 'albertaone']
+SITE_ENV = {
+    'legacy': 'HC_BASE_URL',
+    'ramp': 'HC_RAMP_URL',
+    'teamlinkt': 'HC_TEAMLINKT_URL',
+    'albertaone': 'HC_ALBERTA_ONE_URL'
+}
+COMMUNITIES = ["Bow Valley", "Trails West", "Springbank", "Glenlake", "Bow River", "North West",
+               "McKnight", "Knights", "Raiders", "Wolverines", "Southwest", "Crowfoot", "Blackfoot"]
+LEGACY_AGES = ['U9', 'U11', 'U13', 'U15']
+RAMP_CATEGORY = '3300'
+RAMP_ASSOC = '3741'
+RAMP_GAME_TYPES = [('8361', 'Seeding'), ('8814', 'Regular')]
+TEAMLINKT_ASSOC = '23957'
+
+class FakeSite:
+    """Synthetic content for N leagues x M seasons per source, plus latency and error injection."""
+
+    def __init__(self, leagues=20, seasons=5, teams=12, latency=0.0, jitter=0.5, error_rate=0.0,
+                 error_status=503, last_season=2025):
+        self.leagues = leagues
+        self.teams = teams
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.seasons = [(y, y + 1) for y in range(last_season - seasons + 1, last_season + 1)]
+        self.requests = 0
+        self.errors = 0
+        self._lock = threading.Lock()
+
+    def rng(self, *key):
+        # Deterministic per page, so unchanged pages hash the same between runs
+        return random.Random(zlib.crc32(repr(key).encode('utf-8')))
+
+    def team_rows(self, *key):
+        rng = self.rng(*key)
+        rows = []
+        for i in range(self.teams):
+            gp = 20
+            w = rng.randint(0, gp)
+            l = rng.randint(0, gp - w)
+            rows.append({
+                'team': f"{rng.choice(COMMUNITIES)} {i + 1}",
+                'gp': gp, 'w': w, 'l': l, 't': gp - w - l, 'pts': 2 * w + gp - w - l,
+                'gf': rng.randint(10, 90), 'ga': rng.randint(10, 90)
+            })
+        return rows
+
+    # --- hockeycalgary.ca ---
+
+    def legacy_leagues(self):
+        return [(f"{LEGACY_AGES[i % len(LEGACY_AGES)].lower()}-tier-{i // len(LEGACY_AGES) + 1}",
+                 f"{LEGACY_AGES[i % len(LEGACY_AGES)]} Tier {i // len(LEGACY_AGES) + 1}")
+                for i in range(self.leagues)]
+
+    def legacy_index(self):
+        links = "".join(f"<li><a href='/standings/index/stream/community-council/league/{slug}'>{name}</a></li>"
+                        for slug, name in self.legacy_leagues())
+        return f"<html><body><nav><ul>{links}</ul></nav></body></html>"
+
+    def legacy_league_page(self, slug, season, league_type):
+        base = f"/standings/index/stream/community-council/league/{slug}"
+        options = "".join(f"<option value='{base}/season/{a}-{b}'>{a}/{b}</option>" for a, b in reversed(self.seasons))
+        types = "".join(f"<li><a href='{base}/type/{t}'>{t.title()}</a></li>" for t in ('league', 'seeding', 'playoff'))
+        season = season or "%d-%d" % self.seasons[-1]
+        rows = "".join(
+            f"<tr><td>{i + 1}</td><td>{r['team']}</td><td>{r['gp']}</td><td>{r['w']}</td><td>{r['l']}</td>"
+            f"<td>{r['t']}</td><td>{r['pts']}</td><td>{r['gf']}</td><td>{r['ga']}</td><td>{r['gf'] - r['ga']}</td></tr>"
+            for i, r in enumerate(self.team_rows('legacy', slug, season, league_type or 'league'))
+        )
+        return (
+            f"<html><body><h1>{slug}</h1><select name='season'>{options}</select><ul>{types}</ul>"
+            "<table class='table'><tr><th>#</th><th>Team</th><th>GP</th><th>W</th><th>L</th><th>T</th><th>PTS</th>"
+            f"<th>GF</th><th>GA</th><th>Diff</th></tr>{rows}</table></body></html>"
+        )
+
+    def tournament_home(self, season, tournament):
+        links = "".join(
+            f"<a href='/tournament/content/season/{season}/tournament/{tournament}/category/{age.lower()}/league/{age.lower()}-{tournament}'>{age} A</a>"
+            for age in LEGACY_AGES
+        )
+        return f"<html><body>{links}</body></html>"
+
+    def tournament_page(self, season, league_slug):
+        rng = self.rng('tournament', season, league_slug)
+        boxes = []
+        for g in range(self.teams):
+            home, visitor = rng.sample(COMMUNITIES, 2)
+            boxes.append(
+                f"<div class='game-box'><div class='home-row'><span class='team'>{home} {g % 3 + 1}</span><span class='score'>{rng.randint(0, 8)}</span></div>"
+                f"<div class='visitor-row'><span class='team'>{visitor} {g % 3 + 1}</span><span class='score'>{rng.randint(0, 8)}</span></div></div>"
+            )
+        return f"<html><body>{''.join(boxes)}</body></html>"
+
+    # --- RAMP / Alberta One ---
+
+    def ramp_divisions(self):
+        divisions = "".join(
+            f"<div><h3>U11 Tier {i + 1}</h3><a href='/division/{RAMP_CATEGORY}/{30000 + i}/standings'>Standings</a> "
+            f"<a href='/division/{RAMP_CATEGORY}/{30000 + i}/schedule'>Schedule</a></div>"
+            for i in range(self.leagues)
+        )
+        return f"<html><body>{divisions}</body></html>"
+
+    def ramp_division_page(self):
+        seasons = "".join(f"<option value='{10000 + a}'{' selected' if (a, b) == self.seasons[-1] else ''}>{a}-{b}</option>"
+                          for a, b in self.seasons)
+        game_types = "".join(f"<option value='{gid}'>{name}</option>" for gid, name in RAMP_GAME_TYPES)
+        return (
+            f"<html><head><script>$.getJSON('/api/leaguegame/getstandings3cached/{RAMP_ASSOC}/' + sid);</script></head><body>"
+            f"<select id='ddlSeason'><option value='0'>Select Season</option>{seasons}</select>"
+            f"<select id='ddlGameType'><option value='0'>All Game Types</option>{game_types}</select></body></html>"
+        )
+
+    def ramp_standings(self, sid, game_type, division):
+        rows = [{'SID': 0, 'TeamName': 'Pool A'}]
+        for i, r in enumerate(self.team_rows('ramp', sid, game_type, division)):
+            rows.append({'SID': i + 1, 'TeamName': f"U11 {r['team']}", 'GamesPlayed': r['gp'], 'Wins': r['w'],
+                         'Losses': r['l'], 'Ties': r['t'], 'Points': r['pts'], 'GF': r['gf'], 'GA': r['ga']})
+        return json.dumps(rows)
+
+    # --- TeamLinkt ---
+
+    def teamlinkt_hierarchy(self):
+        options = "".join(f"<option value='{249000 + i}-{249500 + i}'>U13 / U13 TIER {i + 1} NORTH</option>" for i in range(self.leagues))
+        return f"<html><body><select name='hierarchy_filter'><option value='0'>All</option>{options}</select></body></html>"
+
+    def teamlinkt_league_page(self):
+        options = []
+        for a, b in reversed(self.seasons):
+            for offset, kind in ((0, 'SEEDING'), (1, 'REGULAR SEASON')):
+                selected = ' selected' if (a, b) == self.seasons[-1] and offset == 0 else ''
+                options.append(f"<option value='{a * 10 + offset}'{selected}>{a}/{b} U13 {kind}</option>")
+        return (
+            f"<html><body><select id='season_id'>{''.join(options)}</select>"
+            f"<script>var url = '/leagues/getStandings/{TEAMLINKT_ASSOC}/' + season;</script></body></html>"
+        )
+
+    def teamlinkt_standings(self, season_id, form):
+        division = form.get('group_ids[division]', [''])[0]
+        standings = [
+            {'team_name': f"<a href='/team/{i}'>{r['team']}</a>", 'games_played': r['gp'], 'total_wins': r['w'],
+             'total_losses': r['l'], 'total_ties': r['t'], 'total_points': r['pts'],
+             'score_for': r['gf'], 'score_against': r['ga']}
+            for i, r in enumerate(self.team_rows('teamlinkt', season_id, division))
+        ]
+        return json.dumps({'standings': standings})
+
+    # --- Routing ---
+
+    def route(self, site, method, path, query, form):
+        """Returns (status, content_type, body) for a request."""
+        html = 'text/html; charset=utf-8'
+        if site == 'legacy':
+            if path in ('/standings', '/standings/') or re.fullmatch(r'/standings/index/season/[\d-]+', path):
+                return 200, html, self.legacy_index()
+            m = re.fullmatch(r'/standings/index/stream/[^/]+/league/([^/]+)(?:/season/([\d-]+))?(?:/type/([a-z]+))?', path)
+            if m:
+                return 200, html, self.legacy_league_page(*m.groups())
+            m = re.fullmatch(r'/tournament/content/season/([\d-]+)/tournament/([^/]+)/page/home', path)
+            if m:
+                return 200, html, self.tournament_home(*m.groups())
+            m = re.fullmatch(r'/tournament/content/season/([\d-]+)/tournament/[^/]+/category/[^/]+/league/([^/]+)', path)
+            if m:
+                return 200, html, self.tournament_page(*m.groups())
+        elif site in ('ramp', 'albertaone'):
+            if path in ('/', f'/division/{RAMP_CATEGORY}/'):
+                return 200, html, self.ramp_divisions()
+            if re.fullmatch(rf'/division/{RAMP_CATEGORY}/\d+/standings', path):
+                return 200, html, self.ramp_division_page()
+            m = re.fullmatch(r'/api/leaguegame/getstandings3cached/\d+/(\d+)/(\d+)/\d+/(\d+)/0/0', path)
+            if m:
+                return 200, 'application/json', self.ramp_standings(*m.groups())
+        elif site == 'teamlinkt':
+            if path == '/hockeycalgary/Standings':
+                if 'hierarchy_filter' in query:
+                    return 200, html, self.teamlinkt_league_page()
+                return 200, html, self.teamlinkt_hierarchy()
+            m = re.fullmatch(r'/leagues/getStandings/\d+/(\d+)', path)
+            if m and method == 'POST':
+                return 200, 'application/json', self.teamlinkt_standings(m.group(1), form)
+        return 404, 'text/plain', 'Not found'
+
+    def delay(self):
+        if self.latency:
+            time.sleep(max(0.0, self.latency * random.uniform(1 - self.jitter, 1 + self.jitter)))
+
+    def should_fail(self):
+        with self._lock:
+            self.requests += 1
+            failed = self.error_rate and random.random() < self.error_rate
+            if failed:
+                self.errors += 1
+        return failed
+
+def make_handler(fake, site):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def _respond(self, method):
+            form = {}
+            if method == 'POST':
+                length = int(self.headers.get('Content-Length') or 0)
+                form = parse_qs(self.rfile.read(length).decode('utf-8'))
+            fake.delay()
+            if fake.should_fail():
+                status, content_type, body = fake.error_status, 'text/plain', 'Injected error'
+            else:
+                parts = urlsplit(self.path)
+                status, content_type, body = fake.route(site, method, parts.path, parse_qs(parts.query), form)
+            data = body.encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', content_type)
+            self.send_header('Content-Length', str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def do_GET(self):
+            self._respond('GET')
+
+        def do_POST(self):
+            self._respond('POST')
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+def start_servers(fake, host='127.0.0.1', port=8800):
+    """
+    Serves every site of `fake` on consecutive ports starting at `port`
+    (0 picks free ports) in background threads.
+    Returns (servers, env) where env maps HC_*_URL variables to the sites.
+    """
+    servers = []
+    env = {}
+    for offset, site in enumerate(SITES):
+        server = ThreadingHTTPServer((host, port + offset if port else 0), make_handler(fake, site))
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+        env[SITE_ENV[site]] = f"http://{host}:{server.server_address[1]}"
+    return servers, env
+
+def stop_servers(servers):
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+def add_site_arguments(parser):
+    parser.add_argument('--leagues', type=int, default=20, help="Leagues/divisions per source (default: 20)")
+    parser.add_argument('--seasons', type=int, default=5, help="Seasons per league (default: 5)")
+    parser.add_argument('--teams', type=int, default=12, help="Teams per standings table (default: 12)")
+    parser.add_argument('--latency', type=float, default=0, help="Mean response latency in ms (default: 0)")
+    parser.add_argument('--jitter', type=float, default=0.5, help="Random +/- fraction of the latency (default: 0.5)")
+    parser.add_argument('--error-rate', type=float, default=0, help="Fraction of requests answered with an error (default: 0)")
+    parser.add_argument('--error-status', type=int, default=503, help="HTTP status for injected errors (default: 503)")
+
+def site_from_args(args):
+    return FakeSite(leagues=args.leagues, seasons=args.seasons, teams=args.teams, latency=args.latency / 1000,
+                    jitter=args.jitter, error_rate=args.error_rate, error_status=args.error_status)
+
+def main():
+    parser = argparse.ArgumentParser(description="Local stand-in server for the scraper's source sites.")
+    add_site_arguments(parser)
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8800, help="First port; sites use port..port+3 (default: 8800)")
+    args = parser.parse_args()
+
+    fake = site_from_args(args)
+    servers, env = start_servers(fake, args.host, args.port)
+    print("Fake sites running. Point the scraper at them with:")
+    for name, url in env.items():
+        print(f"  export {name}={url}")
+    try:
+        while True:
+            time.sleep(10)
+            print(f"{fake.requests} requests served ({fake.errors} injected errors)")
+    except KeyboardInterrupt:
+        stop_servers(servers)
+
+if __name__ == "__main__":
+    main()
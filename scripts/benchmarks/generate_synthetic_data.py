@@ -0,0 +1,220 @@
+import sys
+import os
+import time
+import random
+import argparse
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../')))
+
+from sqlalchemy import insert, select, func
+from sqlalchemy.orm import Session
+from models import Base, Season, League, Community, Team, Standing, SyncState
+from utilities.utils import ALLOWED_COMMUNITIES
+
+# Usage: python scripts/benchmarks/generate_synthetic_data.py --rows 100000 [--seasons 24] [--db sqlite:///synthetic.db] [--reset]
+# Fills Season/League/Community/Team/Standing with synthetic standings for
+# dashboard scale testing: the real associations plus generated ones, every
+# age category, all tiers (BC/NBC streams and AA) and all season types.
+# Community sizes drift over the seasons and each (season, age) has a size
+# threshold past which a community fields two Tier 1 teams, so the dilution
+# and tier distribution pages have something to find. Rows are written with
+# executemany INSERTs into a fresh database (ids are assigned here).
+# Without --db the database from HC_DB_URL (default hockey_calgary.db) is used.
+
+AGES = ['U9', 'U11', 'U13', 'U15', 'U18']
+AGE_SIZE_FACTOR = {'U9': 1.2, 'U11': 1.1, 'U13': 1.0, 'U15': 0.9, 'U18': 0.8}
+BC_TIERS = {'U9': 4, 'U11': 6, 'U13': 6, 'U15': 4, 'U18': 4}
+NBC_TIERS = 3 # U15/U18 non-body checking
+AA_AGES = ['U13', 'U15', 'U18']
+# Share of an age group's teams entered in each season type
+TYPE_SHARE = {'Seeding': 1.0, 'Regular': 1.0, 'Playoff': 1.0, 'Tournament': 0.5}
+GAMES = {'Seeding': (4, 8), 'Regular': (16, 28), 'Playoff': (2, 6), 'Tournament': (3, 5)}
+SYNTHETIC_STREAM = 'synthetic'
+TEAMS_PER_COMMUNITY = 12 # Mean non-elite teams per community, season and age at large scales
+BATCH_SIZE = 50000
+
+def season_names(count, last_start=2025):
+    return [f"{year}-{year + 1}" for year in range(last_start - count + 1, last_start + 1)]
+
+def community_names(count):
+    names = sorted(ALLOWED_COMMUNITIES)
+    i = 1
+    while len(names) < count:
+        names.append(f"Synthetic Association {i:04d}")
+        i += 1
+    return names[:max(count, len(ALLOWED_COMMUNITIES))]
+
+def league_name(age, stream, tier):
+    if tier == 'AA':
+        return f"{age} AA"
+    if age in ('U15', 'U18'):
+        return f"{age} {stream} Tier {tier}"
+    return f"{age} Tier {tier}"
+
+def plan_sizes(rng, rows, seasons, communities):
+    """Non-elite team count per (season, age, community), scaled so the standings total is close to `rows`."""
+    type_factor = sum(TYPE_SHARE.values())
+    strength = {c: rng.uniform(0.4, 1.6) for c in communities}
+    growth = {c: rng.uniform(-0.03, 0.03) for c in communities}
+    raw = {}
+    for s, season in enumerate(seasons):
+        for age in AGES:
+            for c in communities:
+                drift = max(0.2, 1 + growth[c] * (s - len(seasons) / 2))
+                raw[(season, age, c)] = strength[c] * drift * AGE_SIZE_FACTOR[age] * rng.uniform(0.85, 1.15)
+    scale = rows / (sum(raw.values()) * type_factor)
+    return {key: max(1, round(value * scale)) for key, value in raw.items()}
+
+def assign_tiers(rng, age, size, threshold, bias):
+    """(stream, tier) per non-elite team of one community: one Tier 1 team, two past the threshold."""
+    if age in ('U15', 'U18'):
+        bc = (size + 1) // 2
+        nbc = size - bc
+    else:
+        bc, nbc = size, 0
+    max_tier = BC_TIERS[age]
+    tier1 = 0 if bc < 3 else 2 if size >= threshold else 1
+    tiers = [('BC', 1)] * min(tier1, bc)
+    for _ in range(bc - len(tiers)):
+        tiers.append(('BC', min(max_tier, max(2, round(rng.gauss(bias * max_tier, 1.2))))))
+    for _ in range(nbc):
+        tiers.append(('NBC', min(NBC_TIERS, max(1, round(rng.gauss(2, 0.8))))))
+    return tiers
+
+def standing_row(rng, season_type, strength):
+    gp = rng.randint(*GAMES[season_type])
+    p = min(0.95, max(0.05, rng.gauss(0.5 + strength, 0.12)))
+    t = sum(1 for _ in range(gp) if rng.random() < 0.08)
+    w = sum(1 for _ in range(gp - t) if rng.random() < p)
+    gf = sum(rng.randint(1, 6) for _ in range(gp)) + w
+    ga = sum(rng.randint(1, 6) for _ in range(gp)) + (gp - w - t)
+    return {'gp': gp, 'w': w, 'l': gp - w - t, 't': t, 'pts': 2 * w + t, 'gf': gf, 'ga': ga, 'diff': gf - ga}
+
+def generate(engine, rows, seasons=24, communities=None, seed=0, reset=False):
+    """
+    Writes about `rows` synthetic standings into `engine`'s database and
+    bumps its change stamp. The standings tables must be empty unless
+    `reset` drops and recreates them first. Returns a dict of row counts.
+    """
+    rng = random.Random(seed)
+    if reset:
+        Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+
+    with Session(engine) as db:
+        if db.execute(select(func.count()).select_from(Standing)).scalar():
+            raise ValueError("Database already holds standings; use reset=True (--reset) to replace them")
+
+        season_list = season_names(seasons)
+        if communities is None:
+            # Many associations at scale, each with a realistic number of teams
+            communities = min(2000, max(len(ALLOWED_COMMUNITIES), round(rows / (seasons * len(AGES) * sum(TYPE_SHARE.values()) * TEAMS_PER_COMMUNITY))))
+        community_list = community_names(communities)
+        sizes = plan_sizes(rng, rows, season_list, community_list)
+        mean_size = sum(sizes.values()) / len(sizes)
+
+        season_ids = {name: i for i, name in enumerate(season_list, 1)}
+        community_ids = {name: i for i, name in enumerate(community_list, 1)}
+        db.execute(insert(Season), [{'id': i, 'name': name} for name, i in season_ids.items()])
+        db.execute(insert(Community), [{'id': i, 'name': name} for name, i in community_ids.items()])
+
+        league_ids = {}
+        for season_type in TYPE_SHARE:
+            for age in AGES:
+                names = [league_name(age, 'BC', tier) for tier in range(1, BC_TIERS[age] + 1)]
+                if age in ('U15', 'U18'):
+                    names += [league_name(age, 'NBC', tier) for tier in range(1, NBC_TIERS + 1)]
+                if age in AA_AGES:
+                    names.append(league_name(age, None, 'AA'))
+                for name in names:
+                    league_ids[(name, season_type)] = len(league_ids) + 1
+        db.execute(insert(League), [
+            {'id': i, 'name': name, 'slug': name.lower().replace(' ', '-'), 'stream': SYNTHETIC_STREAM, 'type': season_type}
+            for (name, season_type), i in league_ids.items()
+        ])
+
+        # Teams keep their name (and id) across seasons: "<Community> <Age> <n>"
+        team_ids = {}
+        def team_id(community, age, n):
+            key = (community, age, n)
+            if key not in team_ids:
+                team_ids[key] = len(team_ids) + 1
+            return team_ids[key]
+
+        teams_flushed = [0]
+        def flush(batch):
+            # Teams first seen since the last flush go in before their standings
+            new_teams = [
+                {'id': i, 'name': f"{community} {age} {n}", 'community_id': community_ids[community]}
+                for (community, age, n), i in team_ids.items() if i > teams_flushed[0]
+            ]
+            if new_teams:
+                db.execute(insert(Team), new_teams)
+                teams_flushed[0] = len(team_ids)
+            if batch:
+                db.execute(insert(Standing), batch)
+            return len(batch)
+
+        community_bias = {c: rng.uniform(0.4, 0.75) for c in community_list}
+        community_strength = {c: rng.uniform(-0.12, 0.12) for c in community_list}
+        batch = []
+        written = 0
+        for season in season_list:
+            for age in AGES:
+                threshold = max(3, round(mean_size * AGE_SIZE_FACTOR[age] * rng.uniform(1.1, 1.5)))
+                for community in community_list:
+                    size = sizes[(season, age, community)]
+                    teams = assign_tiers(rng, age, size, threshold, community_bias[community])
+                    if age in AA_AGES and size >= threshold:
+                        teams.append((None, 'AA'))
+                    # Two Tier 1 teams thin out the rest of the age group
+                    diluted = -0.05 if sum(1 for t in teams if t == ('BC', 1)) >= 2 else 0.0
+                    for season_type, share in TYPE_SHARE.items():
+                        for n, (stream, tier) in enumerate(teams, 1):
+                            if share < 1.0 and rng.random() >= share:
+                                continue
+                            row = standing_row(rng, season_type, community_strength[community] + diluted)
+                            row.update({
+                                'season_id': season_ids[season],
+                                'league_id': league_ids[(league_name(age, stream, tier), season_type)],
+                                'team_id': team_id(community, age, n),
+                                'source_url': f"https://synthetic.invalid/{season}/{age}/{n}"
+                            })
+                            batch.append(row)
+                    if len(batch) >= BATCH_SIZE:
+                        written += flush(batch)
+                        batch = []
+        written += flush(batch)
+
+        state = db.get(SyncState, 1)
+        if not state:
+            state = SyncState(id=1, change_counter=0)
+            db.add(state)
+        state.change_counter = (state.change_counter or 0) + 1
+        state.updated_at = time.time()
+        db.commit()
+
+    return {'seasons': len(season_list), 'communities': len(community_list), 'leagues': len(league_ids),
+            'teams': len(team_ids), 'standings': written}
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate synthetic standings for dashboard scale testing.")
+    parser.add_argument('--rows', type=int, default=100000, help="Approximate number of standings rows (default: 100000)")
+    parser.add_argument('--seasons', type=int, default=24, help="Number of seasons, ending 2025-2026 (default: 24)")
+    parser.add_argument('--communities', type=int, default=None, help="Number of associations (default: scaled with --rows)")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--db', default=None, help="SQLAlchemy URL (default: HC_DB_URL or sqlite:///hockey_calgary.db)")
+    parser.add_argument('--reset', action='store_true', help="Drop and recreate all tables first")
+    args = parser.parse_args()
+
+    if args.db:
+        os.environ['HC_DB_URL'] = args.db
+    from database import engine, DB_URL
+
+    start = time.perf_counter()
+    counts = generate(engine, args.rows, args.seasons, args.communities, args.seed, args.reset)
+    elapsed = time.perf_counter() - start
+    print(f"Wrote {counts['standings']} standings ({counts['seasons']} seasons, {counts['communities']} communities, "
+          f"{counts['leagues']} leagues, {counts['teams']} teams) to {DB_URL} in {elapsed:.1f}s")
+
+if __name__ == "__main__":
+    main()
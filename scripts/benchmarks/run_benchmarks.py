@@ -0,0 +1,183 @@
+import sys
+import os
+import json
+import time
+import shutil
+import argparse
+import tempfile
+import io
+import contextlib
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../')))
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from models import Base, Season, League
+from utilities.parsing import make_soup
+from utilities.utils import CommunityNormalizer, normalize_community_name, get_community_normalizer
+import scraper
+
+# Usage: python scripts/benchmarks/run_benchmarks.py [--filter NAME] [--save] [--threshold 0.25]
+# Offline benchmarks of the scraper's parse and ingest hot paths over the
+# checked-in fixtures in scripts/benchmarks/fixtures/. Results are compared
+# with scripts/benchmarks/baseline.json; a benchmark slower than its baseline
+# by more than the threshold is reported as a regression (exit code 1).
+# Baselines are machine-specific: re-record them with --save after changing
+# machines or accepting an intentional slowdown.
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+FIXTURES_DIR = os.path.join(BENCH_DIR, 'fixtures')
+BASELINE_FILE = os.path.join(BENCH_DIR, 'baseline.json')
+DEFAULT_THRESHOLD = 0.25 # 25% slower than baseline
+
+def fixture_bytes(name):
+    with open(os.path.join(FIXTURES_DIR, name), 'rb') as f:
+        return f.read()
+
+def fixture_json(name):
+    return json.loads(fixture_bytes(name))
+
+def team_names():
+    return fixture_bytes('team_names.txt').decode('utf-8').split('\n')[:-1]
+
+def bench_save_standings():
+    """save_standings into a throwaway SQLite DB: alternating tables (every save writes) and a repeated one (hash skip)."""
+    tmp_dir = tempfile.mkdtemp(prefix='hc-bench-')
+    engine = create_engine(f"sqlite:///{os.path.join(tmp_dir, 'bench.db')}")
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+    season = Season(name='2025-2026')
+    league = League(name='U13 Tier 1', slug='u13-tier-1', stream='community-council', type='Regular')
+    db.add_all([season, league])
+    db.commit()
+
+    data = scraper.parse_standings(make_soup(fixture_bytes('legacy_standings.html'), 'standings'))
+    variants = [data, [dict(row, gp=row['gp'] + 1) for row in data]]
+    state = {'i': 0}
+
+    def changed():
+        state['i'] += 1
+        scraper.save_standings(db, variants[state['i'] % 2], season, league, {}, 'https://example.invalid/standings')
+
+    def unchanged():
+        scraper.save_standings(db, data, season, league, {}, 'https://example.invalid/unchanged')
+
+    def cleanup():
+        db.close()
+        engine.dispose()
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    return {'save_standings (changed)': changed, 'save_standings (unchanged)': unchanged}, cleanup
+
+def build_benchmarks():
+    """Returns ({name: zero-arg callable}, [cleanup callables])."""
+    legacy_page = fixture_bytes('legacy_standings.html')
+    league_page = fixture_bytes('league_seasons.html')
+    brackets_page = fixture_bytes('tournament_brackets.html')
+    ramp_page = fixture_bytes('ramp_division.html')
+    division_list_page = fixture_bytes('ramp_division_list.html')
+    ramp_json = fixture_json('ramp_standings.json')
+    teamlinkt_json = fixture_json('teamlinkt_standings.json')
+    names = team_names()
+
+    standings_soup = make_soup(legacy_page, 'standings')
+    seasons_soup = make_soup(league_page, 'selects')
+    brackets_soup = make_soup(brackets_page)
+    ramp_soup = make_soup(ramp_page, 'metadata')
+    uncached = CommunityNormalizer({}, cache_size=0)
+
+    benchmarks = {
+        'make_soup (standings, partial)': lambda: make_soup(legacy_page, 'standings'),
+        'make_soup (full page)': lambda: make_soup(legacy_page),
+        'parse_standings': lambda: scraper.parse_standings(standings_soup),
+        'parse_brackets': lambda: scraper.parse_brackets(brackets_soup),
+        'parse_ramp_json': lambda: scraper.parse_ramp_json(ramp_json),
+        'parse_teamlinkt_json': lambda: scraper.parse_teamlinkt_json(teamlinkt_json),
+        'parse_season_options': lambda: scraper.parse_season_options(seasons_soup),
+        'get_select_options (RAMP)': lambda: (
+            scraper.get_select_options(ramp_soup, 'ddlSeason', skip_values=('0',)),
+            scraper.get_select_options(ramp_soup, 'ddlGameType', skip_values=('0',))
+        ),
+        'normalize_community_name (cached)': lambda: [normalize_community_name(n, {}) for n in names],
+        'normalize_community_name (batch)': lambda: (lambda normalizer: [normalize_community_name(n, {}, normalizer) for n in names])(get_community_normalizer()),
+        'normalize_community_name (uncached)': lambda: [uncached.normalize(n) for n in names],
+        'parse_page (standings)': lambda: scraper.parse_page('standings', legacy_page),
+        'parse_page (divisions)': lambda: scraper.parse_page('divisions', division_list_page),
+    }
+    save_benchmarks, cleanup = bench_save_standings()
+    benchmarks.update(save_benchmarks)
+    return benchmarks, [cleanup]
+
+def measure(func, repeat=5, min_time=0.2):
+    """Best per-call time over `repeat` rounds, each looping for at least `min_time` seconds."""
+    func() # Warm-up
+    loops = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(loops):
+            func()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            break
+        loops *= 2
+    best = elapsed / loops
+    for _ in range(repeat - 1):
+        start = time.perf_counter()
+        for _ in range(loops):
+            func()
+        best = min(best, (time.perf_counter() - start) / loops)
+    return best
+
+def format_time(seconds):
+    if seconds < 1e-3:
+        return f"{seconds * 1e6:.1f} us"
+    if seconds < 1:
+        return f"{seconds * 1e3:.2f} ms"
+    return f"{seconds:.2f} s"
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline scraper benchmarks with baseline comparison.")
+    parser.add_argument('--filter', default=None, help="Only run benchmarks whose name contains this text")
+    parser.add_argument('--save', action='store_true', help="Record the results as the new baseline")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD, help="Allowed slowdown vs. baseline (default: 0.25)")
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    baseline = {}
+    if os.path.exists(BASELINE_FILE):
+        with open(BASELINE_FILE, 'r') as f:
+            baseline = json.load(f)
+
+    benchmarks, cleanups = build_benchmarks()
+    results = {}
+    regressions = []
+    try:
+        print(f"{'benchmark':<40}{'time':>12}{'baseline':>12}{'change':>10}")
+        for name, func in benchmarks.items():
+            if args.filter and args.filter not in name:
+                continue
+            with contextlib.redirect_stdout(io.StringIO()): # save_standings logs every save
+                results[name] = measure(func, repeat=args.repeat)
+            base = baseline.get(name)
+            change = ''
+            if base:
+                ratio = results[name] / base - 1
+                change = f"{ratio * 100:+.0f}%"
+                if ratio > args.threshold:
+                    regressions.append(name)
+                    change += ' !'
+            print(f"{name:<40}{format_time(results[name]):>12}{format_time(base) if base else '-':>12}{change:>10}")
+    finally:
+        for cleanup in cleanups:
+            cleanup()
+
+    if args.save:
+        baseline.update(results)
+        with open(BASELINE_FILE, 'w') as f:
+            json.dump(baseline, f, indent=4, sort_keys=True)
+        print(f"Baseline saved to {BASELINE_FILE}")
+    elif regressions:
+        print(f"\n{len(regressions)} regression(s) beyond {args.threshold * 100:.0f}%: {', '.join(regressions)}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
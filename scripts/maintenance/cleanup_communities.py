@@ -2,18 +2,15 @@ import sys
 import os
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../')))
 
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from database import write_session
 from models import Community, Team, Standing, Base
 from utilities.utils import ALLOWED_COMMUNITIES
 
-# Database setup
-DB_NAME = "hockey_calgary.db"
-engine = create_engine(f"sqlite:///{DB_NAME}")
-Session = sessionmaker(bind=engine)
-session = Session()
-
 def cleanup_database():
+    with write_session() as session:
+        _cleanup(session)
+
+def _cleanup(session):
     print("Starting database cleanup...")
     print(f"Allowed Communities: {ALLOWED_COMMUNITIES}")
 
@@ -54,8 +51,6 @@ def cleanup_database():
     except Exception as e:
         session.rollback()
         print(f"Error during cleanup: {e}")
-    finally:
-        session.close()
 
 if __name__ == "__main__":
     cleanup_database()
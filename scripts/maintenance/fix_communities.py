@@ -3,12 +3,15 @@ import os
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../')))
 
 from sqlalchemy.orm import Session
-from database import SessionLocal
+from database import write_session
 from models import Team, Community
 from utilities.utils import normalize_community_name, load_community_map
 
 def fix_communities():
-    db = SessionLocal()
+    with write_session() as db:
+        _fix_communities(db)
+
+def _fix_communities(db):
     teams = db.query(Team).all()
     community_map = load_community_map()
     
@@ -50,8 +53,6 @@ def fix_communities():
         
     db.commit()
     print(f"Removed {len(empty_communities)} empty communities.")
-    
-    db.close()
     print(f"Fixed {updated_count} team mappings.")
 
 if __name__ == "__main__":
@@ -1,10 +1,14 @@
 from sqlalchemy.orm import Session
-from database import SessionLocal
+from database import write_session
 from models import Season, Standing
 from collections import defaultdict
 
 def fix_seasons():
-    db = SessionLocal()
+    with write_session() as db:
+        _fix_seasons(db)
+    print("Season fix complete.")
+
+def _fix_seasons(db):
     seasons = db.query(Season).all()
     
     print(f"Found {len(seasons)} seasons.")
@@ -61,9 +65,6 @@ def fix_seasons():
             # Delete the old season
             db.delete(s)
             db.commit()
-            
-    db.close()
-    print("Season fix complete.")
 
 if __name__ == "__main__":
     fix_seasons()
\ No newline at end of file
@@ -0,0 +1,61 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../')))
+
+import pandas as pd
+from utilities.frame_store import FrameStore
+
+# Checks that what one dashboard session does to the frames it gets from the
+# shared FrameStore never reaches the stored data or another session's view.
+
+def load():
+    return pd.DataFrame({
+        'Team': ['A', 'B', 'C'],
+        'PTS': [10, 20, 30],
+        'Win %': [0.5, 0.25, 0.75]
+    })
+
+def set_loc(df):
+    df.loc[0, 'PTS'] = -1
+
+def set_iloc(df):
+    df.iloc[1, 1] = -5
+
+def set_column(df):
+    df['PTS'] = df['PTS'] * 100
+
+def add_column(df):
+    df['Extra'] = 1
+
+def clip_in_place(df):
+    df['PTS'].clip(upper=15, inplace=True)
+
+def sort_in_place(df):
+    df.sort_values('PTS', ascending=False, inplace=True)
+
+def set_series_item(df):
+    df['Team'][2] = 'Z'
+
+MUTATIONS = [set_loc, set_iloc, set_column, add_column, clip_in_place, sort_in_place, set_series_item]
+
+def verify_frame_store():
+    expected = load()
+    failures = 0
+    for mutate in MUTATIONS:
+        store = FrameStore(load)
+        for label, get, columns in (
+            ('frame', lambda: store.frame(1), ['Team', 'PTS', 'Win %']),
+            ('aggregate', lambda: store.get(1, 'totals', lambda df: df[['Team', 'PTS']]), ['Team', 'PTS']),
+            ('tuple aggregate', lambda: store.get(1, 'pair', lambda df: (df, df['PTS']))[0], ['Team', 'PTS', 'Win %']),
+        ):
+            session_view = get()
+            other_view = get()
+            mutate(session_view)
+            stored = get()
+            leaked = not (other_view.equals(expected[columns]) and stored.equals(expected[columns]))
+            failures += leaked
+            print(f"{'FAIL' if leaked else 'OK  '} {mutate.__name__} on {label}")
+    return failures
+
+if __name__ == "__main__":
+    sys.exit(1 if verify_frame_store() else 0)
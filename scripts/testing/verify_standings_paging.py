@@ -0,0 +1,52 @@
+import sys
+import os
+import tempfile
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../')))
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../benchmarks')))
+
+from sqlalchemy import create_engine, text
+from generate_synthetic_data import generate
+from utilities.analytics import load_standings, filter_standings, count_standings, standings_page, get_age_category
+
+# Checks that the raw data view's SQL paging (count_standings/standings_page)
+# selects the same rows as filtering the analytic frame in pandas, including
+# leagues whose names differ from others only in case ("u11 tier 2" is not U11).
+
+ROW_KEY = ['Season', 'League', 'Team', 'GP', 'PTS']
+
+def verify_paging():
+    work_dir = tempfile.mkdtemp(prefix="hc-paging-")
+    engine = create_engine(f"sqlite:///{os.path.join(work_dir, 'paging.db')}")
+    generate(engine, rows=3000, seasons=3, seed=1)
+    with engine.begin() as conn:
+        conn.execute(text("UPDATE leagues SET name = lower(name) WHERE id % 4 = 0"))
+
+    df = load_standings(engine)
+    seasons = sorted(df['Season'].unique().tolist())
+    lowered = sorted(l for l in df['League'].unique() if l != l.upper() and l.lower() == l)
+    print(f"{len(df)} rows, {len(lowered)} lower-case leagues (e.g. {lowered[:2]})")
+
+    cases = [
+        (None, None, None, None, None, None),
+        (None, None, ['U11'], None, None, None),
+        (None, None, ['Other'], None, None, None),
+        ([seasons[-1]], ['Seeding'], ['U11', 'U13'], None, None, None),
+        (None, None, None, None, lowered[:3], None),
+    ]
+    failures = 0
+    for filters in cases:
+        expected = filter_standings(df, *filters)
+        count = count_standings(engine, filters)
+        page = standings_page(engine, filters, 'League', True, 0, max(count, 1))
+        same_rows = (sorted(map(tuple, expected[ROW_KEY].values.tolist())) ==
+                     sorted(map(tuple, page[ROW_KEY].values.tolist())))
+        same_ages = (page['Age Category'] == page['League'].map(get_age_category)).all()
+        ok = count == len(expected) and same_rows and same_ages
+        failures += not ok
+        print(f"{'OK  ' if ok else 'FAIL'} {filters}: sql {count}, pandas {len(expected)}")
+
+    engine.dispose()
+    return failures
+
+if __name__ == "__main__":
+    sys.exit(1 if verify_paging() else 0)
@@ -0,0 +1,625 @@
+import numpy as np
+import pandas as pd
+from sqlalchemy import text, bindparam
+from utilities.tiering_logic import parse_tier_info
+
+# Data pipelines behind the dashboard pages, free of Streamlit so they can be
+# timed and reused outside app.py (see scripts/benchmarks/bench_pipelines.py).
+
+STANDINGS_QUERY = """
+SELECT
+    s.name as Season,
+    l.name as League,
+    l.type as Type,
+    l.stream as Stream,
+    c.name as Community,
+    t.name as Team,
+    st.gp as GP,
+    st.w as W,
+    st.l as L,
+    st.t as T,
+    st.pts as PTS,
+    st.gf as GF,
+    st.ga as GA,
+    st.diff as Diff,
+    st.source_url as Source
+FROM standings st
+JOIN seasons s ON st.season_id = s.id
+JOIN leagues l ON st.league_id = l.id
+JOIN teams t ON st.team_id = t.id
+JOIN communities c ON t.community_id = c.id
+"""
+
+NORTH_COMMUNITIES = ['Springbank', 'North West', 'Bow River', 'McKnight', 'Raiders']
+SOUTH_COMMUNITIES = ['Trails West', 'Glenlake', 'Bow Valley', 'Knights', 'Southwest', 'Wolverines']
+
+THRESHOLD_CATEGORIES = ["Just Below Threshold (1 Team)", "Just Above Threshold (Diluted)", "Large (Established)"]
+
+COMMUNITY_ABBREVIATIONS = {
+    "Bow River": "BR",
+    "Bow Valley": "BV",
+    "Glenlake": "GL",
+    "Knights": "K",
+    "McKnight": "MK",
+    "North West": "NW",
+    "Raiders": "R",
+    "Southwest": "SW",
+    "Springbank": "SB",
+    "Trails West": "TW",
+    "Wolverines": "W"
+}
+
+# --- Loading ---
+
+def get_age_category(league_name):
+    # Extract Age Category (U9, U11, etc.) from League Name
+    if 'U9' in league_name: return 'U9'
+    if 'U11' in league_name: return 'U11'
+    if 'U13' in league_name: return 'U13'
+    if 'U15' in league_name: return 'U15'
+    if 'U18' in league_name: return 'U18'
+    if 'U21' in league_name: return 'U21'
+    return 'Other'
+
+def enrich_standings(df):
+    """Adds the derived metric and Age Category columns and drops Girls Hockey Calgary."""
+    # Handle division by zero for teams with 0 GP
+    df['Win %'] = df.apply(lambda row: row['W'] / row['GP'] if row['GP'] > 0 else 0.0, axis=1)
+    df['Points %'] = df.apply(lambda row: row['PTS'] / (row['GP'] * 2) if row['GP'] > 0 else 0.0, axis=1)
+    df['Goal Diff/Game'] = df.apply(lambda row: row['Diff'] / row['GP'] if row['GP'] > 0 else 0.0, axis=1)
+
+    df['Age Category'] = df['League'].apply(get_age_category)
+
+    # Exclude Girls Hockey Calgary
+    return df[df['Community'] != 'Girls Hockey Calgary']
+
+def load_standings(engine):
+    """All standings joined with season/league/team/community names, enriched."""
+    return enrich_standings(pd.read_sql(STANDINGS_QUERY, engine))
+
+# --- Paged standings (raw data viewer) ---
+
+# SQL equivalents of enrich_standings' derived columns, so the raw data view
+# can filter, sort and page in the database and fetch only the visible rows.
+# instr, not LIKE: SQLite's LIKE ignores case, get_age_category does not.
+AGE_CATEGORY_SQL = """CASE
+    WHEN instr(l.name, 'U9') > 0 THEN 'U9'
+    WHEN instr(l.name, 'U11') > 0 THEN 'U11'
+    WHEN instr(l.name, 'U13') > 0 THEN 'U13'
+    WHEN instr(l.name, 'U15') > 0 THEN 'U15'
+    WHEN instr(l.name, 'U18') > 0 THEN 'U18'
+    WHEN instr(l.name, 'U21') > 0 THEN 'U21'
+    ELSE 'Other' END"""
+
+STANDINGS_PAGE_COLUMNS = {
+    'Season': 's.name',
+    'League': 'l.name',
+    'Type': 'l.type',
+    'Stream': 'l.stream',
+    'Community': 'c.name',
+    'Team': 't.name',
+    'GP': 'st.gp',
+    'W': 'st.w',
+    'L': 'st.l',
+    'T': 'st.t',
+    'PTS': 'st.pts',
+    'GF': 'st.gf',
+    'GA': 'st.ga',
+    'Diff': 'st.diff',
+    'Source': 'st.source_url',
+    'Win %': 'CASE WHEN st.gp > 0 THEN CAST(st.w AS FLOAT) / st.gp ELSE 0.0 END',
+    'Points %': 'CASE WHEN st.gp > 0 THEN CAST(st.pts AS FLOAT) / (st.gp * 2) ELSE 0.0 END',
+    'Goal Diff/Game': 'CASE WHEN st.gp > 0 THEN CAST(st.diff AS FLOAT) / st.gp ELSE 0.0 END',
+    'Age Category': AGE_CATEGORY_SQL,
+}
+
+STANDINGS_FROM = """
+FROM standings st
+JOIN seasons s ON st.season_id = s.id
+JOIN leagues l ON st.league_id = l.id
+JOIN teams t ON st.team_id = t.id
+JOIN communities c ON t.community_id = c.id
+"""
+
+def _standings_where(filters):
+    """WHERE clause and parameters matching filter_standings(df, *filters) on load_standings' frame."""
+    seasons, types, ages, communities, leagues, teams = filters
+    conditions = ["c.name != 'Girls Hockey Calgary'"]
+    params = {}
+    for name, column, values in (
+        ('seasons', 's.name', seasons),
+        ('types', 'l.type', types),
+        ('ages', AGE_CATEGORY_SQL, ages),
+        ('communities', 'c.name', communities),
+        ('leagues', 'l.name', leagues),
+        ('teams', 't.name', teams)
+    ):
+        if values:
+            conditions.append(f"({column}) IN :{name}")
+            params[name] = list(values)
+    return "WHERE " + " AND ".join(conditions), params
+
+def _standings_sql(sql, params):
+    return text(sql).bindparams(*[bindparam(name, expanding=True) for name in params])
+
+def count_standings(engine, filters):
+    """Number of standings rows matching filters ((seasons, types, ages, communities, leagues, teams))."""
+    where, params = _standings_where(filters)
+    with engine.connect() as conn:
+        return conn.execute(_standings_sql(f"SELECT COUNT(*) {STANDINGS_FROM} {where}", params), params).scalar()
+
+def standings_page(engine, filters, sort_by, ascending, offset, limit):
+    """
+    One page of the filtered standings, with load_standings' columns, sorted
+    by a STANDINGS_PAGE_COLUMNS column and fetched with LIMIT/OFFSET.
+    """
+    if sort_by not in STANDINGS_PAGE_COLUMNS:
+        raise ValueError(f"Unknown sort column: {sort_by}")
+    where, params = _standings_where(filters)
+    columns = ",\n    ".join(f'{expr} AS "{name}"' for name, expr in STANDINGS_PAGE_COLUMNS.items())
+    direction = "ASC" if ascending else "DESC"
+    sql = (f"SELECT\n    {columns}\n{STANDINGS_FROM} {where}\n"
+           f"ORDER BY {STANDINGS_PAGE_COLUMNS[sort_by]} {direction}, st.id LIMIT :limit OFFSET :offset")
+    return pd.read_sql(_standings_sql(sql, params), engine, params=dict(params, limit=limit, offset=offset))
+
+def frame_page(df, sort_by, ascending, offset, limit):
+    """The same paging over an in-memory frame (stable sort)."""
+    return df.sort_values(sort_by, ascending=ascending, kind='stable').iloc[offset:offset + limit]
+
+# --- Shared filters ---
+
+def default_selection(df):
+    """Default sidebar selections: current (or latest) season, Seeding, U11 + U13."""
+    all_seasons = sorted(df['Season'].unique().tolist(), reverse=True)
+    season_types = df['Type'].unique().tolist()
+    age_categories = sorted(df['Age Category'].unique().tolist())
+    return {
+        'seasons': ['2025-2026'] if '2025-2026' in all_seasons else [all_seasons[0]] if all_seasons else [],
+        'types': ['Seeding'] if 'Seeding' in season_types else [season_types[0]] if season_types else [],
+        'ages': [age for age in ['U11', 'U13'] if age in age_categories]
+    }
+
+def division_communities(all_communities, division):
+    if division == "North":
+        return [c for c in all_communities if c in NORTH_COMMUNITIES]
+    if division == "South":
+        return [c for c in all_communities if c in SOUTH_COMMUNITIES]
+    return all_communities
+
+# --- Filter index ---
+# Built once per DB change (app.py keeps it in the shared frame store) so
+# sidebar filtering and option lists don't rescan the string columns on
+# every rerun. Per dimension, each value's row positions are stored; a
+# selection starts from its smallest dimension and checks the remaining
+# dimensions through integer code lookups, so its cost follows the number
+# of matching rows rather than the frame size. A full-length mask per value
+# would take rows x values memory (there are tens of thousands of teams).
+
+FILTER_DIMENSIONS = ['Season', 'Type', 'Age Category', 'Community', 'League', 'Team']
+
+# Cascading sidebar options: the values of a column seen with each key of its parent columns
+FILTER_CASCADES = {
+    'League': ('Season', 'Type', 'Age Category'),
+    'Community': ('Season', 'Type', 'Age Category'),
+    'Team': ('Community',),
+}
+
+def build_filter_index(df):
+    """
+    Returns {'dims': {column: {...}}, 'cascades': {column: {...}}}. Values
+    keep their order of first appearance, like Series.unique(); missing
+    values get code -1 and never match a selection.
+    """
+    index = {'dims': {}, 'cascades': {}}
+    for col in FILTER_DIMENSIONS:
+        codes, values = pd.factorize(df[col])
+        codes = codes.astype(np.int32)
+        order = np.argsort(codes, kind='stable').astype(np.int32)
+        bounds = np.searchsorted(codes[order], np.arange(len(values) + 1))
+        index['dims'][col] = {
+            'codes': codes,
+            'values': values,
+            'lookup': {value: i for i, value in enumerate(values)},
+            'order': order, # Row positions grouped by code, ascending within a code
+            'bounds': bounds, # order[bounds[c]:bounds[c + 1]] are the rows of code c
+        }
+
+    for col, parents in FILTER_CASCADES.items():
+        pairs = pd.DataFrame({c: index['dims'][c]['codes'] for c in parents + (col,)}).drop_duplicates()
+        pairs = pairs[(pairs >= 0).all(axis=1)]
+        index['cascades'][col] = {key: set(group[col].tolist()) for key, group in pairs.groupby(list(parents))}
+    return index
+
+def _selected_codes(dim, values):
+    return [dim['lookup'][v] for v in values if v in dim['lookup']]
+
+def index_positions(index, selections):
+    """
+    Sorted row positions matching every selection ({column: values}). A
+    selection of None does not filter; an empty one matches no rows.
+    Returns None when nothing filters (all rows).
+    """
+    active = []
+    for col, values in selections.items():
+        if values is None:
+            continue
+        dim = index['dims'][col]
+        codes = _selected_codes(dim, values)
+        rows = sum(dim['bounds'][c + 1] - dim['bounds'][c] for c in codes)
+        active.append((rows, dim, codes))
+    if not active:
+        return None
+
+    active.sort(key=lambda a: a[0])
+    _, dim, codes = active[0]
+    positions = np.sort(np.concatenate(
+        [dim['order'][dim['bounds'][c]:dim['bounds'][c + 1]] for c in codes] or [np.empty(0, dtype=np.int32)]
+    ))
+    for _, dim, codes in active[1:]:
+        if len(positions) == 0:
+            break
+        # Last slot stays False for code -1 (missing values)
+        allowed = np.zeros(len(dim['values']) + 1, dtype=bool)
+        allowed[codes] = True
+        positions = positions[allowed[dim['codes'][positions]]]
+    return positions
+
+def select_rows(df, index, selections):
+    """
+    The rows of df (the frame the index was built from) matching selections,
+    as a new frame that shares df's data until written (copy-on-write).
+    """
+    positions = index_positions(index, selections)
+    return df.copy(deep=False) if positions is None else df.iloc[positions]
+
+def index_values(index, col):
+    """Distinct values of a filter column, in order of first appearance."""
+    return index['dims'][col]['values'].tolist()
+
+def index_options(index, col, selections):
+    """
+    Sorted values of col seen with the selected values of its
+    FILTER_CASCADES parents ({column: values}, a missing or None entry
+    allows every value), e.g. the leagues of the selected seasons, types
+    and ages.
+    """
+    parents = FILTER_CASCADES[col]
+    allowed = []
+    for parent in parents:
+        values = selections.get(parent)
+        allowed.append(None if values is None else set(_selected_codes(index['dims'][parent], values)))
+
+    codes = set()
+    for key, col_codes in index['cascades'][col].items():
+        if all(a is None or k in a for k, a in zip(key, allowed)):
+            codes |= col_codes
+    values = index['dims'][col]['values']
+    return sorted(values[c] for c in codes)
+
+# --- Analytics page ---
+
+def filter_standings(df, seasons=None, types=None, ages=None, communities=None, leagues=None, teams=None, index=None):
+    """
+    Applies each non-empty selection; an empty selection does not filter.
+    With a filter index (build_filter_index(df)) the rows are looked up
+    instead of scanned.
+    """
+    if index is not None:
+        selections = dict(zip(FILTER_DIMENSIONS, (seasons, types, ages, communities, leagues, teams)))
+        return select_rows(df, index, {col: values or None for col, values in selections.items()})
+
+    filtered_df = df.copy()
+
+    if seasons:
+        filtered_df = filtered_df[filtered_df['Season'].isin(seasons)]
+
+    if types:
+        filtered_df = filtered_df[filtered_df['Type'].isin(types)]
+
+    if ages:
+        filtered_df = filtered_df[filtered_df['Age Category'].isin(ages)]
+
+    if communities:
+        filtered_df = filtered_df[filtered_df['Community'].isin(communities)]
+
+    if leagues:
+        filtered_df = filtered_df[filtered_df['League'].isin(leagues)]
+
+    if teams:
+        filtered_df = filtered_df[filtered_df['Team'].isin(teams)]
+
+    return filtered_df
+
+def completeness_matrix(df):
+    # Group by Season, Type, and Age Category to count records
+    return df.groupby(['Season', 'Type', 'Age Category']).size().unstack(fill_value=0)
+
+def community_trend(filtered_df, metric):
+    # Aggregate by Season and Community
+    return filtered_df.groupby(['Season', 'Community'])[metric].mean().reset_index()
+
+def community_ranking(filtered_df, metric):
+    ranking_df = filtered_df.groupby('Community')[metric].mean().reset_index()
+    return ranking_df.sort_values(by=metric, ascending=False)
+
+def community_heatmap(filtered_df, metric):
+    return filtered_df.pivot_table(
+        index='Community',
+        columns='Season',
+        values=metric,
+        aggfunc='mean'
+    )
+
+# --- Tier 1 Dilution Analysis page ---
+
+def is_elite(league_name):
+    # Elite (AA/HADP) teams are excluded from community size counts
+    name_upper = league_name.upper()
+    if 'AA' in name_upper: return True
+    if 'HADP' in name_upper: return True
+    return False
+
+def is_tier_1(league_name):
+    parsed = parse_tier_info(league_name)
+    if parsed['tier'] == 1:
+        if parsed['stream'] == 'NBC': return False
+        return True
+    return False
+
+def league_flags(leagues, func):
+    # League names repeat across thousands of rows: evaluate each name once
+    return leagues.map({name: func(name) for name in leagues.unique()}).astype(bool)
+
+def dilution_frame(df, seasons, types, ages, communities, metric, index=None):
+    """
+    Community size, Tier 1 count and overall (non-elite) performance per
+    Season/Community/Age Category. Returns an empty frame when nothing matches.
+    """
+    # 1. Filter Base Data
+    if index is not None:
+        analysis_df = select_rows(df, index, {'Season': seasons, 'Type': types, 'Age Category': ages, 'Community': communities})
+    else:
+        analysis_df = df[
+            (df['Season'].isin(seasons)) &
+            (df['Type'].isin(types)) &
+            (df['Age Category'].isin(ages)) &
+            (df['Community'].isin(communities))
+        ].copy()
+
+    if analysis_df.empty:
+        return analysis_df
+
+    # 2. Identify Elite (AA/HADP) to exclude from Community Size Count
+    analysis_df['Is_Elite'] = league_flags(analysis_df['League'], is_elite)
+
+    # 3. Calculate Community Size (Total Non-Elite Teams) per Season/Community/Age
+    non_elite_df = analysis_df[~analysis_df['Is_Elite']].copy()
+
+    community_sizes = non_elite_df.groupby(['Season', 'Community', 'Age Category'])['Team'].nunique().reset_index()
+    community_sizes.rename(columns={'Team': 'Total_Community_Teams'}, inplace=True)
+
+    # 4. Identify Tier 1 Teams (for Threshold Logic)
+    analysis_df['Is_Tier_1'] = league_flags(analysis_df['League'], is_tier_1)
+
+    # Calculate Tier 1 Count per Community/Season/Age
+    tier1_counts = analysis_df[analysis_df['Is_Tier_1']].groupby(['Season', 'Community', 'Age Category'])['Team'].nunique().reset_index()
+    tier1_counts.rename(columns={'Team': 'Tier1_Count'}, inplace=True)
+
+    # 5. Calculate OVERALL Performance per Community/Season/Age
+    # Only consider teams that have played games for performance stats to avoid skewing the average with 0-game teams
+    performance_df = non_elite_df[non_elite_df['GP'] > 0]
+    overall_stats = performance_df.groupby(['Season', 'Community', 'Age Category'])[metric].mean().reset_index()
+    overall_stats.rename(columns={metric: 'Overall_Performance'}, inplace=True)
+
+    # 6. Merge Data
+    merged_df = pd.merge(community_sizes, tier1_counts, on=['Season', 'Community', 'Age Category'], how='left')
+    merged_df = pd.merge(merged_df, overall_stats, on=['Season', 'Community', 'Age Category'], how='left')
+
+    # Fill NaN Tier 1 Count with 0
+    merged_df['Tier1_Count'] = merged_df['Tier1_Count'].fillna(0)
+    merged_df.dropna(subset=['Total_Community_Teams'], inplace=True)
+    return merged_df
+
+def infer_thresholds(df, types, ages, index=None):
+    """
+    Infers, per (Season, Age Category), the community size at which a second
+    Tier 1 team is required. Thresholds come from the FULL dataset (filtered
+    by Type/Age only) so they stay accurate when communities are filtered
+    out of the view. Pure: the result depends only on df, types and ages.
+
+    Returns (season_age_thresholds, outliers_map, threshold_summary_data).
+    """
+    if index is not None:
+        full_analysis_df = select_rows(df, index, {'Type': types, 'Age Category': ages})
+    else:
+        full_analysis_df = df[
+            (df['Type'].isin(types)) &
+            (df['Age Category'].isin(ages))
+        ].copy()
+    full_analysis_df['Is_Tier_1'] = league_flags(full_analysis_df['League'], is_tier_1)
+    full_analysis_df['Is_Elite'] = league_flags(full_analysis_df['League'], is_elite)
+    full_non_elite = full_analysis_df[~full_analysis_df['Is_Elite']]
+
+    full_sizes = full_non_elite.groupby(['Season', 'Community', 'Age Category'])['Team'].nunique().reset_index()
+    full_sizes.rename(columns={'Team': 'Total_Community_Teams'}, inplace=True)
+
+    full_t1 = full_analysis_df[full_analysis_df['Is_Tier_1']].groupby(['Season', 'Community', 'Age Category'])['Team'].nunique().reset_index()
+    full_t1.rename(columns={'Team': 'Tier1_Count'}, inplace=True)
+
+    full_merged = pd.merge(full_sizes, full_t1, on=['Season', 'Community', 'Age Category'], how='left')
+    full_merged['Tier1_Count'] = full_merged['Tier1_Count'].fillna(0)
+
+    # Calculate thresholds map: (Season, Age) -> Inferred Threshold
+    # Algorithm: Find T that minimizes (Size < T & T1>=2) + (Size >= T & T1=1)
+    season_age_thresholds = {}
+    outliers_map = {} # (Season, Age) -> List of outlier strings
+    threshold_summary_data = []
+
+    grouped_thresholds = full_merged.groupby(['Season', 'Age Category'])
+
+    for (season, age), group in grouped_thresholds:
+        best_t = 0
+        max_score = -1
+        best_outliers = []
+
+        # Range of possible team sizes in this group
+        if group.empty: continue
+        min_teams = int(group['Total_Community_Teams'].min())
+        max_teams = int(group['Total_Community_Teams'].max())
+
+        # Brute force search for best threshold
+        # We look for a transition point.
+        # If no 2-team communities exist, threshold is effectively infinite (or max+1)
+        if group['Tier1_Count'].max() < 2:
+             season_age_thresholds[(season, age)] = 999
+             continue
+
+        for t in range(min_teams, max_teams + 2):
+            # Rule: If Size >= t, expect T1 >= 2. Else T1 = 1.
+            compliant = group[
+                ((group['Total_Community_Teams'] < t) & (group['Tier1_Count'] <= 1)) |
+                ((group['Total_Community_Teams'] >= t) & (group['Tier1_Count'] >= 2))
+            ]
+            score = len(compliant)
+
+            if score > max_score:
+                max_score = score
+                best_t = t
+
+                # Identify outliers for this T
+                non_compliant = group[
+                    ~(((group['Total_Community_Teams'] < t) & (group['Tier1_Count'] <= 1)) |
+                      ((group['Total_Community_Teams'] >= t) & (group['Tier1_Count'] >= 2)))
+                ]
+
+                outlier_list = []
+                for _, row in non_compliant.iterrows():
+                    # reason = "Playing Up" if row['Tier1_Count'] >= 2 else "Playing Down"
+                    outlier_list.append(f"{row['Community']} ({int(row['Total_Community_Teams'])} teams, {int(row['Tier1_Count'])} T1)")
+                best_outliers = outlier_list
+
+        season_age_thresholds[(season, age)] = best_t
+        outliers_map[(season, age)] = best_outliers
+
+        threshold_summary_data.append({
+            "Season": season,
+            "Age Category": age,
+            "Inferred Threshold": best_t,
+            "Outliers": ", ".join(best_outliers) if best_outliers else "None"
+        })
+
+    return season_age_thresholds, outliers_map, threshold_summary_data
+
+def categorize_thresholds(merged_df, season_age_thresholds):
+    """Adds the 'Threshold Category' and plot 'Label' columns to a dilution_frame."""
+    # Define Groups relative to threshold
+    def categorize_threshold(row):
+        key = (row['Season'], row['Age Category'])
+        if key not in season_age_thresholds:
+            return "Other"
+
+        threshold = int(season_age_thresholds[key])
+        size = row['Total_Community_Teams']
+        t1_count = row['Tier1_Count']
+
+        if t1_count == 1:
+            if size >= threshold - 3:
+                return "Just Below Threshold (1 Team)"
+            return "Small (1 Team)"
+        elif t1_count >= 2:
+            if size == threshold:
+                return "Just Above Threshold (Diluted)"
+            return "Large (Established)"
+        return "Other"
+
+    merged_df['Threshold Category'] = merged_df.apply(categorize_threshold, axis=1)
+
+    # --- Create Labels for Plots ---
+    # e.g. "BV-25 (U11)": community abbreviation, season end year, age
+    abbrev = merged_df['Community'].map(COMMUNITY_ABBREVIATIONS).fillna(merged_df['Community'].str[:2].str.upper())
+    season_short = merged_df['Season'].str.split('-').str[-1].str[-2:]
+    merged_df['Label'] = abbrev + "-" + season_short + " (" + merged_df['Age Category'] + ")"
+    return merged_df
+
+def cliff_frame(merged_df):
+    """Rows of the 'Dilution Cliff' chart with their jittered x positions."""
+    contrast_df = merged_df[merged_df['Threshold Category'].isin(THRESHOLD_CATEGORIES)].copy()
+
+    # Map Categories to X-values for Jittering
+    cat_map = {cat: i for i, cat in enumerate(THRESHOLD_CATEGORIES)}
+    contrast_df['X_Base'] = contrast_df['Threshold Category'].map(cat_map)
+
+    # Add Jitter (Random offset)
+    np.random.seed(42) # For consistent jitter
+    contrast_df['X_Jitter'] = contrast_df['X_Base'] + np.random.uniform(-0.2, 0.2, size=len(contrast_df))
+    return contrast_df
+
+def aggressiveness_trend(merged_df):
+    """Per Season/Community tiering aggressiveness (% of teams in Tier 1) vs. performance."""
+    # Calculate Tiering Aggressiveness for the trend chart
+    merged_df['Tiering_Aggressiveness'] = merged_df['Tier1_Count'] / merged_df['Total_Community_Teams']
+
+    # For the trend line, we aggregate by Season/Community (averaging across Age Categories if multiple selected)
+    # This gives a cleaner "Overall Community Health" view
+    trend_agg_df = merged_df.groupby(['Season', 'Community']).agg({
+        'Overall_Performance': 'mean',
+        'Tiering_Aggressiveness': 'mean',
+        'Total_Community_Teams': 'sum',
+        'Tier1_Count': 'sum'
+    }).reset_index()
+
+    trend_agg_df = trend_agg_df.sort_values('Season')
+
+    # Create short season label for the chart text
+    trend_agg_df['Season_Label'] = "'" + trend_agg_df['Season'].str.split('-').str[-1].str[-2:]
+    return trend_agg_df
+
+# --- Experiments page ---
+
+def get_tier(league_name):
+    parsed = parse_tier_info(league_name)
+    tier = parsed.get('tier', None)
+    if tier == 'AA':
+        return 0 # Treat AA as Tier 0
+    return tier
+
+def tier_distribution_frame(df, season, age, season_type, communities, index=None):
+    """Teams of the selection with a numeric Tier column (non-tiered leagues dropped)."""
+    if index is not None:
+        exp_df = select_rows(df, index, {'Season': [season], 'Age Category': [age], 'Type': [season_type], 'Community': communities})
+    else:
+        exp_df = df[
+            (df['Season'] == season) &
+            (df['Age Category'] == age) &
+            (df['Type'] == season_type) &
+            (df['Community'].isin(communities))
+        ].copy()
+
+    exp_df['Tier'] = exp_df['League'].apply(get_tier)
+    # Ensure numeric
+    exp_df['Tier'] = pd.to_numeric(exp_df['Tier'], errors='coerce')
+    return exp_df.dropna(subset=['Tier']) # Remove non-tiered leagues if any
+
+def tier_distribution_curves(exp_df, points=100):
+    """
+    Normal-curve fit of every community's tiers over a shared x range, all
+    densities evaluated in one NumPy broadcast. Returns (x_range, stats, pdf):
+    stats has one row per community (Teams, mu, std) and pdf is a
+    (len(stats), points) array whose rows follow stats; single-team
+    communities have a NaN row.
+    """
+    # Determine X range based on data
+    min_tier = int(exp_df['Tier'].min())
+    max_tier = int(exp_df['Tier'].max())
+    x_range = np.linspace(max(0, min_tier - 1), max_tier + 1, points)
+
+    grouped = exp_df.groupby('Community')['Tier']
+    stats = pd.DataFrame({'Teams': grouped.size(), 'mu': grouped.mean(), 'std': grouped.std(ddof=0)})
+    # If std is 0 (all teams in same tier), we can't plot a bell curve: use an artificial width
+    stats.loc[stats['std'] == 0, 'std'] = 0.1
+
+    mu = stats['mu'].to_numpy()[:, np.newaxis]
+    std = stats['std'].to_numpy()[:, np.newaxis]
+    pdf = (1 / (std * np.sqrt(2 * np.pi))) * np.exp(-0.5 * ((x_range[np.newaxis, :] - mu) / std) ** 2)
+    pdf[stats['Teams'].to_numpy() < 2] = np.nan
+    return x_range, stats, pdf
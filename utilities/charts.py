@@ -0,0 +1,61 @@
+import numpy as np
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+
+# Chart building for the dashboard. Traces switch to WebGL past a point count,
+# hover/label text is built with vectorized string ops, and point clouds
+# beyond a budget are downsampled (scatter) or reduced to summary statistics
+# (box plots), so charts stay responsive as seasons and communities grow.
+
+WEBGL_POINT_THRESHOLD = 1000 # SVG traces get sluggish past this many points
+MAX_POINTS_PER_TRACE = 5000 # Scatter points beyond this are downsampled
+MAX_TEXT_LABELS = 300 # Per-point text labels beyond this are unreadable anyway
+
+def use_webgl(points):
+    return points > WEBGL_POINT_THRESHOLD
+
+def scatter(x, y, **kwargs):
+    """go.Scatter, or go.Scattergl once the trace has more than WEBGL_POINT_THRESHOLD points."""
+    trace = go.Scattergl if use_webgl(len(x)) else go.Scatter
+    return trace(x=x, y=y, **kwargs)
+
+def line(df, **kwargs):
+    """px.line, rendered with WebGL for large frames."""
+    return px.line(df, render_mode='webgl' if use_webgl(len(df)) else 'auto', **kwargs)
+
+def join_text(*parts):
+    """
+    Concatenates strings and Series element-wise, e.g. hover text:
+    join_text(df['Community'], " (", df['Season'], ")").
+    """
+    text = ""
+    for part in parts:
+        text = text + (part.astype(str) if isinstance(part, pd.Series) else part)
+    return text
+
+def downsample(df, max_points=MAX_POINTS_PER_TRACE, seed=42):
+    """A reproducible random subset of at most max_points rows, in the original order."""
+    if len(df) <= max_points:
+        return df
+    return df.sample(n=max_points, random_state=seed).sort_index()
+
+def box(values, x_position, max_points=MAX_POINTS_PER_TRACE, **kwargs):
+    """
+    go.Box of values at x_position. Past max_points the quartiles and
+    1.5 IQR fences are computed here and only those are sent to the browser.
+    """
+    values = np.asarray(values, dtype=float)
+    values = values[~np.isnan(values)]
+    if len(values) <= max_points:
+        return go.Box(y=values, x=[x_position] * len(values), **kwargs)
+
+    q1, median, q3 = np.percentile(values, [25, 50, 75])
+    iqr = q3 - q1
+    return go.Box(
+        x=[x_position],
+        q1=[q1], median=[median], q3=[q3],
+        lowerfence=[values[values >= q1 - 1.5 * iqr].min()],
+        upperfence=[values[values <= q3 + 1.5 * iqr].max()],
+        **kwargs
+    )
@@ -0,0 +1,198 @@
+import json
+import os
+import threading
+import time
+from collections import defaultdict
+
+METRICS_DIR = os.path.join("data", "metrics")
+
+class EventBus:
+    """
+    Structured event stream for sync runs. `emit(type, **fields)` stamps the
+    event with a timestamp and thread name and hands it to every attached sink.
+
+    Event types emitted by the scraper:
+      phase            pct, message
+      tasks_planned    group, count
+      task_started     group, name
+      task_finished    group, name, seconds, ok
+      http             host, method, url, bytes, seconds, cache ('miss', 'not_modified', 'archive')
+      parse            kind, bytes, seconds, cache ('hit', 'miss')
+      metadata         key, cache ('hit', 'miss')
+      standings_saved  league, season, rows, status ('changed', 'unchanged')
+    """
+
+    def __init__(self):
+        self._sinks = [] # [sink, lock, attached] per sink
+        self._lock = threading.Lock()
+
+    def add_sink(self, sink):
+        with self._lock:
+            self._sinks = self._sinks + [[sink, threading.Lock(), True]]
+
+    def remove_sink(self, sink):
+        with self._lock:
+            removed = [entry for entry in self._sinks if entry[0] is sink]
+            self._sinks = [entry for entry in self._sinks if entry[0] is not sink]
+        for entry in removed:
+            # Waits for a handle() in progress; later emits skip the sink
+            with entry[1]:
+                entry[2] = False
+
+    def emit(self, event_type, **fields):
+        # The bus lock only guards the sink list: sinks run outside it, each
+        # under its own lock, so a slow sink does not stall every thread's emit
+        sinks = self._sinks
+        if not sinks:
+            return
+        event = {'type': event_type, 'ts': time.time(), 'thread': threading.current_thread().name}
+        event.update(fields)
+        for entry in sinks:
+            sink, lock, _ = entry
+            with lock:
+                if not entry[2]:
+                    continue
+                try:
+                    sink.handle(event)
+                except Exception as e:
+                    print(f"Event sink {type(sink).__name__} failed: {e}")
+
+class JsonLinesSink:
+    """Writes every event as one JSON object per line (mode 'a' keeps earlier runs)."""
+
+    def __init__(self, path=os.path.join(METRICS_DIR, "sync_events.jsonl"), mode='w'):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._file = open(path, mode)
+
+    def handle(self, event):
+        self._file.write(json.dumps(event, default=str) + "\n")
+
+    def close(self):
+        self._file.close()
+
+class PrometheusSink:
+    """
+    Aggregates events into counters and summaries and writes them in the
+    Prometheus text exposition format (for the node_exporter textfile collector).
+    """
+
+    def __init__(self, path=os.path.join(METRICS_DIR, "sync_metrics.prom")):
+        self.path = path
+        self.counters = defaultdict(float) # (metric, labels) -> value
+        self.started = time.time()
+
+    def _inc(self, metric, labels, value=1):
+        self.counters[(metric, tuple(sorted(labels.items())))] += value
+
+    def handle(self, event):
+        kind = event['type']
+        if kind == 'http':
+            labels = {'host': event['host'], 'cache': event['cache']}
+            self._inc('hc_sync_http_requests_total', labels)
+            self._inc('hc_sync_http_bytes_total', {'host': event['host']}, event['bytes'])
+            self._inc('hc_sync_http_seconds_sum', {'host': event['host']}, event['seconds'])
+            self._inc('hc_sync_http_seconds_count', {'host': event['host']})
+        elif kind == 'parse':
+            self._inc('hc_sync_parse_total', {'kind': event['kind'], 'cache': event['cache']})
+            self._inc('hc_sync_parse_seconds_sum', {'kind': event['kind']}, event['seconds'])
+            self._inc('hc_sync_parse_seconds_count', {'kind': event['kind']})
+        elif kind == 'metadata':
+            self._inc('hc_sync_metadata_lookups_total', {'cache': event['cache']})
+        elif kind == 'standings_saved':
+            self._inc('hc_sync_tables_total', {'status': event['status']})
+            if event['status'] == 'changed':
+                self._inc('hc_sync_rows_written_total', {}, event['rows'])
+        elif kind == 'task_finished':
+            status = 'ok' if event['ok'] else 'error'
+            self._inc('hc_sync_tasks_total', {'group': event['group'], 'status': status})
+            self._inc('hc_sync_task_seconds_sum', {'group': event['group']}, event['seconds'])
+            self._inc('hc_sync_task_seconds_count', {'group': event['group']})
+
+    def render(self):
+        lines = []
+        seen = set()
+        for (metric, labels), value in sorted(self.counters.items()):
+            # hc_x_seconds_sum / hc_x_seconds_count are the series of summary hc_x_seconds
+            family, metric_type = metric, 'counter'
+            if metric.endswith(('_seconds_sum', '_seconds_count')):
+                family, metric_type = metric.rsplit('_', 1)[0], 'summary'
+            if family not in seen:
+                lines.append(f"# TYPE {family} {metric_type}")
+                seen.add(family)
+            label_text = ",".join(f'{k}="{v}"' for k, v in labels)
+            lines.append(f"{metric}{{{label_text}}} {value:g}" if label_text else f"{metric} {value:g}")
+        lines.append("# TYPE hc_sync_duration_seconds gauge")
+        lines.append(f"hc_sync_duration_seconds {time.time() - self.started:.3f}")
+        lines.append("# TYPE hc_sync_last_run_timestamp_seconds gauge")
+        lines.append(f"hc_sync_last_run_timestamp_seconds {time.time():.0f}")
+        return "\n".join(lines) + "\n"
+
+    def close(self):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w') as f:
+            f.write(self.render())
+        os.replace(tmp_path, self.path)
+
+# Progress bar share of each planned task group; phases in between (see
+# scraper._sync_sources) sit at the range boundaries
+TASK_PCT_RANGES = {
+    'leagues': (20, 85),
+    'tournaments': (85, 99),
+}
+DEFAULT_TASK_PCT_RANGE = (20, 90)
+PROGRESS_MIN_INTERVAL = 0.5 # seconds between task progress callbacks (jobs.py writes each to the DB)
+
+class ProgressSink:
+    """
+    Drives a `callback(pct, message)` progress display from the event stream:
+    phases set the percentage directly; within a planned task group the
+    percentage (over the group's range in `task_pct_ranges`), throughput,
+    downloaded volume and ETA come from task events. Task progress is
+    reported at most every `min_interval` seconds, plus the group's last task.
+    """
+
+    def __init__(self, callback, task_pct_ranges=None, min_interval=PROGRESS_MIN_INTERVAL):
+        self.callback = callback
+        self.min_interval = min_interval
+        self.last_report = 0.0
+        self.task_pct_ranges = TASK_PCT_RANGES if task_pct_ranges is None else task_pct_ranges
+        self.group = None
+        self.total = 0
+        self.done = 0
+        self.group_started = None
+        self.bytes = 0
+
+    def handle(self, event):
+        kind = event['type']
+        if kind == 'phase':
+            self.callback(event['pct'], event['message'])
+        elif kind == 'http':
+            self.bytes += event['bytes']
+        elif kind == 'tasks_planned':
+            self.group = event['group']
+            self.total = event['count']
+            self.done = 0
+            self.group_started = event['ts']
+        elif kind == 'task_finished' and event['group'] == self.group and self.total:
+            self.done += 1
+            if self.done < self.total and event['ts'] - self.last_report < self.min_interval:
+                return
+            self.last_report = event['ts']
+            elapsed = max(event['ts'] - self.group_started, 1e-6)
+            rate = self.done / elapsed
+            eta = (self.total - self.done) / rate if rate else 0
+            low, high = self.task_pct_ranges.get(self.group, DEFAULT_TASK_PCT_RANGE)
+            pct = low + int((self.done / self.total) * (high - low))
+            self.callback(pct, (
+                f"Processed {self.done}/{self.total} {self.group} "
+                f"({rate * 60:.0f}/min, {self.bytes / 2**20:.1f} MiB, ETA {int(eta // 60)}m{int(eta % 60):02d}s)"
+            ))
+
+    def close(self):
+        pass
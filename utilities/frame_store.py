@@ -0,0 +1,133 @@
+import os
+import sys
+import threading
+from collections import OrderedDict
+import numpy as np
+import pandas as pd
+
+# Process-wide store for the dashboard's analytic frame and the aggregates
+# derived from it, shared by every Streamlit session (app.py keeps one in
+# st.cache_resource). st.cache_data hands each caller its own unpickled copy,
+# so memory grew with the number of sessions; here the data is held once and
+# sessions get shallow copies that share it. pandas' copy-on-write keeps
+# those views from writing through: a session adding a column or assigning
+# into its view gets its own copy of just that data. Copy-on-write is always
+# on from pandas 3 (requirements.txt); older versions must opt in, or writes
+# to a view would change the frame every other session sees.
+if int(pd.__version__.split('.')[0]) < 3:
+    pd.options.mode.copy_on_write = True
+
+FRAME_STORE_BUDGET_MB = float(os.environ.get("HC_FRAME_STORE_MB", "1024"))
+
+def _nbytes(value):
+    """Approximate memory held by a stored value."""
+    if isinstance(value, (pd.DataFrame, pd.Series, pd.Index)):
+        usage = value.memory_usage(deep=True)
+        return int(usage.sum() if isinstance(usage, pd.Series) else usage)
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, (tuple, list)):
+        return sys.getsizeof(value) + sum(_nbytes(v) for v in value)
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(_nbytes(k) + _nbytes(v) for k, v in value.items())
+    return sys.getsizeof(value)
+
+def _freeze(value):
+    """Marks arrays read-only before they are shared."""
+    if isinstance(value, np.ndarray):
+        value.setflags(write=False)
+    elif isinstance(value, (tuple, list)):
+        for v in value:
+            _freeze(v)
+    return value
+
+def _view(value):
+    """What a session gets: frames as shallow copies, everything else as is."""
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        return value.copy(deep=False)
+    if isinstance(value, tuple):
+        return tuple(_view(v) for v in value)
+    return value
+
+class FrameStore:
+    """
+    The analytic frame plus named aggregates of it, valid for one DB change
+    stamp. A new stamp drops everything and reloads the frame on first use;
+    aggregates are evicted least recently used once the store is over its
+    memory budget. Thread-safe: sessions run in the server's threads.
+    """
+
+    def __init__(self, loader, budget_mb=None):
+        self.loader = loader
+        self.budget_bytes = (FRAME_STORE_BUDGET_MB if budget_mb is None else budget_mb) * 2**20
+        self._lock = threading.Lock()
+        self._stamp = None
+        self._frame = None
+        self._frame_bytes = 0
+        self._entries = OrderedDict() # key -> (value, nbytes)
+        self._entries_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _refresh(self, stamp):
+        # Caller holds the lock
+        if self._frame is not None and stamp == self._stamp:
+            return
+        self._entries.clear()
+        self._entries_bytes = 0
+        self._frame = None
+        frame = self.loader()
+        self._frame, self._frame_bytes, self._stamp = frame, _nbytes(frame), stamp
+
+    def _evict(self):
+        while self._entries and self._frame_bytes + self._entries_bytes > self.budget_bytes:
+            _, (_, nbytes) = self._entries.popitem(last=False)
+            self._entries_bytes -= nbytes
+            self.evictions += 1
+
+    def frame(self, stamp):
+        """The analytic frame for `stamp`, loading it if the DB changed."""
+        with self._lock:
+            self._refresh(stamp)
+            return _view(self._frame)
+
+    def get(self, stamp, key, compute):
+        """
+        The aggregate stored under `key`, or compute(frame) stored there.
+        compute runs outside the lock (it may call get itself), so two
+        sessions can race to build the same entry; the first one is kept.
+        """
+        with self._lock:
+            self._refresh(stamp)
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return _view(self._entries[key][0])
+            self.misses += 1
+            frame = _view(self._frame)
+
+        value = _freeze(compute(frame))
+        nbytes = _nbytes(value)
+        with self._lock:
+            # Dropped if the DB changed while computing
+            if stamp == self._stamp:
+                if key in self._entries:
+                    value = self._entries[key][0]
+                else:
+                    self._entries[key] = (value, nbytes)
+                    self._entries_bytes += nbytes
+                    self._evict()
+        return _view(value)
+
+    def stats(self):
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'frame_mb': self._frame_bytes / 2**20,
+                'total_mb': (self._frame_bytes + self._entries_bytes) / 2**20,
+                'budget_mb': self.budget_bytes / 2**20,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+            }
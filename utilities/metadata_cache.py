@@ -0,0 +1,87 @@
+import json
+import os
+import threading
+import time
+
+METADATA_CACHE_FILE = os.path.join("data", "cache", "metadata_cache.json")
+METADATA_TTL = 12 * 60 * 60 # 12 hours
+
+class MetadataCache:
+    """
+    Thread-safe cache of discovery metadata (association ids, season options,
+    game-type options) keyed per association/division.
+
+    Entries are fetched at most once per run and persisted to disk so later
+    runs can reuse them until they are older than `ttl` seconds.
+    """
+
+    def __init__(self, path=METADATA_CACHE_FILE, ttl=METADATA_TTL):
+        self.path = path
+        self.ttl = ttl
+        self._entries = {}
+        self._lock = threading.Lock()
+        self._key_locks = {}
+        self.load()
+
+    def load(self):
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, 'r') as f:
+                entries = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Could not read metadata cache {self.path}: {e}")
+            return
+        now = time.time()
+        with self._lock:
+            for key, entry in entries.items():
+                if now - entry.get('fetched_at', 0) < self.ttl:
+                    self._entries[key] = entry
+
+    def save(self):
+        with self._lock:
+            entries = dict(self._entries)
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(self.path, 'w') as f:
+            json.dump(entries, f, indent=4)
+
+    def clear(self, remove_file=True):
+        with self._lock:
+            self._entries.clear()
+        if remove_file and os.path.exists(self.path):
+            os.remove(self.path)
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry and time.time() - entry['fetched_at'] < self.ttl:
+            return entry['value']
+        return None
+
+    def set(self, key, value):
+        with self._lock:
+            self._entries[key] = {'fetched_at': time.time(), 'value': value}
+
+    def get_or_fetch(self, key, fetcher):
+        """
+        Returns the cached value for `key`, calling `fetcher()` on a miss.
+        Concurrent callers for the same key wait for a single fetch.
+        Failed fetches (None) are not cached.
+        """
+        value = self.get(key)
+        if value is not None:
+            return value
+
+        with self._lock:
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+
+        with key_lock:
+            value = self.get(key)
+            if value is not None:
+                return value
+            value = fetcher()
+            if value is not None:
+                self.set(key, value)
+            return value
@@ -0,0 +1,94 @@
+import gzip
+import hashlib
+import json
+import os
+import threading
+import time
+
+ARCHIVE_DIR = os.path.join("data", "archive")
+
+class PageArchive:
+    """
+    Compressed, content-addressed archive of every fetched page and API body.
+
+    Bodies are stored once per content hash as gzip files under
+    `objects/<hash[:2]>/<hash>.gz`. `index.jsonl` records each fetch whose
+    body differs from the request's previous one (method, URL, POST payload,
+    fetch time, content hash), so the latest body for any request can be
+    replayed without network access.
+    """
+
+    def __init__(self, root=ARCHIVE_DIR):
+        self.root = root
+        self.index_path = os.path.join(root, "index.jsonl")
+        self._latest = {} # request key -> index record
+        self._lock = threading.Lock()
+        self._load_index()
+
+    @staticmethod
+    def request_key(method, url, data=None):
+        key = f"{method.upper()} {url}"
+        if data:
+            key += " " + json.dumps(data, sort_keys=True)
+        return key
+
+    def _object_path(self, sha256):
+        return os.path.join(self.root, "objects", sha256[:2], f"{sha256}.gz")
+
+    def _load_index(self):
+        if not os.path.exists(self.index_path):
+            return
+        with open(self.index_path, 'r') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue # Partially written line
+                key = self.request_key(record['method'], record['url'], record.get('data'))
+                self._latest[key] = record
+
+    def store(self, method, url, content, data=None):
+        sha256 = hashlib.sha256(content).hexdigest()
+        path = self._object_path(sha256)
+        record = {
+            'method': method.upper(),
+            'url': url,
+            'data': data,
+            'fetched_at': time.time(),
+            'sha256': sha256,
+            'size': len(content)
+        }
+        key = self.request_key(method, url, data)
+        with self._lock:
+            latest = self._latest.get(key)
+            if latest and latest['sha256'] == sha256:
+                return sha256 # Unchanged since the last fetch: nothing new to record
+            if not os.path.exists(path):
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                tmp_path = f"{path}.tmp"
+                with gzip.open(tmp_path, 'wb') as f:
+                    f.write(content)
+                os.replace(tmp_path, path)
+            with open(self.index_path, 'a') as f:
+                f.write(json.dumps(record) + "\n")
+            self._latest[key] = record
+        return sha256
+
+    def latest_record(self, method, url, data=None):
+        with self._lock:
+            return self._latest.get(self.request_key(method, url, data))
+
+    def latest(self, method, url, data=None):
+        """Returns the most recently archived body for a request, or None."""
+        record = self.latest_record(method, url, data)
+        if not record:
+            return None
+        with gzip.open(self._object_path(record['sha256']), 'rb') as f:
+            return f.read()
+
+    def __len__(self):
+        with self._lock:
+            return len(self._latest)
@@ -0,0 +1,97 @@
+import os
+from bs4 import BeautifulSoup, SoupStrainer, Tag
+
+try:
+    import lxml
+    HAS_LXML = True
+except ImportError:
+    HAS_LXML = False
+
+# BeautifulSoup tree builder used for every fetched page.
+# Override with HC_HTML_PARSER (e.g. "html.parser", "lxml", "html5lib").
+HTML_PARSER = os.environ.get('HC_HTML_PARSER') or ('lxml' if HAS_LXML else 'html.parser')
+
+HEADER_TAGS = ['h1', 'h2', 'h3', 'h4', 'h5']
+
+# Partial parsing for the known page types: only these tags (and their
+# contents) are built into the tree.
+PAGE_STRAINERS = {
+    'links': SoupStrainer('a'),
+    'divisions': SoupStrainer(HEADER_TAGS + ['div', 'a']),
+    'selects': SoupStrainer('select'),
+    'metadata': SoupStrainer(['select', 'script']),
+    'standings': SoupStrainer('table'),
+}
+
+def make_soup(content, page_type=None, parser=None):
+    """
+    Parses `content` with the configured backend. `page_type` selects a
+    PAGE_STRAINERS entry to limit parsing to the tags that page needs;
+    None parses the whole document.
+    """
+    parse_only = PAGE_STRAINERS[page_type] if page_type else None
+    return BeautifulSoup(content, parser or HTML_PARSER, parse_only=parse_only)
+
+def is_division_header(text):
+    return bool(text) and len(text) < 50 and 'Games' not in text
+
+# Tags that make a div a container rather than a division header
+DIVISION_BLOCK_TAGS = set(HEADER_TAGS + ['a', 'div', 'table', 'ul', 'ol'])
+DIVISION_HEADER_MAX_CHARS = 50
+DIVISION_INDEX_TAGS = set(HEADER_TAGS + ['div', 'a'])
+
+def _div_header_text(div):
+    """
+    The text of a div that is only a label (no links or block children)
+    and short enough for is_division_header, else None. Stops reading at
+    the first block child or once the text is too long, so container divs
+    cost a few nodes each.
+    """
+    parts = []
+    length = 0
+    for node in div.descendants:
+        if isinstance(node, Tag):
+            if node.name in DIVISION_BLOCK_TAGS:
+                return None
+            continue
+        text = node.strip()
+        if text:
+            parts.append(text)
+            length += len(text)
+            if length >= DIVISION_HEADER_MAX_CHARS:
+                return None
+    return "".join(parts)
+
+def is_standings_link(a):
+    return 'Standings' in a.get_text() or 'standings' in a['href']
+
+def index_division_links(soup, match_link):
+    """
+    Maps RAMP division standings links to their division names in a single
+    ordered pass over the document.
+
+    Headers (h1-h5) and label divs are visited in document order with the
+    links; each link accepted by `match_link(a)` is paired with the most
+    recent qualifying header before it ("Games" notes and long divs are
+    skipped).
+
+    Returns: [(a_tag, name|None)] in document order.
+    """
+    results = []
+    current_name = None
+    for tag in soup.descendants:
+        # A plain walk: find_all's per-tag filter matching dominated the pass
+        if not isinstance(tag, Tag) or tag.name not in DIVISION_INDEX_TAGS:
+            continue
+        if tag.name == 'a':
+            if tag.get('href') and match_link(tag):
+                results.append((tag, current_name))
+            continue
+        text = _div_header_text(tag) if tag.name == 'div' else tag.get_text(strip=True)
+        if is_division_header(text):
+            current_name = text
+    return results
+
+def division_slug(href):
+    # href is like /division/3300/30084/standings -> 3300/30084
+    return href.replace('/division/', '').replace('/standings', '')
@@ -0,0 +1,154 @@
+import cProfile
+import functools
+import json
+import os
+import pstats
+import threading
+import time
+from contextlib import contextmanager
+
+PROFILE_DIR = os.path.join("data", "profiles")
+
+class StageProfiler:
+    """
+    Opt-in timing spans for a sync run.
+
+    `instrument(module, names)` temporarily replaces the named module-level
+    functions with wrappers that record a span (stage, thread, start, end)
+    per call. Because the scraper calls its helpers through module globals,
+    this covers nested calls too; stage totals are therefore inclusive
+    (get_soup includes its fetch_content/http_request time).
+
+    With `cprofile=True`, each thread's work also runs under its own
+    cProfile.Profile (see `profile_thread`) and the stats are merged at the end.
+    """
+
+    def __init__(self, cprofile=False):
+        self.cprofile = cprofile
+        self.spans = [] # (stage, thread ident, start, end)
+        self.thread_names = {}
+        self.started = time.perf_counter()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._profiles = []
+
+    def wrap(self, stage, func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                end = time.perf_counter()
+                thread = threading.current_thread()
+                with self._lock:
+                    self.spans.append((stage, thread.ident, start, end))
+                    self.thread_names.setdefault(thread.ident, thread.name)
+        return wrapper
+
+    @contextmanager
+    def instrument(self, module, names):
+        originals = {name: getattr(module, name) for name in names}
+        for name, func in originals.items():
+            setattr(module, name, self.wrap(name, func))
+        try:
+            yield self
+        finally:
+            for name, func in originals.items():
+                setattr(module, name, func)
+
+    @contextmanager
+    def profile_thread(self):
+        """Runs the enclosed block under this thread's cProfile profile (no-op unless cprofile)."""
+        if not self.cprofile or getattr(self._local, 'active', False):
+            yield
+            return
+        profile = getattr(self._local, 'profile', None)
+        if profile is None:
+            profile = self._local.profile = cProfile.Profile()
+            with self._lock:
+                self._profiles.append(profile)
+        self._local.active = True
+        profile.enable()
+        try:
+            yield
+        finally:
+            profile.disable()
+            self._local.active = False
+
+    def summary(self):
+        """Per-stage rows sorted by total time: stage, calls, total, mean, p95, max (seconds)."""
+        durations = {}
+        with self._lock:
+            for stage, _, start, end in self.spans:
+                durations.setdefault(stage, []).append(end - start)
+        rows = []
+        for stage, values in durations.items():
+            values.sort()
+            total = sum(values)
+            rows.append({
+                'stage': stage,
+                'calls': len(values),
+                'total': total,
+                'mean': total / len(values),
+                'p95': values[min(len(values) - 1, int(len(values) * 0.95))],
+                'max': values[-1]
+            })
+        return sorted(rows, key=lambda r: r['total'], reverse=True)
+
+    def format_summary(self):
+        wall = time.perf_counter() - self.started
+        lines = [
+            f"Wall time: {wall:.2f}s, {len(self.thread_names)} thread(s)",
+            f"{'stage':<26}{'calls':>8}{'total s':>10}{'mean ms':>10}{'p95 ms':>10}{'max ms':>10}"
+        ]
+        for row in self.summary():
+            lines.append(
+                f"{row['stage']:<26}{row['calls']:>8}{row['total']:>10.2f}"
+                f"{row['mean'] * 1000:>10.1f}{row['p95'] * 1000:>10.1f}{row['max'] * 1000:>10.1f}"
+            )
+        return "\n".join(lines)
+
+    def chrome_trace(self):
+        """Trace Event Format dict (open in chrome://tracing or Perfetto), one track per thread."""
+        pid = os.getpid()
+        with self._lock:
+            spans = list(self.spans)
+            thread_names = dict(self.thread_names)
+        trace = [
+            {'name': 'thread_name', 'ph': 'M', 'pid': pid, 'tid': tid, 'args': {'name': name}}
+            for tid, name in thread_names.items()
+        ]
+        for stage, tid, start, end in spans:
+            trace.append({
+                'name': stage,
+                'cat': 'sync',
+                'ph': 'X',
+                'pid': pid,
+                'tid': tid,
+                'ts': (start - self.started) * 1e6,
+                'dur': (end - start) * 1e6
+            })
+        return {'traceEvents': trace, 'displayTimeUnit': 'ms'}
+
+    def write(self, directory=None):
+        """Writes summary.txt, trace.json and (with cprofile) sync.pstats. Returns the directory."""
+        if directory is None:
+            base = os.path.join(PROFILE_DIR, time.strftime("%Y%m%d-%H%M%S"))
+            directory, n = base, 1
+            while os.path.exists(directory):
+                n += 1
+                directory = f"{base}-{n}"
+        os.makedirs(directory, exist_ok=True)
+        with open(os.path.join(directory, "summary.txt"), 'w') as f:
+            f.write(self.format_summary() + "\n")
+        with open(os.path.join(directory, "trace.json"), 'w') as f:
+            json.dump(self.chrome_trace(), f)
+        with self._lock:
+            profiles = list(self._profiles)
+        if profiles:
+            stats = pstats.Stats(profiles[0])
+            for profile in profiles[1:]:
+                stats.add(profile)
+            stats.dump_stats(os.path.join(directory, "sync.pstats"))
+        return directory
@@ -0,0 +1,135 @@
+import json
+import os
+import random
+import re
+import threading
+import time
+from sqlalchemy import event
+
+SLOW_QUERY_SECONDS = float(os.environ.get("HC_SLOW_QUERY_MS", "100")) / 1000
+SLOW_QUERY_LOG = os.path.join("data", "metrics", "slow_queries.log")
+SYNC_SQL_SUMMARY = os.path.join("data", "metrics", "sync_sql_summary.json")
+SLOW_QUERY_PARAMS_CHARS = 300 # executemany batches can carry thousands of parameter sets
+QUERY_SAMPLE_SIZE = 1000 # durations kept per statement for the percentiles
+
+STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+IN_LIST = re.compile(r"\bIN\s*\((?:\s*\?\s*,)*\s*\?\s*\)", re.IGNORECASE)
+WHITESPACE = re.compile(r"\s+")
+
+def normalize_sql(statement):
+    """
+    Collapses a statement to its shape, so executions that differ only in
+    parameters aggregate together: literals become ?, IN lists become
+    IN (?...), whitespace is collapsed.
+    """
+    sql = STRING_LITERAL.sub("?", statement)
+    sql = NUMBER_LITERAL.sub("?", sql)
+    sql = WHITESPACE.sub(" ", sql).strip()
+    return IN_LIST.sub("IN (?...)", sql)
+
+class QueryStats:
+    """
+    Times every statement run on the attached engines (SQLAlchemy
+    before/after_cursor_execute events) and aggregates durations by
+    normalized SQL: count, total and max are exact, p50/p95 come from a
+    fixed-size reservoir sample, so memory stays bounded in long-lived
+    processes. Statements slower than `slow_seconds` are printed and
+    appended to the slow-query log.
+    """
+
+    def __init__(self, slow_seconds=SLOW_QUERY_SECONDS, slow_log=SLOW_QUERY_LOG):
+        self.slow_seconds = slow_seconds
+        self.slow_log = slow_log
+        self._stats = {} # normalized SQL -> [count, total, max, sample]
+        self._lock = threading.Lock()
+        self._random = random.Random()
+        self.started = time.time()
+
+    def attach(self, engine):
+        event.listen(engine, "before_cursor_execute", self._before)
+        event.listen(engine, "after_cursor_execute", self._after)
+
+    def _before(self, conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault('query_start', []).append(time.perf_counter())
+
+    def _after(self, conn, cursor, statement, parameters, context, executemany):
+        starts = conn.info.get('query_start')
+        if not starts:
+            return
+        elapsed = time.perf_counter() - starts.pop()
+        key = normalize_sql(statement)
+        with self._lock:
+            stats = self._stats.get(key)
+            if stats is None:
+                stats = self._stats[key] = [0, 0.0, 0.0, []]
+            stats[0] += 1
+            stats[1] += elapsed
+            stats[2] = max(stats[2], elapsed)
+            sample = stats[3]
+            if len(sample) < QUERY_SAMPLE_SIZE:
+                sample.append(elapsed)
+            else:
+                # Reservoir sampling: every execution is kept with equal probability
+                slot = self._random.randrange(stats[0])
+                if slot < QUERY_SAMPLE_SIZE:
+                    sample[slot] = elapsed
+        if elapsed >= self.slow_seconds:
+            self._log_slow(statement, parameters, elapsed)
+
+    def _log_slow(self, statement, parameters, elapsed):
+        params = repr(parameters)
+        if len(params) > SLOW_QUERY_PARAMS_CHARS:
+            params = params[:SLOW_QUERY_PARAMS_CHARS] + f"... ({len(params)} chars)"
+        line = f"{time.strftime('%Y-%m-%d %H:%M:%S')} {elapsed * 1000:.1f}ms {WHITESPACE.sub(' ', statement).strip()} {params}"
+        print(f"Slow query: {line}")
+        try:
+            directory = os.path.dirname(self.slow_log)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with open(self.slow_log, 'a') as f:
+                f.write(line + "\n")
+        except OSError:
+            pass
+
+    def reset(self):
+        with self._lock:
+            self._stats.clear()
+        self.started = time.time()
+
+    def summary(self):
+        """Rows sorted by total time: sql, count, total, p50, p95, max (seconds)."""
+        with self._lock:
+            stats = {sql: (count, total, longest, sorted(sample)) for sql, (count, total, longest, sample) in self._stats.items()}
+        rows = []
+        for sql, (count, total, longest, sample) in stats.items():
+            rows.append({
+                'sql': sql,
+                'count': count,
+                'total': total,
+                'p50': sample[len(sample) // 2],
+                'p95': sample[min(len(sample) - 1, int(len(sample) * 0.95))],
+                'max': longest
+            })
+        return sorted(rows, key=lambda r: r['total'], reverse=True)
+
+    def format_summary(self, limit=15, width=90):
+        rows = self.summary()
+        total_count = sum(r['count'] for r in rows)
+        total_time = sum(r['total'] for r in rows)
+        lines = [
+            f"SQL: {total_count} statements, {total_time:.2f}s total, {len(rows)} distinct",
+            f"{'count':>8}{'total s':>10}{'p50 ms':>9}{'p95 ms':>9}  sql"
+        ]
+        for row in rows[:limit]:
+            sql = row['sql'] if len(row['sql']) <= width else row['sql'][:width - 3] + "..."
+            lines.append(f"{row['count']:>8}{row['total']:>10.2f}{row['p50'] * 1000:>9.2f}{row['p95'] * 1000:>9.2f}  {sql}")
+        return "\n".join(lines)
+
+    def write_summary(self, path=SYNC_SQL_SUMMARY):
+        """Writes the summary as JSON (read back by the dashboard's admin panel)."""
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, 'w') as f:
+            json.dump({'started': self.started, 'finished': time.time(), 'queries': self.summary()}, f, indent=1)
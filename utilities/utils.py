@@ -1,6 +1,9 @@
 import re
 import json
 import os
+import functools
+import threading
+import time
 
 MAP_FILE = "community_map.json"
 
@@ -26,93 +29,140 @@ def load_community_map():
     return {}
 
 def save_community_map(mapping):
+    global _normalizer_checked
     with open(MAP_FILE, 'w') as f:
         json.dump(mapping, f, indent=4)
+    _normalizer_checked = None # Pick up the new map on the next lookup
 
-def normalize_community_name(team_name, mapping=None):
+# Known Community Mappings (Order matters for overlapping names)
+# Based on user feedback and common Calgary associations
+KNOWN_COMMUNITY_MAP = {
+    "GHC": "Girls Hockey Calgary",
+    "GIRLS HOCKEY CALGARY": "Girls Hockey Calgary",
+    "CBHA": "CBHA",
+    "GLENLAKE": "Glenlake",
+    "BOW VALLEY": "Bow Valley",
+    "BOW RIVER": "Bow River",
+    "BRUINS": "Bow River", 
+    "SPRINGBANK": "Springbank",
+    "CROWFOOT": "Crowfoot",
+    "TRAILS WEST": "Trails West",
+    "SIMONS VALLEY": "Simons Valley",
+    "SOUTH WEST": "Southwest",
+    "SOUTHWEST": "Southwest",
+    "BLACKFOOT": "Blackfoot",
+    "MCKNIGHT": "McKnight",
+    "MUSTANGS": "McKnight",
+    "MIDNAPORE": "Midnapore",
+    "MAVERICKS": "Midnapore",
+    "LAKE BONAVISTA": "Lake Bonavista",
+    "NORTH WEST": "North West",
+    "NORTHWEST": "North West",
+    "NWCAA": "North West",
+    "WARRIORS": "North West",
+    "CALGARY NORTHSTARS": "Calgary Northstars",
+    "CNHA": "Calgary Northstars",
+    "CALGARY ROYALS": "Calgary Royals",
+    "CRAA": "Calgary Royals",
+    "KNIGHTS": "Knights",
+    "WOLVERINES": "Wolverines",
+    "RAIDERS": "Raiders"
+}
+
+# Trailing colors (common ones)
+TEAM_COLORS = [
+    'Red', 'Blue', 'White', 'Black', 'Gold', 'Silver', 'Green', 'Yellow', 
+    'Grey', 'Gray', 'Orange', 'Teal', 'Navy', 'Maroon', 'Purple', 'Pink', 
+    'Lime', 'Cyan', 'Magenta', 'Brown', 'Beige', 'Royal', 'Sky'
+]
+
+# Zero-width lookahead so overlapping keywords are all found; at each position the
+# alternation tries keywords in KNOWN_COMMUNITY_MAP order.
+KEYWORD_PATTERN = re.compile('(?=(' + '|'.join(re.escape(k) for k in KNOWN_COMMUNITY_MAP) + '))')
+KEYWORD_PRIORITY = {key: i for i, key in enumerate(KNOWN_COMMUNITY_MAP)}
+
+AGE_PREFIX_PATTERN = re.compile(r'^U\d+\s+', re.IGNORECASE)
+# "<name> [number] [color] [number]" -> "<name>"
+SUFFIX_PATTERN = re.compile(
+    r'(?:\s+\d+)?(?:\s+\b(?:' + '|'.join(re.escape(c) for c in TEAM_COLORS) + r'))?(?:\s+\d+)?$',
+    re.IGNORECASE
+)
+
+class CommunityNormalizer:
+    """
+    Compiled team name -> community normalizer with an LRU cache of results.
+    `mapping` holds exact team name overrides (community_map.json).
+    """
+
+    def __init__(self, mapping=None, cache_size=8192):
+        self.mapping = mapping or {}
+        self.normalize = functools.lru_cache(maxsize=cache_size)(self._normalize)
+        self.guess = functools.lru_cache(maxsize=cache_size)(self._guess)
+
+    def _normalize(self, team_name):
+        # Check if exact match in mapping
+        if team_name in self.mapping:
+            return self.mapping[team_name]
+        return self.guess(team_name)
+
+    def _guess(self, team_name):
+        # Earliest keyword in KNOWN_COMMUNITY_MAP order wins
+        keywords = [m.group(1) for m in KEYWORD_PATTERN.finditer(team_name.upper())]
+        if keywords:
+            normalized_name = KNOWN_COMMUNITY_MAP[min(keywords, key=KEYWORD_PRIORITY.__getitem__)]
+            if normalized_name in ALLOWED_COMMUNITIES:
+                return normalized_name
+            return None # Filter out unwanted communities
+
+        # Heuristic: Remove age prefix, trailing numbers and colors
+        # e.g. "Bow Valley 1" -> "Bow Valley"
+        # "Trails West 5 Red" -> "Trails West"
+        base_name = AGE_PREFIX_PATTERN.sub('', team_name)
+        final_name = SUFFIX_PATTERN.sub('', base_name, count=1).strip()
+        if final_name in ALLOWED_COMMUNITIES:
+            return final_name
+            
+        return None
+
+# community_map.json is stat'ed at most once per MAP_CHECK_SECONDS, so a
+# lookup between checks is a plain LRU hit. save_community_map forces a
+# check on the next lookup.
+MAP_CHECK_SECONDS = 2.0
+
+_normalizer = None
+_normalizer_mtime = None
+_normalizer_checked = None
+_normalizer_lock = threading.Lock()
+
+def get_community_normalizer():
+    """
+    Returns the shared normalizer for MAP_FILE, rebuilt (and its cache dropped)
+    when the file's mtime has changed. Callers normalizing a batch of names
+    should get it once and use it for the whole batch.
+    """
+    global _normalizer, _normalizer_mtime, _normalizer_checked
+    now = time.monotonic()
+    if _normalizer is not None and _normalizer_checked is not None and now - _normalizer_checked < MAP_CHECK_SECONDS:
+        return _normalizer
+    mtime = os.path.getmtime(MAP_FILE) if os.path.exists(MAP_FILE) else None
+    with _normalizer_lock:
+        if _normalizer is None or mtime != _normalizer_mtime:
+            _normalizer = CommunityNormalizer(load_community_map())
+            _normalizer_mtime = mtime
+        _normalizer_checked = now
+        return _normalizer
+
+def normalize_community_name(team_name, mapping=None, normalizer=None):
+    """
+    `mapping` overrides the map file for exact team names; `normalizer`
+    (from get_community_normalizer) skips the shared lookup.
+    """
+    normalizer = normalizer or get_community_normalizer()
     if mapping is None:
-        mapping = load_community_map()
+        return normalizer.normalize(team_name)
     
     # Check if exact match in mapping
     if team_name in mapping:
         return mapping[team_name]
-        
-    name_upper = team_name.upper()
-    
-    # Known Community Mappings (Order matters for overlapping names)
-    # Based on user feedback and common Calgary associations
-    known_map = {
-        "GHC": "Girls Hockey Calgary",
-        "GIRLS HOCKEY CALGARY": "Girls Hockey Calgary",
-        "CBHA": "CBHA",
-        "GLENLAKE": "Glenlake",
-        "BOW VALLEY": "Bow Valley",
-        "BOW RIVER": "Bow River",
-        "BRUINS": "Bow River", 
-        "SPRINGBANK": "Springbank",
-        "CROWFOOT": "Crowfoot",
-        "TRAILS WEST": "Trails West",
-        "SIMONS VALLEY": "Simons Valley",
-        "SOUTH WEST": "Southwest",
-        "SOUTHWEST": "Southwest",
-        "BLACKFOOT": "Blackfoot",
-        "MCKNIGHT": "McKnight",
-        "MUSTANGS": "McKnight",
-        "MIDNAPORE": "Midnapore",
-        "MAVERICKS": "Midnapore",
-        "LAKE BONAVISTA": "Lake Bonavista",
-        "NORTH WEST": "North West",
-        "NORTHWEST": "North West",
-        "NWCAA": "North West",
-        "WARRIORS": "North West",
-        "CALGARY NORTHSTARS": "Calgary Northstars",
-        "CNHA": "Calgary Northstars",
-        "CALGARY ROYALS": "Calgary Royals",
-        "CRAA": "Calgary Royals",
-        "KNIGHTS": "Knights",
-        "WOLVERINES": "Wolverines",
-        "RAIDERS": "Raiders"
-    }
-    
-    normalized_name = None
-    for key, value in known_map.items():
-        if key in name_upper:
-            normalized_name = value
-            break
-    
-    if normalized_name:
-        if normalized_name in ALLOWED_COMMUNITIES:
-            return normalized_name
-        else:
-            return None # Filter out unwanted communities
-
-    # Heuristic: Remove trailing numbers and colors
-    # e.g. "Bow Valley 1" -> "Bow Valley"
-    # "Trails West 5 Red" -> "Trails West"
-    
-    # Remove Age Category prefixes (e.g. "U13 ", "U11 ")
-    base_name = re.sub(r'^U\d+\s+', '', team_name, flags=re.IGNORECASE)
-    
-    # Remove trailing numbers
-    base_name = re.sub(r'\s+\d+$', '', base_name)
-    
-    # Remove trailing colors (common ones)
-    colors = [
-        'Red', 'Blue', 'White', 'Black', 'Gold', 'Silver', 'Green', 'Yellow', 
-        'Grey', 'Gray', 'Orange', 'Teal', 'Navy', 'Maroon', 'Purple', 'Pink', 
-        'Lime', 'Cyan', 'Magenta', 'Brown', 'Beige', 'Royal', 'Sky'
-    ]
-    for color in colors:
-        # Case insensitive check for color at the end
-        if re.search(r'\b' + re.escape(color) + r'$', base_name, re.IGNORECASE):
-            base_name = re.sub(r'\s+\b' + re.escape(color) + r'$', '', base_name, flags=re.IGNORECASE)
-            break
-            
-    # Remove trailing numbers again if color was removed
-    base_name = re.sub(r'\s+\d+$', '', base_name)
     
-    final_name = base_name.strip()
-    if final_name in ALLOWED_COMMUNITIES:
-        return final_name
-        
-    return None
+    return normalizer.guess(team_name)